@@ -1,43 +1,106 @@
 """Module d'authentification JWT pour l'application GHS."""
 
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from functools import wraps
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import update
 from sqlmodel import Session, select
 
-from models import Account
+from models import Account, ProfileType
 from database import Database
+from hashing import pwd_context, password_hasher
 
 # Configuration JWT
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Configuration du cache des comptes authentifiés
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+# En mode sans état, le profil embarqué dans le token fait foi (aucun accès BDD) :
+# un changement de profil ou une désactivation ne prend effet qu'à l'expiration du token
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "False").lower() == "true"
+
 # Configuration de sécurité
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 # Instance de base de données (sera initialisée par init_auth)
 _database: Optional[Database] = None
 
 
+class PrincipalCache:
+    """
+    Cache LRU à durée de vie limitée des comptes authentifiés.
+
+    Le cache est propre au processus : avec plusieurs workers, une
+    modification de compte n'est visible des autres workers qu'à
+    l'expiration de l'entrée (PRINCIPAL_CACHE_TTL).
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[Account]:
+        """Retourne une copie du compte en cache, ou None si absent ou expiré."""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at < time.monotonic():
+                del self._entries[username]
+                return None
+            self._entries.move_to_end(username)
+        return Account(**data)
+
+    def set(self, account: Account) -> None:
+        """Met en cache un compte."""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        data = account.model_dump()
+        with self._lock:
+            self._entries[account.username] = (time.monotonic() + self.ttl, data)
+            self._entries.move_to_end(account.username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Retire un compte du cache."""
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_SIZE)
+
+
 def init_auth(database: Database) -> None:
     """Initialise le module d'authentification avec la base de données."""
     global _database
     _database = database
 
 
-def get_session() -> Session:
-    """Obtient une session de base de données pour l'authentification."""
+def _get_database() -> Database:
+    """Retourne la base de données du module d'authentification."""
     if not _database:
         raise RuntimeError("Le module d'authentification n'est pas initialisé")
-    return next(_database.get_session())
+    return _database
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -63,31 +126,78 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def authenticate_user(username: str, password: str, session: Session) -> Optional[Account]:
-    """Authentifie un utilisateur avec son nom d'utilisateur et mot de passe."""
-    account = session.exec(
+def account_claims(account: Account) -> dict:
+    """Construit les claims d'identité embarqués dans le token d'un compte."""
+    return {
+        "sub": account.username,
+        "accountID": account.accountID,
+        "employeeID": account.employeeID,
+        "profile": ProfileType(account.profile).value,
+    }
+
+
+def account_from_claims(payload: dict) -> Optional[Account]:
+    """Reconstruit un compte à partir des claims du token (mode sans état)."""
+    if payload.get("accountID") is None or payload.get("profile") is None:
+        return None
+    return Account(
+        accountID=payload["accountID"],
+        employeeID=payload["employeeID"],
+        username=payload["sub"],
+        password="",
+        profile=payload["profile"],
+        isActive=True,
+    )
+
+
+def _find_account(session: Session, username: str) -> Optional[Account]:
+    """Recherche un compte par nom d'utilisateur."""
+    return session.exec(
         select(Account).where(Account.username == username)
     ).first()
+
+
+def _record_login(session: Session, account_id: int) -> None:
+    """Met à jour la date de dernière connexion d'un compte."""
+    session.exec(
+        update(Account).where(Account.accountID == account_id).values(lastLogin=datetime.utcnow())
+    )
+    session.commit()
+
+
+async def authenticate_user(username: str, password: str) -> Optional[Account]:
+    """
+    Authentifie un utilisateur avec son nom d'utilisateur et mot de passe.
+
+    Les accès à la base passent par Database.run et la vérification bcrypt
+    par le pool de hachage borné : aucun ne bloque la boucle d'événements.
+    """
+    database = _get_database()
+    account = await database.run(_find_account, username)
     
     if not account:
         return None
     
-    if not verify_password(password, account.password):
+    if not await password_hasher.verify(password, account.password):
         return None
     
     if not account.isActive:
         return None
     
     # Mettre à jour la dernière connexion
-    account.lastLogin = datetime.utcnow()
-    session.add(account)
-    session.commit()
+    await database.run(_record_login, account.accountID)
+    principal_cache.invalidate(account.username)
     
     return account
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> Account:
-    """Récupère l'utilisateur actuel à partir du token JWT."""
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Account:
+    """
+    Récupère l'utilisateur actuel à partir du token JWT.
+
+    Dépendance asynchrone : en cas d'absence du cache, le compte est lu par
+    Database.run, sans occuper de thread pendant la requête.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Impossible de valider les identifiants",
@@ -102,18 +212,24 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> Account:
     except JWTError:
         raise credentials_exception
     
-    session = get_session()
-    account = session.exec(
-        select(Account).where(Account.username == username)
-    ).first()
+    if AUTH_STATELESS:
+        account = account_from_claims(payload)
+        if account is not None:
+            return account
+    
+    account = principal_cache.get(username)
+    if account is not None:
+        return account
     
+    account = await _get_database().run(_find_account, username)
     if account is None:
         raise credentials_exception
     
+    principal_cache.set(account)
     return account
 
 
-def get_current_active_user(current_user: Account = Depends(get_current_user)) -> Account:
+async def get_current_active_user(current_user: Account = Depends(get_current_user)) -> Account:
     """Récupère l'utilisateur actuel s'il est actif."""
     if not current_user.isActive:
         raise HTTPException(
@@ -151,7 +267,7 @@ def require_profile(allowed_profiles: List[str]):
         return wrapper
     
     # Retourner une fonction qui peut être utilisée comme dépendance FastAPI
-    def dependency(current_user: Account = Depends(get_current_active_user)) -> Account:
+    async def dependency(current_user: Account = Depends(get_current_active_user)) -> Account:
         if current_user.profile not in allowed_profiles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
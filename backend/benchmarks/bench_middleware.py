@@ -0,0 +1,141 @@
+"""
+Micro-benchmark des middlewares de l'API : BaseHTTPMiddleware contre ASGI pur.
+
+Mesure le débit (requêtes/s) de /health et /services sur une application
+minimale, sans base de données ni réseau, avec les anciens middlewares
+(BaseHTTPMiddleware, f-strings) puis avec ceux de middleware.py.
+
+Usage (depuis backend/):
+    python benchmarks/bench_middleware.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Request, Response, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+
+from middleware import ErrorHandlerMiddleware, LoggingMiddleware
+
+legacy_logger = logging.getLogger("middleware.legacy")
+
+
+class LegacyErrorHandlerMiddleware(BaseHTTPMiddleware):
+    """Ancienne implémentation (référence du benchmark)."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        try:
+            return await call_next(request)
+        except HTTPException:
+            raise
+        except SQLAlchemyError as e:
+            legacy_logger.error(f"Erreur de base de données: {e}")
+            return JSONResponse(status_code=500, content={"error": "Erreur de base de données"})
+        except Exception as e:
+            legacy_logger.error(f"Erreur inattendue: {e}")
+            return JSONResponse(status_code=500, content={"error": "Erreur interne du serveur"})
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """Ancienne implémentation (référence du benchmark)."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start_time = time.time()
+        legacy_logger.info(f"Requête: {request.method} {request.url}")
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        legacy_logger.info(f"Réponse: {response.status_code} - Temps: {process_time:.3f}s")
+        return response
+
+
+SERVICES = [
+    {
+        "serviceID": index,
+        "serviceCode": f"SRV{index:03d}",
+        "serviceName": f"Service {index}",
+        "parentServiceID": None,
+        "description": None,
+        "manager": None,
+        "createdAt": datetime(2024, 1, 1).isoformat(),
+        "updatedAt": datetime(2024, 1, 1).isoformat(),
+    }
+    for index in range(1, 51)
+]
+
+
+def build_app(variant: str, sample_rate: float) -> FastAPI:
+    """Construit l'application de test avec les middlewares de la variante."""
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/services")
+    async def services():
+        return SERVICES
+
+    if variant == "legacy":
+        app.add_middleware(LegacyErrorHandlerMiddleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+    else:
+        app.add_middleware(ErrorHandlerMiddleware)
+        app.add_middleware(LoggingMiddleware, sample_rate=sample_rate)
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Envoie les requêtes via le transport ASGI et retourne le débit (req/s)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, requests)):
+            await client.get(path)
+
+        remaining = requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get(path)
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des middlewares GHS")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sample-rate", type=float, default=1.0)
+    args = parser.parse_args()
+
+    # Logs réellement formatés et écrits, comme en production
+    handler = logging.FileHandler(os.devnull)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
+    print(f"{'chemin':<10} {'avant (req/s)':>14} {'après (req/s)':>14} {'gain':>7}")
+    for path in ("/health", "/services"):
+        before = await measure(build_app("legacy", 1.0), path, args.requests, args.concurrency)
+        after = await measure(
+            build_app("asgi", args.sample_rate), path, args.requests, args.concurrency
+        )
+        print(f"{path:<10} {before:>14.0f} {after:>14.0f} {after / before:>6.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
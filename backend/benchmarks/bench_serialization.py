@@ -0,0 +1,123 @@
+"""
+Micro-benchmark de la sérialisation des listes : chemin standard contre FAST_JSON.
+
+Mesure le débit (lignes/s) de la sérialisation d'une page de demandes
+(RequestRead, avec et sans expand) et d'une liste d'employés (EmployeeRead),
+sans base de données ni réseau :
+    - standard : schémas construits par model_validate, puis validation du
+      response_model et encodage par FastAPI (demandes) ou json.dumps
+      (employés, cache de référentiels) ;
+    - rapide : dictionnaires construits sans validation, encodés par orjson.
+Les deux sorties sont comparées avant la mesure.
+
+Usage (depuis backend/):
+    python benchmarks/bench_serialization.py --rows 500 --rounds 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from models import (
+    Employee, Request, Service, RequestStatus,
+    EmployeeReadWithService, RequestReadWithRelations
+)
+from expand import employee_read, request_read, employee_payload, request_payload
+from fastjson import dumps
+from refcache import serialize_items, serialize_payloads
+
+REQUEST_FIELD = create_response_field(name="Response_get_requests", type_=List[RequestReadWithRelations])
+EMPLOYEE_FIELD = create_response_field(name="Response_get_employees", type_=List[EmployeeReadWithService])
+
+
+def build_rows(count: int):
+    """Construit des employés et des demandes en mémoire (non persistés)."""
+    now = datetime(2024, 1, 15, 8, 30, 12, 345678)
+    services = [Service(serviceID=i, serviceCode=f"S{i:03d}", serviceName=f"Service {i}",
+                        createdAt=now, updatedAt=now) for i in range(1, 11)]
+    employees = []
+    for i in range(1, count + 1):
+        service = services[i % len(services)]
+        employees.append(Employee(
+            employeeID=i, employeeNumber=f"EMP{i:05d}", lastName="Kouassi", firstName="Aïcha",
+            serviceID=service.serviceID, service=service, contact="0700000000",
+            birthdate=date(1990, 1, 1), createdAt=now, updatedAt=now
+        ))
+    requests = []
+    for i in range(1, count + 1):
+        employee = employees[i - 1]
+        requests.append(Request(
+            requestID=i, employeeID=employee.employeeID, employee=employee,
+            requestDate=date(2024, 1, 1) + timedelta(days=i % 365),
+            startAt=dtime(17, 30), endAt=dtime(19, 45), status=RequestStatus.PENDING,
+            comment="Clôture mensuelle", createdBy=employee.employeeID,
+            createdAt=now, updatedAt=now
+        ))
+    return employees, requests
+
+
+def standard_requests(requests, fields) -> bytes:
+    items = [request_read(request, fields) for request in requests]
+    content = asyncio.run(serialize_response(
+        field=REQUEST_FIELD, response_content=items, exclude_unset=True, is_coroutine=False
+    ))
+    return JSONResponse(content).body
+
+
+def fast_requests(requests, fields) -> bytes:
+    return dumps([request_payload(request, fields) for request in requests])
+
+
+def standard_employees(employees, fields) -> bytes:
+    return serialize_items(employee_read(employee, fields) for employee in employees).body
+
+
+def fast_employees(employees, fields) -> bytes:
+    return serialize_payloads(employee_payload(employee, fields) for employee in employees).body
+
+
+def measure(serialize: Callable[[], bytes], rows: int, rounds: int) -> float:
+    """Retourne le débit (lignes/s) d'une fonction de sérialisation."""
+    serialize()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        serialize()
+    return rows * rounds / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la sérialisation GHS")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    employees, requests = build_rows(args.rows)
+    cases = [
+        ("RequestRead", requests, set(), standard_requests, fast_requests),
+        ("RequestRead+employee", requests, {"employee"}, standard_requests, fast_requests),
+        ("EmployeeRead", employees, set(), standard_employees, fast_employees),
+        ("EmployeeRead+service", employees, {"service"}, standard_employees, fast_employees),
+    ]
+
+    print(f"{'schéma':<22} {'standard (l/s)':>15} {'rapide (l/s)':>14} {'gain':>7}")
+    for name, rows, fields, standard, fast in cases:
+        if json.loads(standard(rows, fields)) != json.loads(fast(rows, fields)):
+            raise SystemExit(f"{name} : les deux chemins produisent des réponses différentes")
+        before = measure(lambda: standard(rows, fields), len(rows), args.rounds)
+        after = measure(lambda: fast(rows, fields), len(rows), args.rounds)
+        print(f"{name:<22} {before:>15.0f} {after:>14.0f} {after / before:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
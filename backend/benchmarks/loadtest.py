@@ -0,0 +1,164 @@
+"""
+Test de charge des principaux endpoints de l'API GHS.
+
+Pilote, à concurrence fixée, les scénarios connexion, liste des demandes,
+création de demande et approbation en lot contre un serveur démarré
+(SQLite ou MySQL local), puis affiche pour chacun le débit et les
+latences p50/p95/p99. Le résultat peut être enregistré en JSON pour
+comparer deux versions.
+
+Usage (depuis backend/, après benchmarks/seed_data.py et avec le serveur démarré):
+    python benchmarks/loadtest.py --base-url http://localhost:8000 --concurrency 32
+    python benchmarks/loadtest.py --scenarios list,create --requests 2000 --json result.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+SCENARIOS = ("login", "list", "create", "approve")
+
+# Nombre de demandes approuvées par appel de /workflows/approve
+APPROVE_BATCH = 20
+
+
+def percentile(samples: List[float], rank: float) -> float:
+    """Percentile (méthode du rang le plus proche) d'une liste triée, en millisecondes."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(rank * len(samples)))] * 1000
+
+
+class ScenarioResult:
+    """Latences et erreurs d'un scénario."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def summary(self) -> Dict[str, float]:
+        samples = sorted(self.latencies)
+        return {
+            "scenario": self.name,
+            "requests": len(samples),
+            "errors": self.errors,
+            "throughput": len(samples) / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": percentile(samples, 0.50),
+            "p95_ms": percentile(samples, 0.95),
+            "p99_ms": percentile(samples, 0.99),
+        }
+
+
+async def run_scenario(name: str, call: Callable[[int], Awaitable[httpx.Response]],
+                       requests: int, concurrency: int) -> ScenarioResult:
+    """Exécute requests appels de call avec concurrency appels simultanés."""
+    result = ScenarioResult(name)
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                response = await call(index)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                result.latencies.append(time.perf_counter() - started)
+            else:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Test de charge de l'API GHS")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="loadtest0", help="Compte Supervisor (seed_data.py)")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000, help="Appels par scénario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--json", help="Fichier où enregistrer les résultats")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        print(f"❌ Scénarios inconnus: {', '.join(sorted(unknown))}")
+        return 1
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        credentials = {"username": args.username, "password": args.password}
+        response = await client.post("/auth/login", data=credentials)
+        if response.status_code != 200:
+            print(f"❌ Connexion impossible ({response.status_code}): {response.text}")
+            return 1
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        # Demandes réparties sur tous les employés puis sur les jours suivants,
+        # pour rester sous les plafonds d'heures et éviter les chevauchements
+        employee_ids = [employee["employeeID"] for employee in (await client.get("/employees")).json()]
+        first_date = date.today() + timedelta(days=7)
+        created_ids: List[int] = []
+
+        async def login(_):
+            return await client.post("/auth/login", data=credentials)
+
+        async def list_requests(_):
+            return await client.get("/requests", params={"limit": 100}, headers=headers)
+
+        async def create(index):
+            response = await client.post("/requests", headers=headers, json={
+                "employeeID": employee_ids[index % len(employee_ids)],
+                "requestDate": str(first_date + timedelta(days=index // len(employee_ids))),
+                "startAt": "18:00:00",
+                "endAt": "20:00:00",
+            })
+            if response.status_code == 200:
+                created_ids.append(response.json()["requestID"])
+            return response
+
+        async def approve(index):
+            batch = created_ids[index * APPROVE_BATCH:(index + 1) * APPROVE_BATCH]
+            return await client.post("/workflows/approve", json={"requestIDs": batch}, headers=headers)
+
+        calls = {"login": login, "list": list_requests, "create": create, "approve": approve}
+        results = []
+        for name in scenarios:
+            requests = args.requests
+            if name == "approve":
+                if not created_ids:
+                    print("⚠️  approve ignoré : exécuter aussi le scénario create")
+                    continue
+                requests = max(1, len(created_ids) // APPROVE_BATCH)
+            result = await run_scenario(name, calls[name], requests, args.concurrency)
+            results.append(result.summary())
+
+    print(f"{'scénario':<10} {'appels':>7} {'erreurs':>8} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for summary in results:
+        print(f"{summary['scenario']:<10} {summary['requests']:>7} {summary['errors']:>8} "
+              f"{summary['throughput']:>8.1f} {summary['p50_ms']:>8.1f} "
+              f"{summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump({"base_url": args.base_url, "concurrency": args.concurrency,
+                       "results": results}, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
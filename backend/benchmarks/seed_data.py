@@ -0,0 +1,318 @@
+"""
+Générateur de données volumineuses pour les tests de charge.
+
+Insère par lots (INSERT multi-lignes, une transaction par lot) une
+hiérarchie de services, des employés, des comptes de test, des demandes,
+des étapes de workflow et des délégations. Les volumes et la graine
+aléatoire sont paramétrables, le jeu de données est donc reproductible.
+
+Usage (depuis backend/):
+    python benchmarks/seed_data.py --services 500 --employees 50000 --requests 5000000
+    python benchmarks/seed_data.py --url sqlite:///loadtest.db --requests 200000
+
+Sans --url, la base est celle décrite par DATABASE_URL ou les variables DB_*
+(comme manage.py). Avec SQLite, le schéma est créé au besoin.
+Les demandes respectent les règles de l'API (pas de chevauchement, plafonds
+OVERTIME_*_CAP_HOURS) ; les étapes en attente ne portent que sur des
+demandes non décidées.
+Les comptes créés sont loadtest0..loadtestN (mot de passe : loadtest123) ;
+les premiers ont le profil Supervisor.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time as clock
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from sqlalchemy import case, func, insert, literal
+from sqlmodel import Session, select
+
+from models import (
+    Service, Employee, Account, Request, Workflow, Delegation,
+    ContractType, ProfileType, RequestStatus, WorkflowStatus
+)
+from database import Database
+from hashing import pwd_context
+from hierarchy import rebuild_service_closure
+from hours import backfill_request_hours
+from manage import get_database
+from overtime_limits import EmployeeSchedule
+from rollup import rebuild_rollup
+
+load_dotenv()
+
+LOADTEST_PASSWORD = "loadtest123"
+
+# Tirages d'horaires tentés pour placer une demande avant d'y renoncer
+MAX_PLACEMENT_ATTEMPTS = 20
+
+# Répartition des statuts des demandes générées
+STATUS_WEIGHTS = {
+    RequestStatus.PENDING: 30,
+    RequestStatus.SUBMITTED: 10,
+    RequestStatus.FIRST_LEVEL_APPROVED: 15,
+    RequestStatus.IN_PROGRESS: 5,
+    RequestStatus.SECOND_LEVEL_APPROVED: 10,
+    RequestStatus.ACCEPTED: 25,
+    RequestStatus.REJECTED: 5,
+}
+
+
+def insert_batches(session: Session, model, rows: Iterator[dict], batch_size: int, label: str) -> int:
+    """Insère les lignes par lots, une transaction par lot. Retourne le nombre de lignes."""
+    total = 0
+    started = clock.perf_counter()
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            session.execute(insert(model), batch)
+            session.commit()
+            total += len(batch)
+            batch = []
+            print(f"\r  {label}: {total}", end="", flush=True)
+    if batch:
+        session.execute(insert(model), batch)
+        session.commit()
+        total += len(batch)
+    elapsed = clock.perf_counter() - started
+    print(f"\r  ✅ {label}: {total} lignes en {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} lignes/s)")
+    return total
+
+
+def max_id(session: Session, column) -> int:
+    """Retourne le plus grand identifiant existant (0 si la table est vide)."""
+    return session.exec(select(func.coalesce(func.max(column), 0))).one()
+
+
+def seed(session: Session, args: argparse.Namespace) -> None:
+    """Génère l'ensemble du jeu de données."""
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    today = date.today()
+
+    # Services : arbre aléatoire, chaque service rattaché à un service déjà créé
+    print("📋 Services...")
+    first_service = max_id(session, Service.serviceID) + 1
+    service_ids = list(range(first_service, first_service + args.services))
+    roots = max(1, args.services // 50)
+
+    def services() -> Iterator[dict]:
+        for position, service_id in enumerate(service_ids):
+            parent_id = None if position < roots else service_ids[rng.randrange(position)]
+            yield {
+                "serviceID": service_id,
+                "serviceCode": f"LT{service_id:06d}",
+                "serviceName": f"Service de charge {service_id}",
+                "parentServiceID": parent_id,
+                "createdAt": now,
+                "updatedAt": now,
+            }
+
+    insert_batches(session, Service, services(), args.batch_size, "services")
+    rebuild_service_closure(session)
+
+    # Employés
+    print("👥 Employés...")
+    first_employee = max_id(session, Employee.employeeID) + 1
+    employee_ids = list(range(first_employee, first_employee + args.employees))
+
+    def employees() -> Iterator[dict]:
+        contract_types = list(ContractType)
+        for employee_id in employee_ids:
+            service_id = rng.choice(service_ids)
+            yield {
+                "employeeID": employee_id,
+                "employeeNumber": f"LT{employee_id:08d}",
+                "lastName": f"Nom{employee_id}"[:20],
+                "firstName": f"Prenom{employee_id}"[:30],
+                "serviceID": service_id,
+                "contractType": rng.choice(contract_types),
+                "createdAt": now,
+                "updatedAt": now,
+            }
+
+    insert_batches(session, Employee, employees(), args.batch_size, "employés")
+
+    # Comptes de test : un hachage unique suffit (même mot de passe)
+    print("🔐 Comptes...")
+    password_hash = pwd_context.hash(LOADTEST_PASSWORD)
+    supervisors = max(1, args.accounts // 10)
+    account_employees = employee_ids[:args.accounts]
+    supervisor_ids = account_employees[:supervisors]  # IDs contigus
+
+    def accounts() -> Iterator[dict]:
+        for position, employee_id in enumerate(account_employees):
+            yield {
+                "employeeID": employee_id,
+                "username": f"loadtest{position}",
+                "password": password_hash,
+                "profile": ProfileType.SUPERVISOR if position < supervisors else ProfileType.VALIDATOR,
+                "isActive": True,
+                "createdAt": now,
+                "updatedAt": now,
+            }
+
+    insert_batches(session, Account, accounts(), args.batch_size, "comptes")
+
+    # Demandes réparties sur l'année écoulée et le mois à venir, employé par
+    # employé : chaque demande est contrôlée comme par l'API (chevauchements
+    # et plafonds), les demandes rejetées n'étant pas comptées
+    print("📝 Demandes...")
+    first_request = max_id(session, Request.requestID) + 1
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    undecided = (RequestStatus.PENDING, RequestStatus.SUBMITTED)
+    # Demandes non décidées qui recevront une étape en attente (échantillon uniforme)
+    pending_ids: List[int] = []
+    undecided_count = 0
+    skipped = 0
+
+    def requests() -> Iterator[dict]:
+        nonlocal undecided_count, skipped
+        request_id = first_request
+        per_employee, remainder = divmod(args.requests, len(employee_ids))
+        for position, employee_id in enumerate(employee_ids):
+            schedule = EmployeeSchedule()
+            for _ in range(per_employee + (position < remainder)):
+                for _ in range(MAX_PLACEMENT_ATTEMPTS):
+                    start_hour = rng.randint(6, 18)
+                    request_date = today + timedelta(days=rng.randint(-365, 30))
+                    start_at, end_at = time(start_hour), time(start_hour + rng.randint(1, 4))
+                    if schedule.violation(request_date, start_at, end_at) is None:
+                        break
+                else:
+                    skipped += 1
+                    continue
+
+                status = rng.choices(statuses, weights)[0]
+                if status != RequestStatus.REJECTED:
+                    schedule.add(request_date, start_at, end_at)
+                if status in undecided:
+                    undecided_count += 1
+                    if len(pending_ids) < args.pending_workflows:
+                        pending_ids.append(request_id)
+                    else:
+                        slot = rng.randrange(undecided_count)
+                        if slot < args.pending_workflows:
+                            pending_ids[slot] = request_id
+                yield {
+                    "requestID": request_id,
+                    "employeeID": employee_id,
+                    "requestDate": request_date,
+                    "startAt": start_at,
+                    "endAt": end_at,
+                    "status": status,
+                    "createdAt": now,
+                    "updatedAt": now,
+                    "validatedN1At": (
+                        None if status in undecided else datetime.combine(request_date, time(20))
+                    ),
+                }
+                request_id += 1
+
+    insert_batches(session, Request, requests(), args.batch_size, "demandes")
+    if skipped:
+        print(f"  ⚠️ {skipped} demandes non placées (plafonds d'heures atteints)")
+    started = clock.perf_counter()
+    hours = backfill_request_hours(session, args.batch_size)
+    print(f"  ✅ durées des demandes: {hours} lignes en {clock.perf_counter() - started:.1f}s")
+
+    # Étapes de workflow : une étape décidée par demande traitée (INSERT ... SELECT),
+    # rejetée pour les demandes rejetées, puis des étapes en attente sur des
+    # demandes non décidées pour alimenter les files de validation
+    print("🔄 Workflows...")
+    started = clock.perf_counter()
+    decided = session.execute(
+        insert(Workflow).from_select(
+            ["requestID", "validator", "assignDate", "validationDate", "status"],
+            select(
+                Request.requestID,
+                supervisor_ids[0] + Request.requestID % len(supervisor_ids),
+                literal(now),
+                literal(now),
+                case(
+                    (Request.status == RequestStatus.REJECTED, int(WorkflowStatus.REJECTED)),
+                    else_=int(WorkflowStatus.APPROVED)
+                ),
+            ).where(Request.requestID >= first_request, Request.status.notin_(undecided))
+        )
+    ).rowcount
+    session.commit()
+    print(f"  ✅ workflows traités: {decided} lignes en {clock.perf_counter() - started:.1f}s")
+
+    def pending_workflows() -> Iterator[dict]:
+        for offset, request_id in enumerate(sorted(pending_ids)):
+            yield {
+                "requestID": request_id,
+                "validator": rng.choice(supervisor_ids),
+                "assignDate": now - timedelta(minutes=offset),
+                "status": int(WorkflowStatus.PENDING),
+            }
+
+    insert_batches(session, Workflow, pending_workflows(), args.batch_size, "workflows en attente")
+
+    # Délégations : une par délégant, sans chevauchement
+    print("🤝 Délégations...")
+
+    def delegations() -> Iterator[dict]:
+        delegators = rng.sample(employee_ids, min(args.delegations, len(employee_ids)))
+        for delegator in delegators:
+            delegate = rng.choice(employee_ids)
+            if delegate == delegator:
+                continue
+            start_at = today + timedelta(days=rng.randint(-30, 30))
+            yield {
+                "delegatedBy": delegator,
+                "delegatedTo": delegate,
+                "startAt": start_at,
+                "endAt": start_at + timedelta(days=rng.randint(1, 14)),
+            }
+
+    insert_batches(session, Delegation, delegations(), args.batch_size, "délégations")
+
+    print("📊 Agrégats...")
+    print(f"  ✅ agrégats: {rebuild_rollup(session)} lignes")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Génère un jeu de données de test de charge")
+    parser.add_argument("--url", help="URL SQLAlchemy (par défaut : variables DB_*)")
+    parser.add_argument("--services", type=int, default=500)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5_000_000)
+    parser.add_argument("--pending-workflows", type=int, default=10_000)
+    parser.add_argument("--delegations", type=int, default=1_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    if args.accounts > args.employees:
+        print("❌ --accounts ne peut pas dépasser --employees")
+        return 1
+
+    database = Database(database_url=args.url) if args.url else get_database()
+    if not database.start():
+        print("❌ Impossible de se connecter à la base de données")
+        return 1
+
+    started = clock.perf_counter()
+    with Session(database.engine) as session:
+        seed(session, args)
+    print(f"\n🎉 Jeu de données généré en {clock.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Insertions multi-lignes avec récupération des identifiants générés."""
+
+from typing import Any, Dict, List, Type
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+
+def insert_many(session: Session, model: Type[SQLModel], rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insère des lignes en une seule instruction INSERT multi-lignes.
+
+    Sur les bases qui supportent RETURNING, les identifiants sont relus
+    par l'instruction elle-même. Sur MySQL, ils sont déduits de LAST_INSERT_ID() :
+    InnoDB alloue en un bloc contigu les identifiants d'un INSERT ... VALUES
+    dont le nombre de lignes est connu (« simple insert »).
+
+    Args:
+        session: Session de base de données (la transaction n'est pas validée)
+        model: Modèle de table cible
+        rows: Valeurs des colonnes, une entrée par ligne
+
+    Returns:
+        List[int]: Identifiants générés, dans l'ordre des lignes
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    primary_key = list(table.primary_key.columns)[0]
+    dialect = session.get_bind().dialect
+
+    if dialect.insert_returning:
+        # Les identifiants d'un même INSERT sont croissants dans l'ordre des lignes ;
+        # les trier évite le repli ligne par ligne de sort_by_parameter_order
+        result = session.execute(insert(table).values(rows).returning(primary_key))
+        return sorted(result.scalars())
+
+    result = session.execute(insert(table).values(rows))
+    first_id = result.lastrowid
+    return list(range(first_id, first_id + len(rows)))
@@ -0,0 +1,222 @@
+"""
+Flux de modifications pour la synchronisation incrémentale des collections.
+
+GET /{collection}/changes renvoie les lignes créées ou modifiées et les
+identifiants supprimés depuis un curseur opaque, dans l'ordre
+(updatedAt, id) d'un index dédié. Les suppressions sont enregistrées dans
+la table tombstones, y compris celles que la base fait en cascade.
+
+Une ligne peut être validée avec un updatedAt antérieur à des lignes déjà
+renvoyées (transactions concurrentes, horloges des serveurs) : seules les
+modifications plus anciennes que CHANGES_SAFETY_LAG sont renvoyées, et le
+curseur n'avance jamais au-delà de cette limite.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, String, delete, insert, literal, update
+from sqlmodel import Session, SQLModel, select
+
+from models import (
+    Service, Employee, Request, Tombstone, ServiceRead, EmployeeRead, RequestRead,
+    ServiceChanges, EmployeeChanges, RequestChanges
+)
+from pagination import decode_cursor, encode_cursor, keyset_condition
+from fastjson import FAST_JSON, fast_response, trusted_dump
+
+# Âge minimal (s) d'une modification avant sa publication dans le flux :
+# doit dépasser la durée de la plus longue transaction d'écriture
+CHANGES_SAFETY_LAG = float(os.getenv("CHANGES_SAFETY_LAG", "5"))
+# Durée de conservation des suppressions ; un curseur plus ancien impose une resynchronisation
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Position dans un flux : (horodatage, identifiant) de la dernière ligne renvoyée
+Position = Tuple[datetime, int]
+
+
+class ChangeFeed(NamedTuple):
+    """Collection synchronisable : table, clé, schéma de lecture et de réponse."""
+    model: Type[SQLModel]
+    id_column: Any
+    read_schema: Type[SQLModel]
+    changes_schema: Type[SQLModel]
+
+
+CHANGE_FEEDS: Dict[str, ChangeFeed] = {
+    "services": ChangeFeed(Service, Service.serviceID, ServiceRead, ServiceChanges),
+    "employees": ChangeFeed(Employee, Employee.employeeID, EmployeeRead, EmployeeChanges),
+    "requests": ChangeFeed(Request, Request.requestID, RequestRead, RequestChanges),
+}
+
+
+def record_deletions(session: Session, collection: str, *conditions) -> None:
+    """
+    Enregistre la suppression des lignes d'une collection (INSERT ... SELECT).
+
+    À appeler dans la transaction de suppression, avant celle-ci.
+
+    Args:
+        session: Session de base de données (la transaction n'est pas validée)
+        collection: Collection concernée (clé de CHANGE_FEEDS)
+        conditions: Conditions de sélection des lignes supprimées
+    """
+    feed = CHANGE_FEEDS[collection]
+    source = select(
+        literal(collection, String), feed.id_column, literal(datetime.utcnow(), DateTime)
+    ).where(*conditions)
+    session.exec(
+        insert(Tombstone).from_select(["collection", "entityID", "deletedAt"], source)
+    )
+
+
+def release_created_requests(session: Session, *conditions) -> None:
+    """
+    Détache les demandes créées par des employés supprimés pour d'autres employés.
+
+    La base ferait de même (ON DELETE SET NULL) sans modifier updatedAt :
+    le faire ici publie la modification dans le flux des demandes.
+
+    Args:
+        session: Session de base de données (la transaction n'est pas validée)
+        conditions: Conditions de sélection des demandes concernées
+    """
+    session.exec(
+        update(Request).where(*conditions).values(createdBy=None, updatedAt=datetime.utcnow())
+    )
+
+
+def record_employee_deletion(session: Session, employee_id: int) -> None:
+    """Enregistre la suppression d'un employé et de ses demandes (cascade)."""
+    release_created_requests(
+        session, Request.createdBy == employee_id, Request.employeeID != employee_id
+    )
+    record_deletions(session, "requests", Request.employeeID == employee_id)
+    record_deletions(session, "employees", Employee.employeeID == employee_id)
+
+
+def record_service_deletion(session: Session, service_id: int) -> None:
+    """Enregistre la suppression d'un service, de ses employés et de leurs demandes (cascade)."""
+    employee_ids = select(Employee.employeeID).where(Employee.serviceID == service_id)
+    release_created_requests(
+        session, Request.createdBy.in_(employee_ids), Request.employeeID.notin_(employee_ids)
+    )
+    record_deletions(session, "requests", Request.employeeID.in_(employee_ids))
+    record_deletions(session, "employees", Employee.serviceID == service_id)
+    record_deletions(session, "services", Service.serviceID == service_id)
+
+
+def _parse_position(timestamp: Any, identifier: Any) -> Optional[Position]:
+    if timestamp is None and identifier is None:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp), int(identifier)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Curseur de synchronisation invalide")
+
+
+def _next_position(positions: List[Position], has_more: bool,
+                   current: Optional[Position], cutoff: datetime) -> Optional[Position]:
+    """
+    Position suivante d'un flux : dernière ligne renvoyée, ou la limite de
+    publication si le flux est épuisé (les lignes exactement à la limite
+    seront renvoyées une seconde fois, ce qui est sans effet pour le client).
+    """
+    if not has_more:
+        return cutoff, 0
+    return positions[-1] if positions else current
+
+
+def load_changes(session: Session, collection: str, since: Optional[str], limit: int):
+    """
+    Charge les modifications d'une collection depuis un curseur.
+
+    Sans curseur, renvoie toute la collection (synchronisation initiale,
+    paginée). Les lignes modifiées puis les suppressions sont à appliquer
+    dans cet ordre ; tant que hasMore est vrai, le client rappelle
+    immédiatement avec le nouveau curseur. limit s'applique séparément
+    aux lignes et aux suppressions.
+
+    Raises:
+        HTTPException: 400 si le curseur est invalide, 410 s'il est plus
+            ancien que la conservation des suppressions
+    """
+    feed = CHANGE_FEEDS[collection]
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=CHANGES_SAFETY_LAG)
+
+    if since:
+        values = decode_cursor(since, 4)
+        row_position = _parse_position(*values[:2])
+        tombstone_position = _parse_position(*values[2:])
+        if tombstone_position is None:
+            raise HTTPException(status_code=400, detail="Curseur de synchronisation invalide")
+        if tombstone_position[0] < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            raise HTTPException(
+                status_code=410,
+                detail="Curseur expiré : une synchronisation complète est nécessaire"
+            )
+    else:
+        # Les suppressions antérieures ne concernent pas une copie construite maintenant
+        row_position, tombstone_position = None, (cutoff, 0)
+
+    row_keys = (feed.model.updatedAt, feed.id_column)
+    statement = select(feed.model).where(feed.model.updatedAt <= cutoff)
+    if row_position is not None:
+        statement = statement.where(keyset_condition(row_keys, row_position, descending=False))
+    rows = session.exec(statement.order_by(*row_keys).limit(limit + 1)).all()
+
+    tombstone_keys = (Tombstone.deletedAt, Tombstone.tombstoneID)
+    tombstones = session.exec(
+        select(Tombstone).where(
+            Tombstone.collection == collection,
+            Tombstone.deletedAt <= cutoff,
+            keyset_condition(tombstone_keys, tombstone_position, descending=False)
+        ).order_by(*tombstone_keys).limit(limit + 1)
+    ).all()
+
+    more_rows = len(rows) > limit
+    more_tombstones = len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+
+    row_position = _next_position(
+        [(row.updatedAt, getattr(row, feed.id_column.key)) for row in rows],
+        more_rows, row_position, cutoff
+    )
+    tombstone_position = _next_position(
+        [(tombstone.deletedAt, tombstone.tombstoneID) for tombstone in tombstones],
+        more_tombstones, tombstone_position, cutoff
+    )
+    cursor = encode_cursor([*(row_position or (None, None)), *tombstone_position])
+    deleted = [tombstone.entityID for tombstone in tombstones]
+    has_more = more_rows or more_tombstones
+
+    if FAST_JSON:
+        return fast_response({
+            "changed": [trusted_dump(row, feed.read_schema) for row in rows],
+            "deleted": deleted,
+            "cursor": cursor,
+            "hasMore": has_more,
+        })
+    return feed.changes_schema(
+        changed=[feed.read_schema.model_validate(row) for row in rows],
+        deleted=deleted,
+        cursor=cursor,
+        hasMore=has_more
+    )
+
+
+def purge_tombstones(session: Session, retention_days: int = TOMBSTONE_RETENTION_DAYS) -> int:
+    """
+    Supprime les suppressions enregistrées plus anciennes que la durée de conservation.
+
+    Returns:
+        int: Nombre de lignes supprimées
+    """
+    result = session.exec(
+        delete(Tombstone).where(Tombstone.deletedAt < datetime.utcnow() - timedelta(days=retention_days))
+    )
+    session.commit()
+    return result.rowcount
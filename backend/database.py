@@ -1,15 +1,75 @@
 """Module de gestion de la base de données."""
 
+import asyncio
 import logging
-from typing import Generator
+import time
+from typing import AsyncGenerator, Callable, Dict, Generator, List, Optional, TypeVar
 from urllib.parse import quote_plus
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, create_engine, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from diagnostics import QueryDiagnostics
+from replicas import DB_REPLICA_CHECK_INTERVAL, ReplicaSet, RoutingSession
+from sqlite_backend import SQLITE_BUSY_TIMEOUT, configure_sqlite, create_schema
+from utils.latency import LatencyRecorder
+
+T = TypeVar("T")
+
+
+class PoolMetrics:
+    """Mesures d'attente et de saturation d'un pool de connexions."""
+    
+    def __init__(self):
+        self.wait = LatencyRecorder()
+        self.timeouts = 0
+
+
+def metered_pool(base: type) -> type:
+    """Crée une sous-classe de pool qui mesure le temps d'obtention d'une connexion."""
+    
+    class MeteredPool(base):
+        metrics = PoolMetrics()
+        
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                self.metrics.timeouts += 1
+                raise
+            finally:
+                self.metrics.wait.record(time.perf_counter() - started)
+    
+    MeteredPool.__name__ = f"Metered{base.__name__}"
+    return MeteredPool
 
 
 class Database:
-    """Classe de gestion de la base de données MySQL."""
+    """Classe de gestion de la base de données (MySQL, ou SQLite en mode mono-serveur)."""
     
-    def __init__(self, db_user: str, db_password: str, db_host: str, db_port: int, db_name: str):
+    def __init__(
+        self,
+        db_user: str = "root",
+        db_password: str = "",
+        db_host: str = "localhost",
+        db_port: int = 3306,
+        db_name: str = "ghs",
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_recycle: int = 300,
+        pool_timeout: int = 30,
+        async_mode: bool = False,
+        async_driver: str = "aiomysql",
+        diagnostics: bool = False,
+        database_url: Optional[str] = None,
+        replica_urls: Optional[List[str]] = None
+    ):
         """
         Initialise la connexion à la base de données.
         
@@ -19,6 +79,16 @@ class Database:
             db_host: Adresse du serveur de base de données
             db_port: Port de connexion
             db_name: Nom de la base de données
+            pool_size: Taille du pool de connexions
+            max_overflow: Connexions supplémentaires autorisées
+            pool_recycle: Durée de vie maximale d'une connexion (secondes)
+            pool_timeout: Attente maximale d'une connexion libre (secondes)
+            async_mode: Active le moteur asynchrone (Database.run, lectures et écritures)
+            async_driver: Pilote MySQL asynchrone (aiomysql ou asyncmy)
+            diagnostics: Active la détection des requêtes lentes et des motifs N+1
+            database_url: URL SQLAlchemy complète (ex. sqlite:///ghs.db), prioritaire
+                sur les paramètres MySQL ci-dessus
+            replica_urls: URL des réplicas en lecture (requêtes HTTP GET/HEAD)
         """
         self.db_user = db_user
         self.db_password = db_password
@@ -28,35 +98,135 @@ class Database:
         
         # Construction de l'URL de connexion avec encodage du mot de passe
         encoded_password = quote_plus(db_password) if db_password else ""
-        self.database_url = (
+        self.database_url = database_url or (
             f"mysql+mysqlconnector://{db_user}:{encoded_password}@{db_host}:{db_port}/{db_name}"
         )
+        self.backend = make_url(self.database_url).get_backend_name()
+        if self.backend == "sqlite" and async_mode:
+            raise ValueError("Le mode asynchrone n'est disponible qu'avec MySQL")
+        
+        pool_options = {
+            "pool_pre_ping": True,  # Vérification de la connexion avant utilisation
+            "pool_recycle": pool_recycle,  # Renouvellement périodique des connexions
+            "pool_size": pool_size,  # Taille du pool de connexions
+            "max_overflow": max_overflow,  # Connexions supplémentaires autorisées
+            "pool_timeout": pool_timeout,  # Attente maximale d'une connexion libre
+        }
         
         # Création du moteur de base de données
-        self.engine = create_engine(
-            self.database_url,
-            echo=False,  # Mettre à True pour voir les requêtes SQL
-            pool_pre_ping=True,  # Vérification de la connexion avant utilisation
-            pool_recycle=300,  # Renouvellement des connexions toutes les 5 minutes
-            pool_size=10,  # Taille du pool de connexions
-            max_overflow=20  # Connexions supplémentaires autorisées
-        )
+        self.engine = self._create_engine(self.database_url, pool_options)
+        
+        # Moteur asynchrone : les accès (Database.run) s'exécutent sur la boucle d'événements
+        # sans occuper de thread du serveur
+        self.async_engine: Optional[AsyncEngine] = None
+        if async_mode:
+            self.async_engine = self._create_async_engine(self.database_url, async_driver, pool_options)
+        
+        # Réplicas en lecture (optionnels), avec les mêmes options de pool
+        self.replicas: Optional[ReplicaSet] = None
+        if replica_urls:
+            self.replicas = ReplicaSet(
+                [self._create_engine(replica_url, pool_options) for replica_url in replica_urls],
+                [
+                    self._create_async_engine(replica_url, async_driver, pool_options)
+                    for replica_url in replica_urls
+                ] if async_mode else None
+            )
+        
+        # Diagnostic des requêtes (optionnel) : comptage et chronométrage par requête HTTP
+        self.diagnostics: Optional[QueryDiagnostics] = None
+        if diagnostics:
+            self.diagnostics = QueryDiagnostics()
+            for engine in self.sync_engines().values():
+                self.diagnostics.attach(engine)
         
         # Logger pour les opérations de base de données
         self.logger = logging.getLogger(__name__)
     
+    @staticmethod
+    def _create_engine(database_url: str, pool_options: dict) -> Engine:
+        """Crée un moteur synchrone avec un pool mesuré (et la configuration SQLite)."""
+        url = make_url(database_url)
+        pool_options = dict(pool_options)
+        connect_args = {}
+        if url.get_backend_name() == "sqlite":
+            # Un fichier est requis : une base en mémoire serait propre à chaque connexion
+            if url.database in (None, "", ":memory:"):
+                raise ValueError("SQLite : une base sur fichier est requise (ex. sqlite:///ghs.db)")
+            # Connexions locales : la vérification avant emprunt coûterait une requête par lecture
+            pool_options["pool_pre_ping"] = False
+            connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT}
+        
+        engine = create_engine(
+            url,
+            echo=False,  # Mettre à True pour voir les requêtes SQL
+            poolclass=metered_pool(QueuePool),
+            connect_args=connect_args,
+            **pool_options
+        )
+        if url.get_backend_name() == "sqlite":
+            configure_sqlite(engine)
+        return engine
+    
+    @staticmethod
+    def _create_async_engine(database_url: str, async_driver: str, pool_options: dict) -> AsyncEngine:
+        """Crée un moteur asynchrone sur la même base, avec le pilote asynchrone."""
+        url = make_url(database_url)
+        return create_async_engine(
+            url.set(drivername=f"{url.get_backend_name()}+{async_driver}"),
+            echo=False,
+            poolclass=metered_pool(AsyncAdaptedQueuePool),
+            **pool_options
+        )
+    
+    def sync_engines(self) -> Dict[str, Engine]:
+        """Retourne les moteurs (vue synchrone des moteurs asynchrones), par nom."""
+        engines = {"sync": self.engine}
+        if self.async_engine is not None:
+            engines["async"] = self.async_engine.sync_engine
+        if self.replicas is not None:
+            for index, engine in enumerate(self.replicas.engines):
+                engines[f"replica{index}"] = engine
+                if self.replicas.async_engines is not None:
+                    engines[f"replica{index}_async"] = self.replicas.async_engines[index].sync_engine
+        return engines
+    
+    def session(self) -> Session:
+        """
+        Crée une session synchrone.
+        
+        Pendant une requête HTTP sûre (voir replicas.ReplicaRoutingMiddleware),
+        ses lectures sont servies par un réplica.
+        """
+        return RoutingSession(self.engine, replicas=self.replicas)
+    
+    def _async_session(self) -> AsyncSession:
+        """Crée une session asynchrone, routée comme session()."""
+        return AsyncSession(
+            self.async_engine, sync_session_class=RoutingSession,
+            replicas=self.replicas, use_async=True
+        )
+    
     def start(self) -> bool:
         """
         Connexion à la base de données.
         
+        Avec SQLite, crée au préalable les tables manquantes. Les réplicas
+        indisponibles sont écartés sans faire échouer le démarrage.
+        
         Returns:
             bool: True si la connexion fonctionne, False sinon
         """
         try:
+            if self.backend == "sqlite":
+                create_schema(self.engine)
             with Session(self.engine) as session:
                 session.exec(text("SELECT 1"))
                 self.logger.info("Connexion à la base de données réussie")
-                return True
+            if self.replicas is not None:
+                available = self.replicas.check()
+                self.logger.info("Réplicas disponibles: %s/%s", sum(available), len(available))
+            return True
         except Exception as e:
             self.logger.error("Échec de la connexion à la base de données: %s", e)
             return False
@@ -65,24 +235,128 @@ class Database:
         """
         Générateur de session pour les opérations de base de données.
         
+        Doit être consommé jusqu'au bout (dépendance FastAPI avec yield ou
+        contextlib.contextmanager) pour que la connexion retourne au pool.
+        
         Yields:
             Session: Session SQLModel avec gestion automatique des erreurs
         """
-        with Session(self.engine) as session:
+        with self.session() as session:
             try:
                 yield session
                 session.commit()  # Commit automatique si pas d'erreur
-            except Exception as e:
+            except SQLAlchemyError as e:
                 session.rollback()
                 self.logger.error("Erreur de session, rollback effectué: %s", e)
                 raise
+            except Exception:
+                # Erreurs métier (HTTPException...) : annuler sans journaliser
+                session.rollback()
+                raise
             finally:
                 session.close()
     
+    async def start_async(self) -> bool:
+        """
+        Vérifie la connexion du moteur asynchrone, s'il est activé.
+        
+        Returns:
+            bool: True si la connexion fonctionne (ou si le mode asynchrone est désactivé)
+        """
+        if self.async_engine is None:
+            return True
+        try:
+            async with AsyncSession(self.async_engine) as session:
+                await session.exec(text("SELECT 1"))
+                self.logger.info("Connexion asynchrone à la base de données réussie")
+                return True
+        except Exception as e:
+            self.logger.error("Échec de la connexion asynchrone à la base de données: %s", e)
+            return False
+    
+    async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Générateur de session asynchrone (mode asynchrone uniquement).
+        
+        Yields:
+            AsyncSession: Session asynchrone avec gestion automatique des erreurs
+        """
+        if self.async_engine is None:
+            raise RuntimeError("Le mode asynchrone n'est pas activé")
+        async with self._async_session() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                self.logger.error("Erreur de session asynchrone, rollback effectué: %s", e)
+                raise
+    
+    @staticmethod
+    def _pool_status(engine) -> dict:
+        """Retourne l'état d'un pool de connexions."""
+        pool = engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeouts": pool.metrics.timeouts,
+            "wait": pool.metrics.wait.snapshot(),
+        }
+    
+    def pool_status(self) -> dict:
+        """
+        Retourne l'état des pools de connexions (connexions empruntées,
+        débordement, temps d'attente d'une connexion).
+        """
+        return {name: self._pool_status(engine) for name, engine in self.sync_engines().items()}
+    
+    def _run_sync(self, func: Callable[..., T], *args) -> T:
+        """Exécute func(session, *args) dans une session synchrone dédiée."""
+        with self.session() as session:
+            return func(session, *args)
+    
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Exécute func(session, *args) sans bloquer la boucle d'événements.
+        
+        En mode asynchrone, func s'exécute sur le moteur asynchrone via
+        AsyncSession.run_sync ; sinon, dans le pool de threads avec une
+        session synchrone. func reçoit toujours une Session classique.
+        
+        Returns:
+            Le résultat de func
+        """
+        if self.async_engine is not None:
+            async with self._async_session() as session:
+                return await session.run_sync(func, *args)
+        return await run_in_threadpool(self._run_sync, func, *args)
+    
+    async def monitor_replicas(self, interval: float = DB_REPLICA_CHECK_INTERVAL):
+        """Contrôle périodiquement les réplicas (tâche de fond, jusqu'à annulation)."""
+        while True:
+            await asyncio.sleep(interval)
+            await run_in_threadpool(self.replicas.check)
+    
     def close(self):
         """
         Ferme la connexion à la base de données.
         """
         if self.engine:
             self.engine.dispose()
-            self.logger.info("Connexion fermée")
\ No newline at end of file
+            self.logger.info("Connexion fermée")
+        if self.replicas is not None:
+            for engine in self.replicas.engines:
+                engine.dispose()
+    
+    async def close_async(self):
+        """
+        Ferme le moteur asynchrone, s'il est activé.
+        """
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+            self.logger.info("Connexion asynchrone fermée")
+        if self.replicas is not None and self.replicas.async_engines is not None:
+            for engine in self.replicas.async_engines:
+                await engine.dispose()
\ No newline at end of file
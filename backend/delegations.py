@@ -0,0 +1,166 @@
+"""Résolution en mémoire des délégations de validation."""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from models import Delegation
+
+logger = logging.getLogger(__name__)
+
+# Durée (en secondes) après laquelle l'index est rechargé depuis la base,
+# pour prendre en compte les délégations créées par les autres workers
+DELEGATION_INDEX_REFRESH = float(os.getenv("DELEGATION_INDEX_REFRESH", "60"))
+
+
+class _DelegatorIntervals:
+    """Délégations d'un même délégant, triées par date de début."""
+
+    __slots__ = ("starts", "entries")
+
+    def __init__(self):
+        self.starts: List[date] = []
+        self.entries: List[Tuple[date, date, int, int]] = []  # (début, fin, délégué, ID)
+
+    def add(self, start_at: date, end_at: date, delegated_to: int, delegation_id: int) -> None:
+        entry = (start_at, end_at, delegated_to, delegation_id)
+        position = bisect.bisect_right(self.entries, entry)
+        self.entries.insert(position, entry)
+        self.starts.insert(position, start_at)
+
+    def find(self, on_date: date) -> Optional[Tuple[date, date, int, int]]:
+        """Retourne la délégation commencée le plus récemment et couvrant la date."""
+        position = bisect.bisect_right(self.starts, on_date)
+        if position == 0:
+            return None
+        entry = self.entries[position - 1]
+        return entry if entry[1] >= on_date else None
+
+
+class DelegationResolver:
+    """
+    Index d'intervalles des délégations, par délégant.
+
+    La recherche de la délégation active d'un employé à une date est une
+    recherche dichotomique ; la résolution suit ensuite la chaîne des
+    délégations (A délègue à B qui délègue à C) jusqu'à un employé sans
+    délégation active. Les délégations d'un même délégant ne se
+    chevauchant pas, la délégation trouvée est unique.
+
+    Un index inverse (délégué -> délégations reçues) permet de retrouver
+    les délégants d'un employé en remontant les chaînes depuis celui-ci,
+    sans parcourir tous les délégants.
+
+    L'index est propre au processus : il est chargé au démarrage, mis à
+    jour par les endpoints de délégation et rechargé toutes les
+    DELEGATION_INDEX_REFRESH secondes.
+    """
+
+    def __init__(self, refresh_interval: float = DELEGATION_INDEX_REFRESH):
+        self.refresh_interval = refresh_interval
+        self._index: Dict[int, _DelegatorIntervals] = {}
+        self._received: Dict[int, List[Tuple[date, date, int]]] = {}  # délégué -> (début, fin, délégant)
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def load(self, session: Session) -> int:
+        """Charge toutes les délégations depuis la base. Retourne leur nombre."""
+        rows = session.exec(
+            select(Delegation.delegatedBy, Delegation.delegatedTo, Delegation.startAt,
+                   Delegation.endAt, Delegation.delegationID)
+        ).all()
+        index: Dict[int, _DelegatorIntervals] = {}
+        received: Dict[int, List[Tuple[date, date, int]]] = {}
+        for delegated_by, delegated_to, start_at, end_at, delegation_id in rows:
+            index.setdefault(delegated_by, _DelegatorIntervals()).add(
+                start_at, end_at, delegated_to, delegation_id
+            )
+            received.setdefault(delegated_to, []).append((start_at, end_at, delegated_by))
+        with self._lock:
+            self._index = index
+            self._received = received
+            self._loaded_at = time.monotonic()
+        return len(rows)
+
+    def refresh_if_stale(self, session: Session) -> None:
+        """Recharge l'index s'il n'a jamais été chargé ou s'il est trop ancien."""
+        with self._lock:
+            loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.refresh_interval:
+            self.load(session)
+
+    def add(self, delegation: Delegation) -> None:
+        """Ajoute une délégation à l'index."""
+        with self._lock:
+            self._index.setdefault(delegation.delegatedBy, _DelegatorIntervals()).add(
+                delegation.startAt, delegation.endAt, delegation.delegatedTo,
+                delegation.delegationID
+            )
+            self._received.setdefault(delegation.delegatedTo, []).append(
+                (delegation.startAt, delegation.endAt, delegation.delegatedBy)
+            )
+
+    def resolve(self, employee_id: int, on_date: date) -> Tuple[int, List[int], bool]:
+        """
+        Résout le validateur effectif d'un employé à une date.
+
+        Returns:
+            Tuple (validateur effectif, chaîne des employés parcourus, cycle détecté).
+            En cas de cycle, la délégation n'est pas appliquée et l'employé
+            initial reste le validateur effectif.
+        """
+        chain = [employee_id]
+        seen = {employee_id}
+        with self._lock:
+            current = employee_id
+            while True:
+                intervals = self._index.get(current)
+                entry = intervals.find(on_date) if intervals is not None else None
+                if entry is None:
+                    return current, chain, False
+                current = entry[2]
+                if current in seen:
+                    logger.warning(
+                        "Cycle de délégations détecté au %s: %s -> %s", on_date, chain, current
+                    )
+                    return employee_id, chain, True
+                seen.add(current)
+                chain.append(current)
+
+    def _active_delegate(self, delegator_id: int, on_date: date) -> Optional[int]:
+        intervals = self._index.get(delegator_id)
+        entry = intervals.find(on_date) if intervals is not None else None
+        return entry[2] if entry is not None else None
+
+    def delegators_of(self, employee_id: int, on_date: date) -> List[int]:
+        """
+        Retourne les employés dont les validations reviennent à l'employé à la date.
+
+        Les chaînes sont remontées depuis l'employé par l'index inverse :
+        le coût dépend du nombre de délégants trouvés, pas du nombre total
+        de délégations. Un employé qui délègue lui-même n'en reçoit aucune.
+        """
+        with self._lock:
+            if self._active_delegate(employee_id, on_date) is not None:
+                return []
+            delegators: List[int] = []
+            pending = [employee_id]
+            seen = {employee_id}
+            while pending:
+                delegate_id = pending.pop()
+                for start_at, end_at, delegator_id in self._received.get(delegate_id, ()):
+                    if (start_at <= on_date <= end_at and delegator_id not in seen
+                            and self._active_delegate(delegator_id, on_date) == delegate_id):
+                        seen.add(delegator_id)
+                        delegators.append(delegator_id)
+                        pending.append(delegator_id)
+            return delegators
+
+
+delegation_resolver = DelegationResolver()
@@ -0,0 +1,171 @@
+"""
+Diagnostic des requêtes SQL : requêtes lentes et motifs N+1 par requête HTTP.
+
+Mode optionnel (DB_DIAGNOSTICS=True) : des écouteurs sur le moteur comptent
+et chronomètrent chaque instruction SQL ; à la fin de chaque requête HTTP,
+les requêtes qui dépassent les seuils sont journalisées et conservées dans
+un tampon circulaire consultable sur /admin/db-diagnostics.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Deque, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Seuils de détection
+DB_DIAGNOSTICS_MAX_QUERIES = int(os.getenv("DB_DIAGNOSTICS_MAX_QUERIES", "20"))
+DB_DIAGNOSTICS_SLOW_MS = float(os.getenv("DB_DIAGNOSTICS_SLOW_MS", "200"))
+# Nombre de constats conservés en mémoire
+DB_DIAGNOSTICS_BUFFER = int(os.getenv("DB_DIAGNOSTICS_BUFFER", "200"))
+
+# Nombre d'instructions répétées rapportées par constat
+TOP_STATEMENTS = 5
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAMETER_LIST = re.compile(r"\(\s*(?:%s|\?|%\(\w+\)s)(?:\s*,\s*(?:%s|\?|%\(\w+\)s))*\s*\)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(statement: str) -> str:
+    """Normalise une instruction SQL (espaces, littéraux, listes de paramètres)."""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PARAMETER_LIST.sub("(...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class RequestQueries:
+    """Instructions SQL exécutées pendant une requête HTTP."""
+
+    __slots__ = ("count", "statements", "slow")
+
+    def __init__(self):
+        self.count = 0
+        self.statements: Counter = Counter()
+        self.slow: List[Tuple[str, float]] = []
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("db_diagnostics", default=None)
+
+
+class QueryDiagnostics:
+    """Détecteur de requêtes lentes et de motifs N+1, avec tampon circulaire."""
+
+    def __init__(self, max_queries: int = DB_DIAGNOSTICS_MAX_QUERIES,
+                 slow_ms: float = DB_DIAGNOSTICS_SLOW_MS,
+                 buffer_size: int = DB_DIAGNOSTICS_BUFFER):
+        self.max_queries = max_queries
+        self.slow_ms = slow_ms
+        self._findings: Deque[dict] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        """Installe les écouteurs de comptage et de chronométrage sur un moteur."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            context._diagnostics_started = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            queries = _current.get()
+            started = getattr(context, "_diagnostics_started", None)
+            if queries is None or started is None:
+                return
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            normalized = normalize_sql(statement)
+            queries.count += 1
+            queries.statements[normalized] += 1
+            if elapsed_ms >= self.slow_ms:
+                queries.slow.append((normalized, elapsed_ms))
+
+    def start_request(self):
+        """Commence le suivi d'une requête HTTP. Retourne le jeton du contexte."""
+        return _current.set(RequestQueries())
+
+    def finish_request(self, token, method: str, route: str, duration: float) -> None:
+        """Termine le suivi d'une requête HTTP et enregistre les constats éventuels."""
+        queries = _current.get()
+        _current.reset(token)
+        if queries is None:
+            return
+
+        kinds = []
+        if queries.count > self.max_queries:
+            kinds.append("too_many_queries")
+        if queries.slow:
+            kinds.append("slow_query")
+        if not kinds:
+            return
+
+        finding = {
+            "at": datetime.utcnow().isoformat(),
+            "kinds": kinds,
+            "method": method,
+            "route": route,
+            "duration_ms": round(duration * 1000, 1),
+            "query_count": queries.count,
+            "repeated": [
+                {"sql": sql, "count": count}
+                for sql, count in queries.statements.most_common(TOP_STATEMENTS)
+                if count > 1
+            ],
+            "slow": [
+                {"sql": sql, "ms": round(elapsed_ms, 1)}
+                for sql, elapsed_ms in sorted(queries.slow, key=lambda item: -item[1])[:TOP_STATEMENTS]
+            ],
+        }
+        with self._lock:
+            self._findings.append(finding)
+        logger.warning("Diagnostic SQL: %s", json.dumps(finding, ensure_ascii=False))
+
+    def snapshot(self) -> dict:
+        """Retourne les seuils et les constats, du plus récent au plus ancien."""
+        with self._lock:
+            findings = list(reversed(self._findings))
+        return {
+            "max_queries": self.max_queries,
+            "slow_ms": self.slow_ms,
+            "findings": findings,
+        }
+
+    def clear(self) -> None:
+        """Vide le tampon des constats."""
+        with self._lock:
+            self._findings.clear()
+
+
+class DiagnosticsMiddleware:
+    """Middleware ASGI qui délimite le suivi des instructions SQL par requête HTTP."""
+
+    def __init__(self, app: ASGIApp, diagnostics: QueryDiagnostics):
+        self.app = app
+        self.diagnostics = diagnostics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = self.diagnostics.start_request()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = getattr(scope.get("route"), "path", scope["path"])
+            self.diagnostics.finish_request(
+                token, scope["method"], route, time.perf_counter() - start_time
+            )
@@ -0,0 +1,147 @@
+"""Chargement anticipé des relations demandées par le paramètre expand."""
+
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+from sqlalchemy.orm import joinedload, selectinload
+
+from fastjson import trusted_dump, trusted_dump_optional
+
+from models import (
+    Request, Employee, Workflow,
+    ServiceRead, EmployeeRead, RequestRead, WorkflowRead,
+    EmployeeReadWithService, RequestReadWithRelations, WorkflowReadWithRelations
+)
+
+REQUEST_EXPANSIONS = {"employee", "service", "creator", "workflows"}
+EMPLOYEE_EXPANSIONS = {"service"}
+WORKFLOW_EXPANSIONS = {"request", "validator", "delegate"}
+
+
+def parse_expand(expand: Optional[str], allowed: Set[str]) -> Set[str]:
+    """
+    Analyse le paramètre expand (relations séparées par des virgules).
+
+    Raises:
+        HTTPException: Si une relation inconnue est demandée
+    """
+    if not expand:
+        return set()
+    fields = {field.strip() for field in expand.split(",") if field.strip()}
+    unknown = fields - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Relation(s) inconnue(s) pour expand: {', '.join(sorted(unknown))} "
+                   f"(valeurs possibles: {', '.join(sorted(allowed))})"
+        )
+    return fields
+
+
+# Les relations vers un seul objet sont jointes à la requête principale,
+# les collections sont chargées par une requête IN supplémentaire.
+
+def request_load_options(fields: Set[str]) -> List:
+    """Options de chargement des relations d'une demande."""
+    options = []
+    if "employee" in fields or "service" in fields:
+        employee_load = joinedload(Request.employee)
+        if "service" in fields:
+            employee_load = employee_load.joinedload(Employee.service)
+        options.append(employee_load)
+    if "creator" in fields:
+        options.append(joinedload(Request.creator))
+    if "workflows" in fields:
+        options.append(selectinload(Request.workflows))
+    return options
+
+
+def employee_load_options(fields: Set[str]) -> List:
+    """Options de chargement des relations d'un employé."""
+    return [joinedload(Employee.service)] if "service" in fields else []
+
+
+def workflow_load_options(fields: Set[str]) -> List:
+    """Options de chargement des relations d'un workflow."""
+    options = []
+    if "request" in fields:
+        options.append(joinedload(Workflow.request))
+    if "validator" in fields:
+        options.append(joinedload(Workflow.validator_employee))
+    if "delegate" in fields:
+        options.append(joinedload(Workflow.delegate_employee))
+    return options
+
+
+def _optional(schema, value):
+    return schema.model_validate(value) if value is not None else None
+
+
+def employee_read(employee: Employee, fields: Set[str]) -> EmployeeReadWithService:
+    """Construit la réponse d'un employé avec les seules relations demandées."""
+    data: Dict = EmployeeRead.model_validate(employee).model_dump()
+    if "service" in fields:
+        data["service"] = _optional(ServiceRead, employee.service)
+    return EmployeeReadWithService(**data)
+
+
+def request_read(request: Request, fields: Set[str]) -> RequestReadWithRelations:
+    """Construit la réponse d'une demande avec les seules relations demandées."""
+    data: Dict = RequestRead.model_validate(request).model_dump()
+    if "employee" in fields or "service" in fields:
+        data["employee"] = (
+            employee_read(request.employee, fields) if request.employee is not None else None
+        )
+    if "creator" in fields:
+        data["creator"] = _optional(EmployeeRead, request.creator)
+    if "workflows" in fields:
+        data["workflows"] = [WorkflowRead.model_validate(item) for item in request.workflows]
+    return RequestReadWithRelations(**data)
+
+
+def workflow_read(workflow: Workflow, fields: Set[str]) -> WorkflowReadWithRelations:
+    """Construit la réponse d'un workflow avec les seules relations demandées."""
+    data: Dict = WorkflowRead.model_validate(workflow).model_dump()
+    if "request" in fields:
+        data["request"] = _optional(RequestRead, workflow.request)
+    if "validator" in fields:
+        data["validator_employee"] = _optional(EmployeeRead, workflow.validator_employee)
+    if "delegate" in fields:
+        data["delegate_employee"] = _optional(EmployeeRead, workflow.delegate_employee)
+    return WorkflowReadWithRelations(**data)
+
+
+# Chemin rapide (FAST_JSON) : mêmes réponses, en dictionnaires construits sans validation
+
+def employee_payload(employee: Employee, fields: Set[str]) -> Dict[str, Any]:
+    """Équivalent de employee_read, sans validation."""
+    data = trusted_dump(employee, EmployeeRead)
+    if "service" in fields:
+        data["service"] = trusted_dump_optional(employee.service, ServiceRead)
+    return data
+
+
+def request_payload(request: Request, fields: Set[str]) -> Dict[str, Any]:
+    """Équivalent de request_read, sans validation."""
+    data = trusted_dump(request, RequestRead)
+    if "employee" in fields or "service" in fields:
+        data["employee"] = (
+            employee_payload(request.employee, fields) if request.employee is not None else None
+        )
+    if "creator" in fields:
+        data["creator"] = trusted_dump_optional(request.creator, EmployeeRead)
+    if "workflows" in fields:
+        data["workflows"] = [trusted_dump(item, WorkflowRead) for item in request.workflows]
+    return data
+
+
+def workflow_payload(workflow: Workflow, fields: Set[str]) -> Dict[str, Any]:
+    """Équivalent de workflow_read, sans validation."""
+    data = trusted_dump(workflow, WorkflowRead)
+    if "request" in fields:
+        data["request"] = trusted_dump_optional(workflow.request, RequestRead)
+    if "validator" in fields:
+        data["validator_employee"] = trusted_dump_optional(workflow.validator_employee, EmployeeRead)
+    if "delegate" in fields:
+        data["delegate_employee"] = trusted_dump_optional(workflow.delegate_employee, EmployeeRead)
+    return data
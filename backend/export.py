@@ -0,0 +1,123 @@
+"""Export en flux des demandes d'heures supplémentaires (CSV ou NDJSON)."""
+
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Iterator, List, Optional
+
+from sqlmodel import select
+
+from database import Database
+from hierarchy import service_filter
+from models import Request, Employee, Service, RequestStatus
+from pagination import keyset_condition
+from rollup import request_duration_hours
+
+# Nombre de lignes lues par requête SQL
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_COLUMNS = [
+    Request.requestID, Request.requestDate, Request.startAt, Request.endAt,
+    Request.previousStart, Request.previousEnd, Request.status, Request.comment,
+    Request.createdBy, Request.validatedN1At, Request.validatedN2At, Request.createdAt,
+    Employee.employeeID, Employee.employeeNumber, Employee.lastName, Employee.firstName,
+    Service.serviceID, Service.serviceCode, Service.serviceName,
+]
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS] + ["totalHours"]
+
+
+def _export_value(value: Any) -> Any:
+    """Convertit une valeur de colonne en valeur sérialisable."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def _export_row(row) -> List[Any]:
+    """Construit la ligne exportée (colonnes et durée en heures)."""
+    values = [_export_value(value) for value in row]
+    values.append(request_duration_hours(row.startAt, row.endAt))
+    return values
+
+
+def iter_requests_export(
+    database: Database,
+    export_format: str,
+    status_filter: Optional[List[RequestStatus]] = None,
+    service_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_subservices: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Produit l'export des demandes, jointes aux employés et services, par morceaux.
+
+    Les lignes sont lues par lots successifs en pagination keyset sur
+    (requestDate, requestID) : chaque lot est un parcours d'intervalle
+    d'index, la mémoire reste constante quel que soit le volume et le
+    premier morceau est émis dès le premier lot. Chaque lot utilise sa
+    propre session, la connexion retourne donc au pool entre deux lots
+    même si le client lit lentement. Avec include_subservices, le filtre
+    de service couvre tout son sous-arbre (table de fermeture).
+    """
+    statement = (
+        select(*EXPORT_COLUMNS)
+        .join(Employee, Employee.employeeID == Request.employeeID)
+        .join(Service, Service.serviceID == Employee.serviceID)
+    )
+    if status_filter:
+        statement = statement.where(Request.status.in_(status_filter))
+    if service_id is not None:
+        statement = statement.where(
+            service_filter(Employee.serviceID, service_id, include_subservices)
+        )
+    if date_from:
+        statement = statement.where(Request.requestDate >= date_from)
+    if date_to:
+        statement = statement.where(Request.requestDate <= date_to)
+    statement = statement.order_by(Request.requestDate, Request.requestID)
+
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue()
+
+    last_values = None
+    while True:
+        batch = statement
+        if last_values is not None:
+            batch = batch.where(
+                keyset_condition((Request.requestDate, Request.requestID), last_values,
+                                 descending=False)
+            )
+        with database.session() as session:
+            rows = session.exec(batch.limit(batch_size)).all()
+        if not rows:
+            return
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(_export_row(row) for row in rows)
+            yield buffer.getvalue()
+        else:
+            yield "".join(
+                json.dumps(dict(zip(EXPORT_FIELDS, _export_row(row))), ensure_ascii=False) + "\n"
+                for row in rows
+            )
+
+        if len(rows) < batch_size:
+            return
+        last_values = (rows[-1].requestDate, rows[-1].requestID)
@@ -0,0 +1,54 @@
+"""
+Sérialisation rapide des réponses de liste (optionnelle, FAST_JSON=True).
+
+Les réponses sont construites directement à partir des objets chargés
+(construction de confiance : les valeurs viennent de la base, déjà typées,
+sans validation Pydantic) puis encodées par orjson. L'endpoint renvoie une
+Response : FastAPI ne revalide ni ne réencode le contenu, et le
+response_model de l'endpoint continue de décrire le schéma OpenAPI.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Type
+
+from fastapi import Response
+from sqlmodel import SQLModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+FAST_JSON = os.getenv("FAST_JSON", "False").lower() == "true"
+if FAST_JSON and orjson is None:
+    logger.warning("FAST_JSON ignoré : le paquet orjson n'est pas installé")
+    FAST_JSON = False
+
+
+@lru_cache(maxsize=None)
+def _field_names(schema: Type[SQLModel]) -> Tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def trusted_dump(obj: Any, schema: Type[SQLModel]) -> Dict[str, Any]:
+    """Extrait d'un objet les champs d'un schéma de lecture, sans validation."""
+    return {name: getattr(obj, name) for name in _field_names(schema)}
+
+
+def trusted_dump_optional(obj: Any, schema: Type[SQLModel]) -> Optional[Dict[str, Any]]:
+    """Comme trusted_dump, pour une relation facultative."""
+    return trusted_dump(obj, schema) if obj is not None else None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode un contenu JSON (dates ISO 8601, énumérations par valeur) avec orjson."""
+    return orjson.dumps(content)
+
+
+def fast_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Construit une réponse JSON encodée par orjson, sans revalidation par FastAPI."""
+    return Response(content=dumps(content), media_type="application/json", headers=headers)
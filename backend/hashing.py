@@ -0,0 +1,127 @@
+"""Pool borné de hachage et de vérification des mots de passe."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from utils.latency import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+# Configuration du pool de hachage
+HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread")  # thread | process
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+HASH_POOL_MAX_PENDING = int(os.getenv("HASH_POOL_MAX_PENDING", "64"))
+
+# Contexte de hachage des mots de passe
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    """Vérifie un mot de passe (exécuté dans le pool)."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash(password: str) -> str:
+    """Hache un mot de passe (exécuté dans le pool)."""
+    return pwd_context.hash(password)
+
+
+class PasswordHasher:
+    """
+    Exécute bcrypt dans un pool dédié de taille fixe.
+
+    Le nombre d'opérations en attente ou en cours est borné : au-delà, la
+    demande est refusée immédiatement (503) au lieu d'occuper un thread du
+    serveur, ce qui protège les autres endpoints lors d'une vague de connexions.
+    """
+
+    def __init__(self, kind: str = HASH_POOL_KIND, max_workers: int = HASH_POOL_SIZE,
+                 max_pending: int = HASH_POOL_MAX_PENDING):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+        self.latency = LatencyRecorder()
+
+    def _get_executor(self) -> Executor:
+        """Crée le pool à la première utilisation."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                        )
+        return self._executor
+
+    def _submit(self, func: Callable, *args) -> Future:
+        """Soumet une opération au pool, ou lève une 503 si la file est pleine."""
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                logger.warning("File de hachage pleine (%s opérations en attente)", self._pending)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Service d'authentification saturé, veuillez réessayer",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        started = time.perf_counter()
+
+        def on_done(_future: Future) -> None:
+            self.latency.record(time.perf_counter() - started)
+            with self._lock:
+                self._pending -= 1
+
+        future = executor.submit(func, *args)
+        future.add_done_callback(on_done)
+        return future
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Vérifie un mot de passe sans bloquer la boucle d'événements."""
+        return await asyncio.wrap_future(self._submit(_verify, plain_password, hashed_password))
+
+    async def hash(self, password: str) -> str:
+        """Hache un mot de passe sans bloquer la boucle d'événements."""
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    def hash_blocking(self, password: str) -> str:
+        """Hache un mot de passe depuis un endpoint synchrone."""
+        return self._submit(_hash, password).result()
+
+    def stats(self) -> dict:
+        """Retourne l'état du pool et les latences des opérations."""
+        with self._lock:
+            pending, rejected = self._pending, self._rejected
+        return {
+            "kind": self.kind,
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": pending,
+            "rejected": rejected,
+            **self.latency.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        """Arrête le pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
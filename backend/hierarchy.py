@@ -0,0 +1,116 @@
+"""Maintenance de la table de fermeture de la hiérarchie des services."""
+
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from models import Service, ServiceClosure
+
+
+def subtree_ids(service_id: int):
+    """Sous-requête des IDs du service et de tous ses sous-services."""
+    return select(ServiceClosure.descendantID).where(ServiceClosure.ancestorID == service_id)
+
+
+def service_filter(column, service_id: int, include_subservices: bool = False):
+    """
+    Construit le filtre sur un service, éventuellement étendu à son sous-arbre.
+
+    Le sous-arbre est résolu par la table de fermeture en une seule
+    jointure indexée, quelle que soit la profondeur de la hiérarchie.
+    """
+    if include_subservices:
+        return column.in_(subtree_ids(service_id))
+    return column == service_id
+
+
+def add_service_node(session: Session, service_id: int, parent_id: Optional[int]) -> None:
+    """Enregistre un nouveau service (sans enfants) dans la table de fermeture."""
+    rows = [{"ancestorID": service_id, "descendantID": service_id, "depth": 0}]
+    if parent_id is not None:
+        ancestors = session.exec(
+            select(ServiceClosure.ancestorID, ServiceClosure.depth)
+            .where(ServiceClosure.descendantID == parent_id)
+        ).all()
+        rows.extend(
+            {"ancestorID": ancestor_id, "descendantID": service_id, "depth": depth + 1}
+            for ancestor_id, depth in ancestors
+        )
+    session.exec(insert(ServiceClosure), params=rows)
+
+
+def move_service_node(session: Session, service_id: int, parent_id: Optional[int]) -> None:
+    """
+    Rattache un service et tout son sous-arbre à un nouveau parent.
+
+    Les liens entre les anciens ancêtres et le sous-arbre sont supprimés,
+    puis chaque ancêtre du nouveau parent est relié à chaque nœud du
+    sous-arbre.
+
+    Raises:
+        HTTPException: Si le nouveau parent appartient au sous-arbre du service
+    """
+    subtree = dict(session.exec(
+        select(ServiceClosure.descendantID, ServiceClosure.depth)
+        .where(ServiceClosure.ancestorID == service_id)
+    ).all())
+    if parent_id is not None and parent_id in subtree:
+        raise HTTPException(
+            status_code=400,
+            detail="Un service ne peut pas être rattaché à l'un de ses sous-services"
+        )
+
+    session.exec(
+        delete(ServiceClosure)
+        .where(ServiceClosure.descendantID.in_(list(subtree)))
+        .where(ServiceClosure.ancestorID.notin_(list(subtree)))
+    )
+    if parent_id is None:
+        return
+
+    ancestors = session.exec(
+        select(ServiceClosure.ancestorID, ServiceClosure.depth)
+        .where(ServiceClosure.descendantID == parent_id)
+    ).all()
+    session.exec(insert(ServiceClosure), params=[
+        {"ancestorID": ancestor_id, "descendantID": descendant_id,
+         "depth": ancestor_depth + descendant_depth + 1}
+        for ancestor_id, ancestor_depth in ancestors
+        for descendant_id, descendant_depth in subtree.items()
+    ])
+
+
+def remove_service_node(session: Session, service_id: int) -> None:
+    """Retire un service sans enfants de la table de fermeture."""
+    session.exec(delete(ServiceClosure).where(ServiceClosure.descendantID == service_id))
+
+
+def rebuild_service_closure(session: Session) -> int:
+    """
+    Reconstruit entièrement la table de fermeture depuis parentServiceID.
+
+    Les cycles éventuels sont ignorés (la remontée s'arrête au premier
+    service déjà rencontré).
+
+    Returns:
+        Nombre de lignes insérées
+    """
+    parents: Dict[int, Optional[int]] = dict(
+        session.exec(select(Service.serviceID, Service.parentServiceID)).all()
+    )
+
+    rows: List[dict] = []
+    for service_id in parents:
+        ancestor_id, depth, seen = service_id, 0, set()
+        while ancestor_id is not None and ancestor_id in parents and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append({"ancestorID": ancestor_id, "descendantID": service_id, "depth": depth})
+            ancestor_id, depth = parents[ancestor_id], depth + 1
+
+    session.exec(delete(ServiceClosure))
+    if rows:
+        session.exec(insert(ServiceClosure), params=rows)
+    session.commit()
+    return len(rows)
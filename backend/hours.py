@@ -0,0 +1,98 @@
+"""
+Durées des demandes enregistrées dans requestEmployee.totalHours.
+
+La durée est calculée à l'écriture (création, modification des horaires) ;
+les agrégations additionnent alors une colonne numérique au lieu de
+recalculer TIME_TO_SEC(endAt) - TIME_TO_SEC(startAt) sur chaque ligne.
+"""
+
+import logging
+from typing import List
+
+from sqlalchemy import and_, exists, func, insert, update
+from sqlmodel import Session, select
+
+from bulk import insert_many
+from models import Request, RequestEmployee
+from rollup import request_duration_hours, request_hours
+
+logger = logging.getLogger(__name__)
+
+# Plage d'identifiants de demandes traitée par transaction lors du rattrapage
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def record_request_hours(session: Session, requests: List[Request]) -> None:
+    """Enregistre la durée de demandes nouvellement créées (identifiants attribués)."""
+    insert_many(session, RequestEmployee, [
+        {
+            "employeeID": request.employeeID,
+            "requestID": request.requestID,
+            "totalHours": request_duration_hours(request.startAt, request.endAt),
+        }
+        for request in requests
+    ])
+
+
+def update_request_hours(session: Session, request: Request) -> None:
+    """Met à jour la durée enregistrée d'une demande modifiée (la crée si elle manque)."""
+    hours = request_duration_hours(request.startAt, request.endAt)
+    result = session.exec(
+        update(RequestEmployee)
+        .where(RequestEmployee.requestID == request.requestID,
+               RequestEmployee.employeeID == request.employeeID)
+        .values(totalHours=hours)
+    )
+    if result.rowcount == 0:
+        record_request_hours(session, [request])
+
+
+def join_request_hours(statement):
+    """Joint la durée enregistrée à une requête portant sur les demandes."""
+    return statement.outerjoin(
+        RequestEmployee,
+        and_(RequestEmployee.requestID == Request.requestID,
+             RequestEmployee.employeeID == Request.employeeID)
+    )
+
+
+def stored_request_hours():
+    """
+    Expression SQL de la durée d'une demande, à utiliser avec join_request_hours.
+
+    Les demandes pas encore rattrapées retombent sur le calcul à partir des horaires.
+    """
+    return func.coalesce(RequestEmployee.totalHours, request_hours())
+
+
+def backfill_request_hours(session: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Enregistre la durée des demandes qui n'en ont pas encore.
+
+    Parcourt les demandes par plages d'identifiants, un INSERT ... SELECT
+    et une transaction par plage.
+
+    Returns:
+        int: Nombre de lignes créées
+    """
+    first_id, last_id = session.exec(
+        select(func.coalesce(func.min(Request.requestID), 1), func.coalesce(func.max(Request.requestID), 0))
+    ).one()
+    missing = ~exists().where(
+        RequestEmployee.requestID == Request.requestID,
+        RequestEmployee.employeeID == Request.employeeID
+    )
+    total = 0
+    for batch_start in range(first_id, last_id + 1, batch_size):
+        source = select(Request.employeeID, Request.requestID, request_hours()).where(
+            Request.requestID >= batch_start,
+            Request.requestID < batch_start + batch_size,
+            missing
+        )
+        result = session.exec(
+            insert(RequestEmployee).from_select(["employeeID", "requestID", "totalHours"], source)
+        )
+        session.commit()
+        total += result.rowcount
+    logger.info("Durées des demandes rattrapées: %s lignes", total)
+    return total
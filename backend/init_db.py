@@ -3,10 +3,12 @@
 import os
 from datetime import date, time, datetime
 from dotenv import load_dotenv
+from sqlmodel import Session
 
 from database import Database
 from models import Service, Employee, Account, ContractType, ProfileType
 from auth import get_password_hash
+from hierarchy import add_service_node
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -21,7 +23,8 @@ def init_database():
         "db_password": os.getenv("DB_PASSWORD", ""),
         "db_host": os.getenv("DB_HOST", "localhost"),
         "db_port": int(os.getenv("DB_PORT", "3306")),
-        "db_name": os.getenv("DB_NAME", "ghs")
+        "db_name": os.getenv("DB_NAME", "ghs"),
+        "database_url": os.getenv("DATABASE_URL") or None
     }
     
     database = Database(**config)
@@ -30,9 +33,8 @@ def init_database():
         print("❌ Impossible de se connecter à la base de données")
         return False
     
+    session = Session(database.engine)
     try:
-        session = next(database.get_session())
-        
         # Créer des services de test
         print("📋 Création des services...")
         services_data = [
@@ -60,6 +62,8 @@ def init_database():
         for service_data in services_data:
             service = Service(**service_data)
             session.add(service)
+            session.flush()
+            add_service_node(session, service.serviceID, service.parentServiceID)
             session.commit()
             session.refresh(service)
             created_services.append(service)
@@ -155,6 +159,7 @@ def init_database():
         return False
     
     finally:
+        session.close()
         database.close()
 
 if __name__ == "__main__":
@@ -1,13 +1,17 @@
 """Application FastAPI pour la gestion des heures supplémentaires (GHS)."""
 
+import asyncio
 import os
 import logging
+import time
 from contextlib import asynccontextmanager
-from typing import List
-from datetime import timedelta
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 
+import anyio
 from dotenv import load_dotenv
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import Session, select
@@ -20,19 +24,51 @@ from models import (
     Service, ServiceCreate, ServiceUpdate, ServiceRead,
     Employee, EmployeeCreate, EmployeeUpdate, EmployeeRead,
     Account, AccountCreate, AccountUpdate, AccountRead, AccountLogin,
-    Request, RequestCreate, RequestUpdate, RequestRead,
-    Delegation, DelegationCreate, DelegationUpdate, DelegationRead,
-    Workflow, WorkflowCreate, WorkflowUpdate, WorkflowRead
+    Request, RequestCreate, RequestUpdate, RequestRead, RequestStatus,
+    RequestBulkItemResult, RequestBulkResult,
+    Delegation, DelegationCreate, DelegationUpdate, DelegationRead, DelegationResolution,
+    Workflow, WorkflowCreate, WorkflowUpdate, WorkflowRead,
+    EmployeeReadWithService, RequestReadWithRelations, WorkflowReadWithRelations,
+    WorkflowDecision, WorkflowDecisionResult, WorkflowInboxItem,
+    StatsRead, ServiceChanges, EmployeeChanges, RequestChanges
 )
 from auth import (
-    init_auth, authenticate_user, create_access_token, get_password_hash,
-    get_current_active_user, require_profile, ACCESS_TOKEN_EXPIRE_MINUTES
+    init_auth, authenticate_user, create_access_token,
+    get_current_active_user, require_profile, account_claims, principal_cache,
+    ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from hashing import password_hasher
+from utils.latency import LatencyRecorder
 from middleware import ErrorHandlerMiddleware, LoggingMiddleware
+from metrics import MetricsMiddleware, register_database, metrics_response
+from diagnostics import DiagnosticsMiddleware
+from replicas import ReplicaRoutingMiddleware, WriteTracker, read_from_primary
+from stats import compute_stats
+from rollup import RollupDelta, request_contribution, snapshot_request, rebuild_employee_rollup
+from pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER,
+    encode_cursor, decode_cursor, keyset_condition
+)
+from bulk import insert_many
+from overtime_limits import check_request_limits, collect_limit_errors
+from hours import record_request_hours, update_request_hours
+from export import EXPORT_FORMATS, iter_requests_export
+from hierarchy import service_filter, add_service_node, move_service_node, remove_service_node
+from delegations import delegation_resolver
+from workflows import decide_requests, load_inbox
+from refcache import reference_cache, serialize_items, serialize_payloads, cached_response
+from fastjson import FAST_JSON, fast_response, trusted_dump
+from changes import load_changes, record_employee_deletion, record_service_deletion
+from expand import (
+    REQUEST_EXPANSIONS, EMPLOYEE_EXPANSIONS, WORKFLOW_EXPANSIONS, parse_expand,
+    request_load_options, employee_load_options, workflow_load_options,
+    request_read, employee_read, workflow_read,
+    request_payload, employee_payload, workflow_payload
+)
 from validators import (
-    validate_time_range, validate_date_range, validate_request_date,
+    validate_date_range, validate_request_date,
     validate_working_hours, validate_employee_number_format,
-    validate_service_code_format
+    validate_service_code_format, validate_request_create, collect_validation_errors
 )
 
 # Configuration du logging
@@ -47,24 +83,54 @@ DB_CONFIG = {
     "db_password": os.getenv("DB_PASSWORD", ""),
     "db_host": os.getenv("DB_HOST", "localhost"),
     "db_port": int(os.getenv("DB_PORT", "3306")),
-    "db_name": os.getenv("DB_NAME", "ghs")
+    "db_name": os.getenv("DB_NAME", "ghs"),
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "300")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "async_mode": os.getenv("DB_ASYNC", "False").lower() == "true",
+    "async_driver": os.getenv("DB_ASYNC_DRIVER", "aiomysql"),
+    "diagnostics": os.getenv("DB_DIAGNOSTICS", "False").lower() == "true",
+    # URL SQLAlchemy complète (ex. sqlite:///ghs.db), prioritaire sur les variables DB_*
+    "database_url": os.getenv("DATABASE_URL") or None,
+    # Réplicas en lecture, URL séparées par des virgules
+    "replica_urls": [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
 }
 
+# Taille du pool de threads des accès à la base hors mode asynchrone (0 : valeur par défaut d'AnyIO)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "0"))
+
+# Nombre maximal de demandes par lot
+MAX_BULK_REQUESTS = int(os.getenv("MAX_BULK_REQUESTS", "1000"))
+
 # Instance de base de données
 database = Database(**DB_CONFIG)
 
 # Initialiser l'authentification
 init_auth(database)
 
+# Instrumenter les moteurs (durée des requêtes SQL, état des pools)
+register_database(database)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestionnaire de cycle de vie de l'application."""
     # Démarrage
-    if not database.start():
+    if not database.start() or not await database.start_async():
         raise RuntimeError("Impossible de se connecter à la base de données")
+    if THREADPOOL_SIZE > 0:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    await database.run(delegation_resolver.load)
+    replica_monitor = None
+    if database.replicas is not None:
+        replica_monitor = asyncio.create_task(database.monitor_replicas())
     yield
     # Arrêt
+    if replica_monitor is not None:
+        replica_monitor.cancel()
+    password_hasher.shutdown()
+    await database.close_async()
     database.close()
 
 
@@ -79,6 +145,11 @@ app = FastAPI(
 # Ajout des middlewares
 app.add_middleware(ErrorHandlerMiddleware)
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
+if database.diagnostics is not None:
+    app.add_middleware(DiagnosticsMiddleware, diagnostics=database.diagnostics)
+if database.replicas is not None:
+    app.add_middleware(ReplicaRoutingMiddleware, tracker=WriteTracker())
 # Configuration CORS
 cors_origins = os.getenv("CORS_ORIGINS", "").split(",") if os.getenv("CORS_ORIGINS") else ["*"]
 app.add_middleware(
@@ -87,22 +158,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 
-def get_session() -> Session:
-    """Dépendance pour obtenir une session de base de données."""
-    return next(database.get_session())
-
-
 # ============================================================================
 # ENDPOINTS AUTHENTIFICATION
 # ============================================================================
 
+# Latences de bout en bout des connexions
+login_latency = LatencyRecorder()
+
+
 @app.post("/auth/login", tags=["Authentication"])
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Connexion utilisateur avec génération de token JWT."""
-    user = authenticate_user(form_data.username, form_data.password, session)
+    started = time.perf_counter()
+    try:
+        user = await authenticate_user(form_data.username, form_data.password)
+    finally:
+        login_latency.record(time.perf_counter() - started)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,7 +187,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = D
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=account_claims(user), expires_delta=access_token_expires
     )
     
     return {
@@ -128,7 +203,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = D
 
 
 @app.get("/auth/me", response_model=AccountRead, tags=["Authentication"])
-def get_current_user_info(current_user: Account = Depends(get_current_active_user)):
+async def get_current_user_info(current_user: Account = Depends(get_current_active_user)):
     """Récupère les informations de l'utilisateur connecté."""
     return current_user
 
@@ -138,83 +213,156 @@ def get_current_user_info(current_user: Account = Depends(get_current_active_use
 # ============================================================================
 
 @app.get("/services", response_model=List[ServiceRead], tags=["Services"])
-def get_services(session: Session = Depends(get_session)):
-    """Récupère tous les services."""
-    services = session.exec(select(Service)).all()
-    return services
+async def get_services(if_none_match: Optional[str] = Header(default=None)):
+    """
+    Récupère tous les services.
+
+    La réponse sérialisée est mise en cache jusqu'à la prochaine
+    modification d'un service ; elle porte un ETag et If-None-Match
+    renvoie 304 si le client a déjà la version courante.
+    """
+    def load(session: Session):
+        services = session.exec(select(Service)).all()
+        if FAST_JSON:
+            return serialize_payloads(trusted_dump(service, ServiceRead) for service in services)
+        return serialize_items(ServiceRead.model_validate(service) for service in services)
+
+    cached = reference_cache.get("services")
+    if cached is None:
+        version = reference_cache.version("services")
+        cached = reference_cache.set("services", (), version, await database.run(load))
+    return cached_response(cached, if_none_match)
+
+
+@app.get("/services/changes", response_model=ServiceChanges, tags=["Services"])
+async def get_service_changes(
+    since: Optional[str] = Query(default=None, description="Curseur de la synchronisation précédente"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    Récupère les services modifiés et supprimés depuis un curseur.
+
+    Sans curseur, renvoie tous les services. Tant que hasMore est vrai,
+    rappeler avec le curseur renvoyé. Lu sur la base principale.
+    """
+    read_from_primary()
+    return await database.run(load_changes, "services", since, limit)
 
 
 @app.get("/services/{service_id}", response_model=ServiceRead, tags=["Services"])
-def get_service(service_id: int, session: Session = Depends(get_session)):
+async def get_service(service_id: int):
     """Récupère un service par son ID."""
-    service = session.get(Service, service_id)
+    service = await database.run(lambda session: session.get(Service, service_id))
     if not service:
         raise HTTPException(status_code=404, detail="Service non trouvé")
     return service
 
 
 @app.post("/services", response_model=ServiceRead, tags=["Services"])
-def create_service(
+async def create_service(
     service: ServiceCreate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
 ):
     """Crée un nouveau service."""
     # Validation du format du code service
     validate_service_code_format(service.serviceCode)
     
-    # Vérifier l'unicité du code service
-    existing_service = session.exec(
-        select(Service).where(Service.serviceCode == service.serviceCode)
-    ).first()
-    if existing_service:
-        raise HTTPException(
-            status_code=400,
-            detail="Un service avec ce code existe déjà"
-        )
+    def write(session: Session):
+        # Vérifier l'unicité du code service
+        existing_service = session.exec(
+            select(Service).where(Service.serviceCode == service.serviceCode)
+        ).first()
+        if existing_service:
+            raise HTTPException(
+                status_code=400,
+                detail="Un service avec ce code existe déjà"
+            )
+        
+        # Vérifier que le service parent existe
+        if service.parentServiceID is not None and not session.get(Service, service.parentServiceID):
+            raise HTTPException(
+                status_code=400,
+                detail="Le service parent spécifié n'existe pas"
+            )
+        
+        db_service = Service.model_validate(service)
+        session.add(db_service)
+        session.flush()
+        add_service_node(session, db_service.serviceID, db_service.parentServiceID)
+        session.commit()
+        session.refresh(db_service)
+        return ServiceRead.model_validate(db_service)
     
-    db_service = Service.model_validate(service)
-    session.add(db_service)
-    session.commit()
-    session.refresh(db_service)
-    return db_service
+    created = await database.run(write)
+    reference_cache.invalidate("services", "employees")
+    return created
 
 
 @app.put("/services/{service_id}", response_model=ServiceRead, tags=["Services"])
-def update_service(
+async def update_service(
     service_id: int, 
     service: ServiceUpdate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
 ):
     """Met à jour un service."""
-    db_service = session.get(Service, service_id)
-    if not db_service:
-        raise HTTPException(status_code=404, detail="Service non trouvé")
+    def write(session: Session):
+        db_service = session.get(Service, service_id)
+        if not db_service:
+            raise HTTPException(status_code=404, detail="Service non trouvé")
+        
+        service_data = service.model_dump(exclude_unset=True)
+        
+        # Rattacher le sous-arbre au nouveau parent
+        parent_id = service_data.get("parentServiceID", db_service.parentServiceID)
+        if parent_id != db_service.parentServiceID:
+            if parent_id is not None and not session.get(Service, parent_id):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Le service parent spécifié n'existe pas"
+                )
+            move_service_node(session, service_id, parent_id)
+        
+        for key, value in service_data.items():
+            setattr(db_service, key, value)
+        
+        session.add(db_service)
+        session.commit()
+        session.refresh(db_service)
+        return ServiceRead.model_validate(db_service)
     
-    service_data = service.model_dump(exclude_unset=True)
-    for key, value in service_data.items():
-        setattr(db_service, key, value)
-    
-    session.add(db_service)
-    session.commit()
-    session.refresh(db_service)
-    return db_service
+    updated = await database.run(write)
+    reference_cache.invalidate("services", "employees")
+    return updated
 
 
 @app.delete("/services/{service_id}", tags=["Services"])
-def delete_service(
+async def delete_service(
     service_id: int, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator"]))
 ):
     """Supprime un service."""
-    service = session.get(Service, service_id)
-    if not service:
-        raise HTTPException(status_code=404, detail="Service non trouvé")
+    def write(session: Session):
+        service = session.get(Service, service_id)
+        if not service:
+            raise HTTPException(status_code=404, detail="Service non trouvé")
+        
+        # Un service ne peut être supprimé que s'il n'a plus de sous-services
+        child_service = session.exec(
+            select(Service.serviceID).where(Service.parentServiceID == service_id)
+        ).first()
+        if child_service is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="Ce service possède des sous-services"
+            )
+        
+        record_service_deletion(session, service_id)
+        remove_service_node(session, service_id)
+        session.delete(service)
+        session.commit()
     
-    session.delete(service)
-    session.commit()
+    await database.run(write)
+    reference_cache.invalidate("services", "employees")
     return {"message": "Service supprimé avec succès"}
 
 
@@ -222,92 +370,168 @@ def delete_service(
 # ENDPOINTS EMPLOYEES
 # ============================================================================
 
-@app.get("/employees", response_model=List[EmployeeRead], tags=["Employees"])
-def get_employees(session: Session = Depends(get_session)):
-    """Récupère tous les employés."""
-    employees = session.exec(select(Employee)).all()
-    return employees
+@app.get("/employees", response_model=List[EmployeeReadWithService],
+         response_model_exclude_unset=True, tags=["Employees"])
+async def get_employees(
+    serviceID: Optional[int] = None,
+    includeSubServices: bool = False,
+    expand: Optional[str] = Query(default=None, description="Relations à inclure : service"),
+    if_none_match: Optional[str] = Header(default=None)
+):
+    """
+    Récupère les employés, éventuellement filtrés par service (et sous-services).
+
+    Chaque variante (filtres, expand) est mise en cache sérialisée jusqu'à
+    la prochaine modification d'un employé ou d'un service, avec ETag.
+    """
+    fields = parse_expand(expand, EMPLOYEE_EXPANSIONS)
+    cache_key = (serviceID, includeSubServices, tuple(sorted(fields)))
+    cached = reference_cache.get("employees", cache_key)
+    if cached is not None:
+        return cached_response(cached, if_none_match)
+    
+    statement = select(Employee).options(*employee_load_options(fields))
+    if serviceID is not None:
+        statement = statement.where(
+            service_filter(Employee.serviceID, serviceID, includeSubServices)
+        )
+
+    def load(session: Session):
+        employees = session.exec(statement).all()
+        if FAST_JSON:
+            return serialize_payloads(employee_payload(employee, fields) for employee in employees)
+        return serialize_items(employee_read(employee, fields) for employee in employees)
+
+    version = reference_cache.version("employees")
+    cached = reference_cache.set("employees", cache_key, version, await database.run(load))
+    return cached_response(cached, if_none_match)
+
+
+@app.get("/employees/changes", response_model=EmployeeChanges, tags=["Employees"])
+async def get_employee_changes(
+    since: Optional[str] = Query(default=None, description="Curseur de la synchronisation précédente"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    Récupère les employés modifiés et supprimés depuis un curseur.
+
+    Sans curseur, renvoie tous les employés. Tant que hasMore est vrai,
+    rappeler avec le curseur renvoyé. Lu sur la base principale.
+    """
+    read_from_primary()
+    return await database.run(load_changes, "employees", since, limit)
 
 
-@app.get("/employees/{employee_id}", response_model=EmployeeRead, tags=["Employees"])
-def get_employee(employee_id: int, session: Session = Depends(get_session)):
+@app.get("/employees/{employee_id}", response_model=EmployeeReadWithService,
+         response_model_exclude_unset=True, tags=["Employees"])
+async def get_employee(
+    employee_id: int,
+    expand: Optional[str] = Query(default=None, description="Relations à inclure : service")
+):
     """Récupère un employé par son ID."""
-    employee = session.get(Employee, employee_id)
+    fields = parse_expand(expand, EMPLOYEE_EXPANSIONS)
+    
+    def load(session: Session):
+        employee = session.get(Employee, employee_id, options=employee_load_options(fields))
+        return employee_read(employee, fields) if employee else None
+    
+    employee = await database.run(load)
     if not employee:
         raise HTTPException(status_code=404, detail="Employé non trouvé")
     return employee
 
 
 @app.post("/employees", response_model=EmployeeRead, tags=["Employees"])
-def create_employee(
+async def create_employee(
     employee: EmployeeCreate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
 ):
     """Crée un nouvel employé."""
     # Validation du format du numéro d'employé
     validate_employee_number_format(employee.employeeNumber)
     
-    # Vérifier l'unicité du numéro d'employé
-    existing_employee = session.exec(
-        select(Employee).where(Employee.employeeNumber == employee.employeeNumber)
-    ).first()
-    if existing_employee:
-        raise HTTPException(
-            status_code=400,
-            detail="Un employé avec ce numéro existe déjà"
-        )
+    def write(session: Session):
+        # Vérifier l'unicité du numéro d'employé
+        existing_employee = session.exec(
+            select(Employee).where(Employee.employeeNumber == employee.employeeNumber)
+        ).first()
+        if existing_employee:
+            raise HTTPException(
+                status_code=400,
+                detail="Un employé avec ce numéro existe déjà"
+            )
+        
+        # Vérifier que le service existe
+        service = session.get(Service, employee.serviceID)
+        if not service:
+            raise HTTPException(
+                status_code=400,
+                detail="Le service spécifié n'existe pas"
+            )
+        
+        db_employee = Employee.model_validate(employee)
+        session.add(db_employee)
+        session.commit()
+        session.refresh(db_employee)
+        return EmployeeRead.model_validate(db_employee)
     
-    # Vérifier que le service existe
-    service = session.get(Service, employee.serviceID)
-    if not service:
-        raise HTTPException(
-            status_code=400,
-            detail="Le service spécifié n'existe pas"
-        )
-    
-    db_employee = Employee.model_validate(employee)
-    session.add(db_employee)
-    session.commit()
-    session.refresh(db_employee)
-    return db_employee
+    created = await database.run(write)
+    reference_cache.invalidate("employees")
+    return created
 
 
 @app.put("/employees/{employee_id}", response_model=EmployeeRead, tags=["Employees"])
-def update_employee(
+async def update_employee(
     employee_id: int, 
     employee: EmployeeUpdate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
 ):
-    """Met à jour un employé."""
-    db_employee = session.get(Employee, employee_id)
-    if not db_employee:
-        raise HTTPException(status_code=404, detail="Employé non trouvé")
+    """
+    Met à jour un employé.
+
+    Un changement de service déplace les agrégats de l'employé vers son
+    nouveau service, dans la même transaction.
+    """
+    def write(session: Session):
+        db_employee = session.get(Employee, employee_id, with_for_update=True)
+        if not db_employee:
+            raise HTTPException(status_code=404, detail="Employé non trouvé")
+        
+        previous_service_id = db_employee.serviceID
+        employee_data = employee.model_dump(exclude_unset=True)
+        for key, value in employee_data.items():
+            setattr(db_employee, key, value)
+        
+        session.add(db_employee)
+        if db_employee.serviceID != previous_service_id:
+            session.flush()
+            rebuild_employee_rollup(session, employee_id)
+        session.commit()
+        session.refresh(db_employee)
+        return EmployeeRead.model_validate(db_employee)
     
-    employee_data = employee.model_dump(exclude_unset=True)
-    for key, value in employee_data.items():
-        setattr(db_employee, key, value)
-    
-    session.add(db_employee)
-    session.commit()
-    session.refresh(db_employee)
-    return db_employee
+    updated = await database.run(write)
+    reference_cache.invalidate("employees")
+    return updated
 
 
 @app.delete("/employees/{employee_id}", tags=["Employees"])
-def delete_employee(
+async def delete_employee(
     employee_id: int, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator"]))
 ):
     """Supprime un employé."""
-    employee = session.get(Employee, employee_id)
-    if not employee:
-        raise HTTPException(status_code=404, detail="Employé non trouvé")
+    def write(session: Session):
+        employee = session.get(Employee, employee_id)
+        if not employee:
+            raise HTTPException(status_code=404, detail="Employé non trouvé")
+        
+        record_employee_deletion(session, employee_id)
+        session.delete(employee)
+        session.commit()
     
-    session.delete(employee)
-    session.commit()
+    await database.run(write)
+    reference_cache.invalidate("employees")
     return {"message": "Employé supprimé avec succès"}
 
 
@@ -316,156 +540,432 @@ def delete_employee(
 # ============================================================================
 
 @app.get("/accounts", response_model=List[AccountRead], tags=["Accounts"])
-def get_accounts(
-    session: Session = Depends(get_session),
+async def get_accounts(
     current_user: Account = Depends(require_profile(["Administrator"]))
 ):
     """Récupère tous les comptes."""
-    accounts = session.exec(select(Account)).all()
-    return accounts
+    def load(session: Session):
+        accounts = session.exec(select(Account)).all()
+        return [AccountRead.model_validate(account) for account in accounts]
+    
+    return await database.run(load)
 
 
 @app.get("/accounts/{account_id}", response_model=AccountRead, tags=["Accounts"])
-def get_account(
+async def get_account(
     account_id: int, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator"]))
 ):
     """Récupère un compte par son ID."""
-    account = session.get(Account, account_id)
+    account = await database.run(lambda session: session.get(Account, account_id))
     if not account:
         raise HTTPException(status_code=404, detail="Compte non trouvé")
     return account
 
 
 @app.post("/accounts", response_model=AccountRead, tags=["Accounts"])
-def create_account(
+async def create_account(
     account: AccountCreate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator"]))
 ):
     """Crée un nouveau compte."""
-    # Vérifier que l'employé existe
-    employee = session.get(Employee, account.employeeID)
-    if not employee:
-        raise HTTPException(
-            status_code=400,
-            detail="L'employé spécifié n'existe pas"
-        )
+    # Hacher le mot de passe (pool de hachage, hors de la session)
+    account_data = account.model_dump()
+    account_data["password"] = await password_hasher.hash(account.password)
     
-    # Vérifier l'unicité du nom d'utilisateur
-    existing_account = session.exec(
-        select(Account).where(Account.username == account.username)
-    ).first()
-    if existing_account:
-        raise HTTPException(
-            status_code=400,
-            detail="Un compte avec ce nom d'utilisateur existe déjà"
-        )
+    def write(session: Session):
+        # Vérifier que l'employé existe
+        employee = session.get(Employee, account.employeeID)
+        if not employee:
+            raise HTTPException(
+                status_code=400,
+                detail="L'employé spécifié n'existe pas"
+            )
+        
+        # Vérifier l'unicité du nom d'utilisateur
+        existing_account = session.exec(
+            select(Account).where(Account.username == account.username)
+        ).first()
+        if existing_account:
+            raise HTTPException(
+                status_code=400,
+                detail="Un compte avec ce nom d'utilisateur existe déjà"
+            )
+        
+        db_account = Account.model_validate(account_data)
+        session.add(db_account)
+        session.commit()
+        session.refresh(db_account)
+        return AccountRead.model_validate(db_account)
     
-    # Hacher le mot de passe
-    account_data = account.model_dump()
-    account_data["password"] = get_password_hash(account.password)
+    return await database.run(write)
+
+
+@app.put("/accounts/{account_id}", response_model=AccountRead, tags=["Accounts"])
+async def update_account(
+    account_id: int, 
+    account: AccountUpdate, 
+    current_user: Account = Depends(require_profile(["Administrator"]))
+):
+    """Met à jour un compte."""
+    # Hacher le nouveau mot de passe (pool de hachage, hors de la session)
+    account_data = account.model_dump(exclude_unset=True)
+    if "password" in account_data:
+        password = account_data.pop("password")
+        if password:
+            account_data["password"] = await password_hasher.hash(password)
+    
+    def write(session: Session):
+        db_account = session.get(Account, account_id)
+        if not db_account:
+            raise HTTPException(status_code=404, detail="Compte non trouvé")
+        
+        if "username" in account_data and account_data["username"] != db_account.username:
+            existing_account = session.exec(
+                select(Account).where(Account.username == account_data["username"])
+            ).first()
+            if existing_account:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Un compte avec ce nom d'utilisateur existe déjà"
+                )
+        
+        previous_username = db_account.username
+        for key, value in account_data.items():
+            setattr(db_account, key, value)
+        
+        session.add(db_account)
+        session.commit()
+        session.refresh(db_account)
+        return previous_username, AccountRead.model_validate(db_account)
+    
+    previous_username, updated = await database.run(write)
     
-    db_account = Account.model_validate(account_data)
-    session.add(db_account)
-    session.commit()
-    session.refresh(db_account)
-    return db_account
+    # Le profil ou l'état du compte a pu changer : invalider le compte en cache
+    principal_cache.invalidate(previous_username)
+    principal_cache.invalidate(updated.username)
+    return updated
 
 
 # ============================================================================
 # ENDPOINTS REQUESTS
 # ============================================================================
 
-@app.get("/requests", response_model=List[RequestRead], tags=["Requests"])
-def get_requests(session: Session = Depends(get_session)):
-    """Récupère toutes les demandes."""
-    requests = session.exec(select(Request)).all()
-    return requests
+@app.get("/requests", response_model=List[RequestReadWithRelations],
+         response_model_exclude_unset=True, tags=["Requests"])
+async def get_requests(
+    response: Response,
+    status_filter: Optional[List[RequestStatus]] = Query(default=None, alias="status"),
+    employeeID: Optional[int] = None,
+    serviceID: Optional[int] = None,
+    includeSubServices: bool = False,
+    dateFrom: Optional[date] = None,
+    dateTo: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expand: Optional[str] = Query(
+        default=None, description="Relations à inclure : employee, service, creator, workflows"
+    )
+):
+    """
+    Récupère les demandes filtrées, paginées par curseur.
+
+    Les demandes sont triées par date de demande puis par ID décroissants.
+    Le curseur de la page suivante est renvoyé dans l'en-tête X-Next-Cursor
+    (absent sur la dernière page). Avec includeSubServices, le filtre
+    serviceID couvre aussi tous les sous-services. Le paramètre expand
+    inclut les relations demandées (service implique employee), chargées
+    en au plus deux requêtes supplémentaires quelle que soit la page.
+    Avec FAST_JSON, la page est sérialisée par orjson sans revalidation.
+    """
+    if dateFrom and dateTo:
+        validate_date_range(dateFrom, dateTo)
+    fields = parse_expand(expand, REQUEST_EXPANSIONS)
+
+    statement = select(Request).options(*request_load_options(fields))
+    if status_filter:
+        statement = statement.where(Request.status.in_(status_filter))
+    if employeeID is not None:
+        statement = statement.where(Request.employeeID == employeeID)
+    if serviceID is not None:
+        statement = statement.join(Employee, Employee.employeeID == Request.employeeID).where(
+            service_filter(Employee.serviceID, serviceID, includeSubServices)
+        )
+    if dateFrom:
+        statement = statement.where(Request.requestDate >= dateFrom)
+    if dateTo:
+        statement = statement.where(Request.requestDate <= dateTo)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, 2)
+        try:
+            last_values = (date.fromisoformat(last_date), int(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+        statement = statement.where(
+            keyset_condition((Request.requestDate, Request.requestID), last_values)
+        )
 
+    statement = statement.order_by(
+        Request.requestDate.desc(), Request.requestID.desc()
+    ).limit(limit + 1)
+
+    def load(session: Session):
+        requests = session.exec(statement).all()
+        next_cursor = None
+        if len(requests) > limit:
+            requests = requests[:limit]
+            last = requests[-1]
+            next_cursor = encode_cursor((last.requestDate, last.requestID))
+        build = request_payload if FAST_JSON else request_read
+        return [build(request, fields) for request in requests], next_cursor
+
+    items, next_cursor = await database.run(load)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    if FAST_JSON:
+        return fast_response(items, headers)
+    if headers:
+        response.headers.update(headers)
+    return items
+
+
+@app.get("/requests/changes", response_model=RequestChanges, tags=["Requests"])
+async def get_request_changes(
+    since: Optional[str] = Query(default=None, description="Curseur de la synchronisation précédente"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    Récupère les demandes modifiées et supprimées depuis un curseur.
+
+    Sans curseur, renvoie toutes les demandes. Tant que hasMore est vrai,
+    rappeler avec le curseur renvoyé. Lu sur la base principale.
+    """
+    read_from_primary()
+    return await database.run(load_changes, "requests", since, limit)
+
+
+@app.get("/requests/export", tags=["Requests"])
+async def export_requests(
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[List[RequestStatus]] = Query(default=None, alias="status"),
+    serviceID: Optional[int] = None,
+    includeSubServices: bool = False,
+    dateFrom: Optional[date] = None,
+    dateTo: Optional[date] = None,
+    current_user: Account = Depends(get_current_active_user)
+):
+    """
+    Exporte en flux les demandes avec leur employé et leur service (CSV ou NDJSON).
 
-@app.get("/requests/{request_id}", response_model=RequestRead, tags=["Requests"])
-def get_request(request_id: int, session: Session = Depends(get_session)):
+    Avec includeSubServices, le filtre serviceID couvre aussi tous les sous-services.
+    """
+    if dateFrom and dateTo:
+        validate_date_range(dateFrom, dateTo)
+    
+    content = iter_requests_export(
+        database, format, status_filter, serviceID, dateFrom, dateTo, includeSubServices
+    )
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="requests.{format}"'}
+    )
+
+
+@app.get("/requests/{request_id}", response_model=RequestReadWithRelations,
+         response_model_exclude_unset=True, tags=["Requests"])
+async def get_request(
+    request_id: int,
+    expand: Optional[str] = Query(
+        default=None, description="Relations à inclure : employee, service, creator, workflows"
+    )
+):
     """Récupère une demande par son ID."""
-    request = session.get(Request, request_id)
+    fields = parse_expand(expand, REQUEST_EXPANSIONS)
+    
+    def load(session: Session):
+        request = session.get(Request, request_id, options=request_load_options(fields))
+        return request_read(request, fields) if request else None
+    
+    request = await database.run(load)
     if not request:
         raise HTTPException(status_code=404, detail="Demande non trouvée")
     return request
 
 
 @app.post("/requests", response_model=RequestRead, tags=["Requests"])
-def create_request(
+async def create_request(
     request: RequestCreate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(get_current_active_user)
 ):
     """Crée une nouvelle demande."""
     # Validations
-    validate_request_date(request.requestDate)
-    validate_working_hours(request.startAt, request.endAt)
+    validate_request_create(request)
     
-    if request.previousStart and request.previousEnd:
-        validate_time_range(request.previousStart, request.previousEnd)
+    def write(session: Session):
+        # Vérifier que l'employé existe (verrou : sérialise les saisies d'un même employé)
+        employee = session.get(Employee, request.employeeID, with_for_update=True)
+        if not employee:
+            raise HTTPException(
+                status_code=400,
+                detail="L'employé spécifié n'existe pas"
+            )
+        
+        # Chevauchements et plafonds d'heures de l'employé
+        check_request_limits(
+            session, request.employeeID, request.requestDate, request.startAt, request.endAt
+        )
+        
+        # Définir le créateur de la demande
+        request_data = request.model_dump()
+        request_data["createdBy"] = current_user.employeeID
+        
+        db_request = Request.model_validate(request_data)
+        session.add(db_request)
+        session.flush()
+        
+        # Enregistrer la durée et mettre à jour les agrégats mensuels dans la même transaction
+        record_request_hours(session, [db_request])
+        rollup_delta = RollupDelta()
+        rollup_delta.add(request_contribution(db_request, employee.serviceID))
+        rollup_delta.apply(session)
+        
+        session.commit()
+        session.refresh(db_request)
+        return RequestRead.model_validate(db_request)
     
-    # Vérifier que l'employé existe
-    employee = session.get(Employee, request.employeeID)
-    if not employee:
+    return await database.run(write)
+
+
+@app.post("/requests/bulk", response_model=RequestBulkResult, tags=["Requests"])
+async def create_requests_bulk(
+    requests: List[RequestCreate], 
+    current_user: Account = Depends(get_current_active_user)
+):
+    """
+    Crée un lot de demandes (saisie d'équipe).
+    
+    Les demandes invalides sont signalées individuellement ; les autres sont
+    insérées en une seule instruction, dans une seule transaction.
+    """
+    if len(requests) > MAX_BULK_REQUESTS:
         raise HTTPException(
             status_code=400,
-            detail="L'employé spécifié n'existe pas"
+            detail=f"Un lot ne peut pas contenir plus de {MAX_BULK_REQUESTS} demandes"
         )
     
-    # Définir le créateur de la demande
-    request_data = request.model_dump()
-    request_data["createdBy"] = current_user.employeeID
+    # Validations
+    errors = collect_validation_errors(requests, validate_request_create)
+    
+    def write(session: Session):
+        # Vérifier en une requête que les employés existent (verrouillés jusqu'au commit)
+        employee_ids = {request.employeeID for request in requests}
+        employee_services = dict(session.exec(
+            select(Employee.employeeID, Employee.serviceID)
+            .where(Employee.employeeID.in_(employee_ids))
+            .with_for_update()
+        ).all()) if employee_ids else {}
+        for index, request in enumerate(requests):
+            if index not in errors and request.employeeID not in employee_services:
+                errors[index] = "L'employé spécifié n'existe pas"
+        
+        # Chevauchements et plafonds d'heures, demandes du lot comprises
+        errors.update(collect_limit_errors(
+            session, requests, [index for index in range(len(requests)) if index not in errors]
+        ))
+        
+        # Construire les demandes valides
+        valid_indexes = [index for index in range(len(requests)) if index not in errors]
+        db_requests = []
+        for index in valid_indexes:
+            request_data = requests[index].model_dump()
+            request_data["createdBy"] = current_user.employeeID
+            db_requests.append(Request.model_validate(request_data))
+        
+        # Insertion multi-lignes, durées et agrégats dans la même transaction
+        request_ids = insert_many(
+            session, Request,
+            [db_request.model_dump(exclude={"requestID"}) for db_request in db_requests]
+        )
+        for db_request, request_id in zip(db_requests, request_ids):
+            db_request.requestID = request_id
+        record_request_hours(session, db_requests)
+        rollup_delta = RollupDelta()
+        for db_request in db_requests:
+            rollup_delta.add(request_contribution(db_request, employee_services[db_request.employeeID]))
+        rollup_delta.apply(session)
+        session.commit()
+        return dict(zip(valid_indexes, request_ids))
     
-    db_request = Request.model_validate(request)
-    session.add(db_request)
-    session.commit()
-    session.refresh(db_request)
-    return db_request
+    created_ids = await database.run(write)
+    results = [
+        RequestBulkItemResult(index=index, requestID=created_ids.get(index), error=errors.get(index))
+        for index in range(len(requests))
+    ]
+    return RequestBulkResult(created=len(created_ids), failed=len(errors), results=results)
 
 
 @app.put("/requests/{request_id}", response_model=RequestRead, tags=["Requests"])
-def update_request(
+async def update_request(
     request_id: int, 
     request: RequestUpdate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(get_current_active_user)
 ):
     """Met à jour une demande."""
-    db_request = session.get(Request, request_id)
-    if not db_request:
-        raise HTTPException(status_code=404, detail="Demande non trouvée")
-    
-    # Vérifier les permissions
-    if (db_request.employeeID != current_user.employeeID and 
-        current_user.profile not in ["Administrator", "Supervisor"]):
-        raise HTTPException(
-            status_code=403,
-            detail="Vous n'avez pas l'autorisation de modifier cette demande"
-        )
-    
-    # Validations si les champs sont modifiés
-    if request.requestDate:
-        validate_request_date(request.requestDate)
-    
-    if request.startAt and request.endAt:
-        validate_working_hours(request.startAt, request.endAt)
-    elif request.startAt and db_request.endAt:
-        validate_working_hours(request.startAt, db_request.endAt)
-    elif request.endAt and db_request.startAt:
-        validate_working_hours(db_request.startAt, request.endAt)
+    def write(session: Session):
+        db_request = session.get(Request, request_id, with_for_update=True)
+        if not db_request:
+            raise HTTPException(status_code=404, detail="Demande non trouvée")
+        
+        # Vérifier les permissions
+        if (db_request.employeeID != current_user.employeeID and 
+            current_user.profile not in ["Administrator", "Supervisor"]):
+            raise HTTPException(
+                status_code=403,
+                detail="Vous n'avez pas l'autorisation de modifier cette demande"
+            )
+        
+        # Validations si les champs sont modifiés
+        if request.requestDate:
+            validate_request_date(request.requestDate)
+        
+        if request.startAt and request.endAt:
+            validate_working_hours(request.startAt, request.endAt)
+        elif request.startAt and db_request.endAt:
+            validate_working_hours(request.startAt, db_request.endAt)
+        elif request.endAt and db_request.startAt:
+            validate_working_hours(db_request.startAt, request.endAt)
+        
+        rollup_delta = RollupDelta()
+        rollup_delta.remove(snapshot_request(session, db_request))
+        was_rejected = db_request.status == RequestStatus.REJECTED
+        
+        request_data = request.model_dump(exclude_unset=True)
+        for key, value in request_data.items():
+            setattr(db_request, key, value)
+        
+        # Contrôler la nouvelle plage horaire ou la demande réactivée
+        # (verrou sur l'employé comme à la création)
+        schedule_changed = request_data.keys() & {"requestDate", "startAt", "endAt"}
+        if (schedule_changed or was_rejected) and db_request.status != RequestStatus.REJECTED:
+            session.get(Employee, db_request.employeeID, with_for_update=True)
+            check_request_limits(
+                session, db_request.employeeID, db_request.requestDate,
+                db_request.startAt, db_request.endAt, exclude_request_id=db_request.requestID
+            )
+        
+        if request_data.keys() & {"startAt", "endAt"}:
+            update_request_hours(session, db_request)
+        
+        # Reporter le changement de statut, de date ou d'horaires sur les agrégats
+        rollup_delta.add(snapshot_request(session, db_request))
+        rollup_delta.apply(session)
+        
+        session.add(db_request)
+        session.commit()
+        session.refresh(db_request)
+        return RequestRead.model_validate(db_request)
     
-    request_data = request.model_dump(exclude_unset=True)
-    for key, value in request_data.items():
-        setattr(db_request, key, value)
-    
-    session.add(db_request)
-    session.commit()
-    session.refresh(db_request)
-    return db_request
+    return await database.run(write)
 
 
 # ============================================================================
@@ -473,90 +973,295 @@ def update_request(
 # ============================================================================
 
 @app.get("/delegations", response_model=List[DelegationRead], tags=["Delegations"])
-def get_delegations(
-    session: Session = Depends(get_session),
+async def get_delegations(
     current_user: Account = Depends(get_current_active_user)
 ):
     """Récupère toutes les délégations."""
-    delegations = session.exec(select(Delegation)).all()
-    return delegations
+    def load(session: Session):
+        delegations = session.exec(select(Delegation)).all()
+        if FAST_JSON:
+            return [trusted_dump(delegation, DelegationRead) for delegation in delegations]
+        return [DelegationRead.model_validate(delegation) for delegation in delegations]
+    
+    items = await database.run(load)
+    if FAST_JSON:
+        return fast_response(items)
+    return items
 
 
 @app.post("/delegations", response_model=DelegationRead, tags=["Delegations"])
-def create_delegation(
+async def create_delegation(
     delegation: DelegationCreate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
 ):
     """Crée une nouvelle délégation."""
     # Validations
     validate_date_range(delegation.startAt, delegation.endAt)
     
-    # Vérifier que les employés existent
-    delegator = session.get(Employee, delegation.delegatedBy)
-    delegate = session.get(Employee, delegation.delegatedTo)
+    def write(session: Session):
+        # Vérifier que les employés existent
+        delegator = session.get(Employee, delegation.delegatedBy)
+        delegate = session.get(Employee, delegation.delegatedTo)
+        
+        if not delegator or not delegate:
+            raise HTTPException(
+                status_code=400,
+                detail="Un ou plusieurs employés spécifiés n'existent pas"
+            )
+        
+        if delegation.delegatedBy == delegation.delegatedTo:
+            raise HTTPException(
+                status_code=400,
+                detail="Un employé ne peut pas se déléguer à lui-même"
+            )
+        
+        # Un délégant n'a qu'une délégation active à une date donnée
+        overlapping = session.exec(
+            select(Delegation.delegationID).where(
+                Delegation.delegatedBy == delegation.delegatedBy,
+                Delegation.startAt <= delegation.endAt,
+                Delegation.endAt >= delegation.startAt
+            )
+        ).first()
+        if overlapping is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="Cet employé a déjà une délégation sur cette période"
+            )
+        
+        db_delegation = Delegation.model_validate(delegation)
+        session.add(db_delegation)
+        session.commit()
+        session.refresh(db_delegation)
+        delegation_resolver.add(db_delegation)
+        return DelegationRead.model_validate(db_delegation)
     
-    if not delegator or not delegate:
-        raise HTTPException(
-            status_code=400,
-            detail="Un ou plusieurs employés spécifiés n'existent pas"
-        )
-    
-    if delegation.delegatedBy == delegation.delegatedTo:
-        raise HTTPException(
-            status_code=400,
-            detail="Un employé ne peut pas se déléguer à lui-même"
-        )
-    
-    db_delegation = Delegation.model_validate(delegation)
-    session.add(db_delegation)
-    session.commit()
-    session.refresh(db_delegation)
-    return db_delegation
+    return await database.run(write)
+
+
+@app.get("/delegations/resolve", response_model=DelegationResolution, tags=["Delegations"])
+async def resolve_delegation(
+    employeeID: int,
+    onDate: Optional[date] = Query(default=None, alias="date"),
+    current_user: Account = Depends(get_current_active_user)
+):
+    """Résout le validateur effectif d'un employé à une date (aujourd'hui par défaut)."""
+    onDate = onDate or date.today()
+    await database.run(delegation_resolver.refresh_if_stale)
+    effective_id, chain, cycle = delegation_resolver.resolve(employeeID, onDate)
+    return DelegationResolution(
+        employeeID=employeeID,
+        date=onDate,
+        effectiveEmployeeID=effective_id,
+        chain=chain,
+        cycle=cycle
+    )
 
 
 # ============================================================================
 # ENDPOINTS WORKFLOWS
 # ============================================================================
 
-@app.get("/workflows", response_model=List[WorkflowRead], tags=["Workflows"])
-def get_workflows(
-    session: Session = Depends(get_session),
+@app.get("/workflows", response_model=List[WorkflowReadWithRelations],
+         response_model_exclude_unset=True, tags=["Workflows"])
+async def get_workflows(
+    expand: Optional[str] = Query(
+        default=None, description="Relations à inclure : request, validator, delegate"
+    ),
     current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
 ):
     """Récupère tous les workflows."""
-    workflows = session.exec(select(Workflow)).all()
-    return workflows
+    fields = parse_expand(expand, WORKFLOW_EXPANSIONS)
+    
+    def load(session: Session):
+        workflows = session.exec(select(Workflow).options(*workflow_load_options(fields))).all()
+        build = workflow_payload if FAST_JSON else workflow_read
+        return [build(workflow, fields) for workflow in workflows]
+    
+    items = await database.run(load)
+    if FAST_JSON:
+        return fast_response(items)
+    return items
 
 
 @app.post("/workflows", response_model=WorkflowRead, tags=["Workflows"])
-def create_workflow(
+async def create_workflow(
     workflow: WorkflowCreate, 
-    session: Session = Depends(get_session),
     current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
 ):
     """Crée un nouveau workflow."""
-    # Vérifier que la demande existe
-    request = session.get(Request, workflow.requestID)
-    if not request:
-        raise HTTPException(
-            status_code=400,
-            detail="La demande spécifiée n'existe pas"
-        )
+    def write(session: Session):
+        # Vérifier que la demande existe
+        request = session.get(Request, workflow.requestID)
+        if not request:
+            raise HTTPException(
+                status_code=400,
+                detail="La demande spécifiée n'existe pas"
+            )
+        
+        # Vérifier que le validateur existe
+        validator = session.get(Employee, workflow.validator)
+        if not validator:
+            raise HTTPException(
+                status_code=400,
+                detail="Le validateur spécifié n'existe pas"
+            )
+        
+        # Router vers le délégué effectif du validateur à la date d'assignation
+        if workflow.delegate is None:
+            delegation_resolver.refresh_if_stale(session)
+            effective_id, _, _ = delegation_resolver.resolve(
+                workflow.validator, workflow.assignDate.date()
+            )
+            if effective_id != workflow.validator:
+                workflow.delegate = effective_id
+        
+        db_workflow = Workflow.model_validate(workflow)
+        session.add(db_workflow)
+        session.commit()
+        session.refresh(db_workflow)
+        return WorkflowRead.model_validate(db_workflow)
+    
+    return await database.run(write)
+
+
+@app.get("/workflows/inbox", response_model=List[WorkflowInboxItem], tags=["Workflows"])
+async def get_workflow_inbox(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Account = Depends(get_current_active_user)
+):
+    """
+    Récupère la file de validation de l'utilisateur connecté.
+
+    Comprend les étapes en attente dont il est validateur ou délégué, et
+    celles des employés qui lui délèguent actuellement leurs validations.
+    Triée par date d'assignation croissante ; le curseur de la page
+    suivante est renvoyé dans l'en-tête X-Next-Cursor.
+    """
+    after = None
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, 2)
+        try:
+            after = (datetime.fromisoformat(last_date), int(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
     
-    # Vérifier que le validateur existe
-    validator = session.get(Employee, workflow.validator)
-    if not validator:
+    def load(session: Session):
+        delegation_resolver.refresh_if_stale(session)
+        delegator_ids = delegation_resolver.delegators_of(current_user.employeeID, date.today())
+        return load_inbox(session, current_user.employeeID, delegator_ids, after, limit + 1)
+    
+    items = await database.run(load)
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor((last.assignDate, last.workflowID))
+    return items
+
+
+async def _decide_requests(decision: WorkflowDecision, approve: bool,
+                           current_user: Account) -> WorkflowDecisionResult:
+    """Applique une décision en lot après vérification de la taille du lot."""
+    if len(decision.requestIDs) > MAX_BULK_REQUESTS:
         raise HTTPException(
             status_code=400,
-            detail="Le validateur spécifié n'existe pas"
+            detail=f"Un lot ne peut pas contenir plus de {MAX_BULK_REQUESTS} demandes"
         )
-    
-    db_workflow = Workflow.model_validate(workflow)
-    session.add(db_workflow)
-    session.commit()
-    session.refresh(db_workflow)
-    return db_workflow
+    return await database.run(
+        decide_requests, decision.requestIDs, approve, current_user.employeeID
+    )
+
+
+@app.post("/workflows/approve", response_model=WorkflowDecisionResult, tags=["Workflows"])
+async def approve_requests(
+    decision: WorkflowDecision,
+    current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
+):
+    """
+    Approuve un lot de demandes : chaque demande passe au niveau de validation suivant.
+
+    Les demandes dont le statut ne permet pas l'approbation sont ignorées
+    et renvoyées avec le motif.
+    """
+    return await _decide_requests(decision, True, current_user)
+
+
+@app.post("/workflows/reject", response_model=WorkflowDecisionResult, tags=["Workflows"])
+async def reject_requests(
+    decision: WorkflowDecision,
+    current_user: Account = Depends(require_profile(["Administrator", "Supervisor"]))
+):
+    """Rejette un lot de demandes non encore acceptées ni rejetées."""
+    return await _decide_requests(decision, False, current_user)
+
+
+# ============================================================================
+# ENDPOINTS STATISTIQUES
+# ============================================================================
+
+@app.get("/stats", response_model=StatsRead, tags=["Stats"])
+async def get_stats(
+    dateFrom: Optional[date] = None,
+    dateTo: Optional[date] = None,
+    serviceID: Optional[int] = None,
+    includeSubServices: bool = False,
+    employeeLimit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Account = Depends(get_current_active_user)
+):
+    """Récupère les totaux de demandes et d'heures par statut, service et employé."""
+    if dateFrom and dateTo:
+        validate_date_range(dateFrom, dateTo)
+    return await database.run(
+        compute_stats, dateFrom, dateTo, serviceID, employeeLimit, includeSubServices
+    )
+
+
+# ============================================================================
+# ENDPOINTS ADMINISTRATION
+# ============================================================================
+
+@app.get("/admin/auth-stats", tags=["Administration"])
+async def get_auth_stats(current_user: Account = Depends(require_profile(["Administrator"]))):
+    """Récupère l'état du pool de hachage et les latences des connexions."""
+    return {
+        "hashing": password_hasher.stats(),
+        "login": login_latency.snapshot(),
+    }
+
+
+@app.get("/admin/db-stats", tags=["Administration"])
+async def get_db_stats(current_user: Account = Depends(require_profile(["Administrator"]))):
+    """Récupère l'état des pools de connexions à la base de données."""
+    return database.pool_status()
+
+
+@app.get("/admin/db-diagnostics", tags=["Administration"])
+async def get_db_diagnostics(
+    clear: bool = False,
+    current_user: Account = Depends(require_profile(["Administrator"]))
+):
+    """
+    Récupère les requêtes HTTP signalées par le diagnostic SQL (DB_DIAGNOSTICS=True) :
+    trop d'instructions (motif N+1) ou instructions lentes, avec le SQL normalisé.
+    """
+    if database.diagnostics is None:
+        raise HTTPException(status_code=404, detail="Le diagnostic des requêtes n'est pas activé")
+    snapshot = database.diagnostics.snapshot()
+    if clear:
+        database.diagnostics.clear()
+    return snapshot
+
+
+# ============================================================================
+# ENDPOINT DE MÉTRIQUES
+# ============================================================================
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def get_metrics():
+    """Expose les métriques au format Prometheus (latences par route, pools, SQL)."""
+    return metrics_response()
 
 
 # ============================================================================
@@ -564,7 +1269,7 @@ def create_workflow(
 # ============================================================================
 
 @app.get("/health", tags=["Health"])
-def health_check():
+async def health_check():
     """Vérification de l'état de l'API."""
     return {
         "status": "healthy", 
@@ -0,0 +1,112 @@
+"""Commandes de maintenance de la base de données GHS."""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+from sqlmodel import Session
+
+from database import Database
+from rollup import rebuild_rollup
+from hierarchy import rebuild_service_closure
+from hours import BACKFILL_BATCH_SIZE, backfill_request_hours
+from changes import TOMBSTONE_RETENTION_DAYS, purge_tombstones
+
+# Charger les variables d'environnement
+load_dotenv()
+
+
+def get_database() -> Database:
+    """Construit l'instance de base de données à partir de l'environnement."""
+    return Database(
+        db_user=os.getenv("DB_USER", "root"),
+        db_password=os.getenv("DB_PASSWORD", ""),
+        db_host=os.getenv("DB_HOST", "localhost"),
+        db_port=int(os.getenv("DB_PORT", "3306")),
+        db_name=os.getenv("DB_NAME", "ghs"),
+        database_url=os.getenv("DATABASE_URL") or None
+    )
+
+
+def rebuild_rollup_command(database: Database, args: argparse.Namespace) -> None:
+    """Reconstruit la table d'agrégats mensuels des heures supplémentaires."""
+    with Session(database.engine) as session:
+        count = rebuild_rollup(session)
+    print(f"✅ Agrégats reconstruits: {count} lignes")
+
+
+def rebuild_service_closure_command(database: Database, args: argparse.Namespace) -> None:
+    """Reconstruit la table de fermeture de la hiérarchie des services."""
+    with Session(database.engine) as session:
+        count = rebuild_service_closure(session)
+    print(f"✅ Hiérarchie des services reconstruite: {count} lignes")
+
+
+def backfill_request_hours_command(database: Database, args: argparse.Namespace) -> None:
+    """Enregistre la durée des demandes existantes (requestEmployee.totalHours)."""
+    with Session(database.engine) as session:
+        count = backfill_request_hours(session, args.batch_size)
+    print(f"✅ Durées des demandes rattrapées: {count} lignes")
+
+
+def purge_tombstones_command(database: Database, args: argparse.Namespace) -> None:
+    """Supprime les suppressions enregistrées au-delà de la durée de conservation."""
+    with Session(database.engine) as session:
+        count = purge_tombstones(session, args.days)
+    print(f"✅ Suppressions purgées: {count} lignes")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Maintenance de la base de données GHS")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollup_parser = subparsers.add_parser(
+        "rebuild-rollup", help="Reconstruit la table d'agrégats mensuels"
+    )
+    rollup_parser.set_defaults(handler=rebuild_rollup_command)
+
+    closure_parser = subparsers.add_parser(
+        "rebuild-service-closure", help="Reconstruit la table de fermeture des services"
+    )
+    closure_parser.set_defaults(handler=rebuild_service_closure_command)
+
+    hours_parser = subparsers.add_parser(
+        "backfill-request-hours", help="Enregistre la durée des demandes existantes"
+    )
+    hours_parser.add_argument(
+        "--batch-size", type=int, default=BACKFILL_BATCH_SIZE,
+        help="Plage d'identifiants de demandes traitée par transaction"
+    )
+    hours_parser.set_defaults(handler=backfill_request_hours_command)
+
+    tombstones_parser = subparsers.add_parser(
+        "purge-tombstones", help="Purge les suppressions enregistrées trop anciennes"
+    )
+    tombstones_parser.add_argument(
+        "--days", type=int, default=TOMBSTONE_RETENTION_DAYS,
+        help="Durée de conservation (jours) ; les curseurs plus anciens sont refusés (410)"
+    )
+    tombstones_parser.set_defaults(handler=purge_tombstones_command)
+
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    database = get_database()
+    if not database.start():
+        print("❌ Impossible de se connecter à la base de données")
+        return 1
+
+    try:
+        args.handler(database, args)
+        return 0
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Métriques Prometheus de l'API : requêtes HTTP, pools de connexions et requêtes SQL.
+
+Les métriques sont propres au processus : avec plusieurs workers, chaque
+worker expose les siennes (Prometheus les agrège par instance).
+"""
+
+import time
+from typing import Dict, Iterable
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Registre dédié (les métriques du processus Python ne sont pas exposées)
+registry = CollectorRegistry()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+http_request_duration = Histogram(
+    "ghs_http_request_duration_seconds",
+    "Durée des requêtes HTTP, par route, méthode et statut",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=registry,
+)
+http_requests_in_flight = Gauge(
+    "ghs_http_requests_in_flight",
+    "Requêtes HTTP en cours de traitement",
+    ["method"],
+    registry=registry,
+)
+db_statement_duration = Histogram(
+    "ghs_db_statement_duration_seconds",
+    "Durée d'exécution des instructions SQL, par type d'instruction",
+    ["engine", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=registry,
+)
+
+# Route utilisée pour les requêtes qui ne correspondent à aucune route déclarée
+UNMATCHED_ROUTE = "unmatched"
+
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI qui mesure la durée et le statut de chaque requête.
+
+    Le libellé de route est le gabarit de la route FastAPI (ex.
+    /requests/{request_id}), lu dans le scope après le routage : le nombre
+    de séries reste borné par le nombre de routes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        in_flight = http_requests_in_flight.labels(method)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            http_request_duration.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - start_time
+            )
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Mesure la durée de chaque instruction SQL exécutée par le moteur."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        operation = statement.lstrip()[:6].upper()
+        if operation not in SQL_OPERATIONS:
+            operation = "OTHER"
+        db_statement_duration.labels(name, operation).observe(time.perf_counter() - started)
+
+
+class PoolCollector:
+    """Collecteur lisant l'état des pools de connexions à chaque collecte."""
+
+    def __init__(self, database):
+        self.database = database
+
+    def collect(self) -> Iterable:
+        pools: Dict[str, dict] = self.database.pool_status()
+
+        gauges = {
+            "size": GaugeMetricFamily(
+                "ghs_db_pool_size", "Taille du pool de connexions", labels=["pool"]),
+            "checked_out": GaugeMetricFamily(
+                "ghs_db_pool_checked_out", "Connexions empruntées", labels=["pool"]),
+            "checked_in": GaugeMetricFamily(
+                "ghs_db_pool_checked_in", "Connexions disponibles dans le pool", labels=["pool"]),
+            "overflow": GaugeMetricFamily(
+                "ghs_db_pool_overflow", "Connexions en débordement", labels=["pool"]),
+        }
+        timeouts = CounterMetricFamily(
+            "ghs_db_pool_timeouts", "Attentes de connexion expirées", labels=["pool"])
+        wait = GaugeMetricFamily(
+            "ghs_db_pool_wait_seconds",
+            "Temps d'obtention d'une connexion (quantiles sur une fenêtre glissante)",
+            labels=["pool", "quantile"])
+
+        for pool, values in pools.items():
+            for key, gauge in gauges.items():
+                gauge.add_metric([pool], values[key])
+            timeouts.add_metric([pool], values["timeouts"])
+            for quantile in ("p50", "p95", "p99"):
+                wait.add_metric([pool, f"0.{quantile[1:]}"], values["wait"][f"{quantile}_ms"] / 1000)
+
+        yield from gauges.values()
+        yield timeouts
+        yield wait
+
+        if self.database.replicas is not None:
+            available = GaugeMetricFamily(
+                "ghs_db_replica_available", "Disponibilité des réplicas en lecture", labels=["replica"])
+            for index, is_available in enumerate(self.database.replicas.status()):
+                available.add_metric([f"replica{index}"], int(is_available))
+            yield available
+
+
+def register_database(database) -> None:
+    """Instrumente les moteurs d'une base de données et expose l'état de ses pools."""
+    for name, engine in database.sync_engines().items():
+        instrument_engine(engine, name)
+    registry.register(PoolCollector(database))
+
+
+def metrics_response() -> Response:
+    """Construit la réponse /metrics au format texte Prometheus."""
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -1,28 +1,79 @@
 """Middleware personnalisés pour l'application GHS."""
 
 import logging
+import os
+import random
 import time
-from typing import Callable
-from fastapi import Request, Response, HTTPException
+from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
+# Niveau et échantillonnage des logs de requêtes
+REQUEST_LOG_LEVEL = os.getenv("REQUEST_LOG_LEVEL", "INFO").upper()
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+
+
+def parse_log_level(level) -> int:
+    """
+    Convertit un niveau de log (nom ou valeur) en entier.
+
+    Un nom inconnu retombe sur INFO avec un avertissement, plutôt que de
+    faire échouer chaque requête.
+    """
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).strip().upper())
+    if not isinstance(value, int):
+        logger.warning("Niveau de log inconnu %r, INFO utilisé", level)
+        return logging.INFO
+    return value
+
+
+class ErrorHandlerMiddleware:
+    """
+    Middleware pour la gestion centralisée des erreurs.
+
+    Implémenté en ASGI pur : la réponse de l'application est transmise
+    telle quelle (sans tâche ni flux intermédiaire), ce qui préserve les
+    réponses en flux.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    """Middleware pour la gestion centralisée des erreurs."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except HTTPException:
             # Laisser FastAPI gérer les HTTPException
             raise
-        except SQLAlchemyError as e:
-            logger.error(f"Erreur de base de données: {e}")
+        except Exception as e:
+            # Une réponse déjà commencée ne peut plus être remplacée
+            if response_started:
+                raise
+            response = self._error_response(e)
+            await response(scope, receive, send)
+
+    @staticmethod
+    def _error_response(e: Exception) -> JSONResponse:
+        """Construit la réponse JSON correspondant à une exception."""
+        if isinstance(e, SQLAlchemyError):
+            logger.error("Erreur de base de données: %s", e)
             return JSONResponse(
                 status_code=500,
                 content={
@@ -30,8 +81,8 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                     "detail": "Une erreur est survenue lors de l'accès aux données"
                 }
             )
-        except ValueError as e:
-            logger.error(f"Erreur de validation: {e}")
+        if isinstance(e, ValueError):
+            logger.error("Erreur de validation: %s", e)
             return JSONResponse(
                 status_code=400,
                 content={
@@ -39,33 +90,51 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                     "detail": str(e)
                 }
             )
-        except Exception as e:
-            logger.error(f"Erreur inattendue: {e}")
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "error": "Erreur interne du serveur",
-                    "detail": "Une erreur inattendue s'est produite"
-                }
-            )
+        logger.error("Erreur inattendue: %s", e)
+        return JSONResponse(
+            status_code=500,
+            content={
+                "error": "Erreur interne du serveur",
+                "detail": "Une erreur inattendue s'est produite"
+            }
+        )
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware pour logger les requêtes."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        
-        # Logger la requête entrante
-        logger.info(f"Requête: {request.method} {request.url}")
-        
-        response = await call_next(request)
-        
-        # Logger la réponse
-        process_time = time.time() - start_time
-        logger.info(
-            f"Réponse: {response.status_code} - "
-            f"Temps: {process_time:.3f}s"
-        )
-        
-        return response
\ No newline at end of file
+class LoggingMiddleware:
+    """
+    Middleware pour logger les requêtes.
+
+    Une ligne par requête (méthode, chemin, statut, durée), formatée
+    uniquement si le niveau est actif et si la requête est retenue par
+    l'échantillonnage (REQUEST_LOG_SAMPLE_RATE entre 0 et 1).
+    """
+
+    def __init__(self, app: ASGIApp, level: str = REQUEST_LOG_LEVEL,
+                 sample_rate: float = REQUEST_LOG_SAMPLE_RATE):
+        self.app = app
+        self.level = parse_log_level(level)
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http"
+                or not logger.isEnabledFor(self.level)
+                or (self.sample_rate < 1.0 and random.random() >= self.sample_rate)):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            logger.log(
+                self.level, "Requête: %s %s - Réponse: %s - Temps: %.3fs",
+                scope["method"], scope["path"], status_code, time.perf_counter() - start_time
+            )
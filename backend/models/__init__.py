@@ -1,23 +1,45 @@
 """Modèles SQLModel pour l'application GHS."""
 
-from .service import Service, ServiceCreate, ServiceUpdate, ServiceRead
+from .service import Service, ServiceClosure, ServiceCreate, ServiceUpdate, ServiceRead
 from .employee import Employee, EmployeeCreate, EmployeeUpdate, EmployeeRead, ContractType
 from .account import Account, AccountCreate, AccountUpdate, AccountRead, AccountLogin, ProfileType
-from .request import Request, RequestCreate, RequestUpdate, RequestRead, RequestEmployee, RequestStatus
-from .delegation import Delegation, DelegationCreate, DelegationUpdate, DelegationRead
-from .workflow import Workflow, WorkflowCreate, WorkflowUpdate, WorkflowRead
+from .request import (
+    Request, RequestCreate, RequestUpdate, RequestRead, RequestEmployee, RequestStatus,
+    RequestBulkItemResult, RequestBulkResult
+)
+from .delegation import (
+    Delegation, DelegationCreate, DelegationUpdate, DelegationRead, DelegationResolution
+)
+from .workflow import (
+    Workflow, WorkflowCreate, WorkflowUpdate, WorkflowRead, WorkflowStatus, WorkflowInboxItem,
+    WorkflowDecision, WorkflowSkipped, WorkflowDecisionResult
+)
+from .expanded import EmployeeReadWithService, RequestReadWithRelations, WorkflowReadWithRelations
+from .rollup import OvertimeRollup
+from .changes import Tombstone, ServiceChanges, EmployeeChanges, RequestChanges
+from .stats import StatsRead, StatusStat, ServiceStat, EmployeeStat
 
 __all__ = [
     # Service
-    "Service", "ServiceCreate", "ServiceUpdate", "ServiceRead",
+    "Service", "ServiceClosure", "ServiceCreate", "ServiceUpdate", "ServiceRead",
     # Employee
     "Employee", "EmployeeCreate", "EmployeeUpdate", "EmployeeRead", "ContractType",
     # Account
     "Account", "AccountCreate", "AccountUpdate", "AccountRead", "AccountLogin", "ProfileType",
     # Request
     "Request", "RequestCreate", "RequestUpdate", "RequestRead", "RequestEmployee", "RequestStatus",
+    "RequestBulkItemResult", "RequestBulkResult",
     # Delegation
-    "Delegation", "DelegationCreate", "DelegationUpdate", "DelegationRead",
+    "Delegation", "DelegationCreate", "DelegationUpdate", "DelegationRead", "DelegationResolution",
     # Workflow
-    "Workflow", "WorkflowCreate", "WorkflowUpdate", "WorkflowRead",
+    "Workflow", "WorkflowCreate", "WorkflowUpdate", "WorkflowRead", "WorkflowStatus",
+    "WorkflowInboxItem", "WorkflowDecision", "WorkflowSkipped", "WorkflowDecisionResult",
+    # Expand
+    "EmployeeReadWithService", "RequestReadWithRelations", "WorkflowReadWithRelations",
+    # Rollup
+    "OvertimeRollup",
+    # Changes
+    "Tombstone", "ServiceChanges", "EmployeeChanges", "RequestChanges",
+    # Stats
+    "StatsRead", "StatusStat", "ServiceStat", "EmployeeStat",
 ]
\ No newline at end of file
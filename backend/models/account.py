@@ -3,6 +3,8 @@ from typing import Optional
 from enum import Enum
 from sqlmodel import SQLModel, Field, Relationship
 
+from .fields import foreign_key, updated_at
+
 
 class ProfileType(str, Enum):
     """Types de profils utilisateur."""
@@ -19,7 +21,7 @@ class Account(SQLModel, table=True):
     __tablename__ = "accounts"
 
     accountID: Optional[int] = Field(default=None, primary_key=True)
-    employeeID: int = Field(foreign_key="employees.employeeID", unique=True)
+    employeeID: int = foreign_key("employees.employeeID", unique=True)
     username: str = Field(max_length=50, unique=True, index=True)
     password: str = Field(max_length=255)
     profile: ProfileType = Field(default=ProfileType.VALIDATOR)
@@ -28,7 +30,7 @@ class Account(SQLModel, table=True):
     resetToken: Optional[str] = Field(default=None, max_length=100)
     resetTokenExpiry: Optional[datetime] = Field(default=None)
     createdAt: datetime = Field(default_factory=datetime.utcnow)
-    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = updated_at()
 
     # Relations
     employee: Optional["Employee"] = Relationship(back_populates="account")
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
+
+from .service import ServiceRead
+from .employee import EmployeeRead
+from .request import RequestRead
+
+
+class Tombstone(SQLModel, table=True):
+    """Modèle pour la table des suppressions (synchronisation incrémentale)."""
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_collection_deleted", "collection", "deletedAt", "tombstoneID"),
+    )
+
+    tombstoneID: Optional[int] = Field(default=None, primary_key=True)
+    collection: str = Field(max_length=20)  # services, employees ou requests
+    entityID: int = Field()
+    deletedAt: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ServiceChanges(SQLModel):
+    """Schéma pour lire les modifications des services depuis un curseur."""
+    changed: List[ServiceRead]
+    deleted: List[int]
+    cursor: str
+    hasMore: bool
+
+
+class EmployeeChanges(SQLModel):
+    """Schéma pour lire les modifications des employés depuis un curseur."""
+    changed: List[EmployeeRead]
+    deleted: List[int]
+    cursor: str
+    hasMore: bool
+
+
+class RequestChanges(SQLModel):
+    """Schéma pour lire les modifications des demandes depuis un curseur."""
+    changed: List[RequestRead]
+    deleted: List[int]
+    cursor: str
+    hasMore: bool
@@ -1,7 +1,9 @@
 from datetime import date
-from typing import Optional
+from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
 
+from .fields import foreign_key
+
 
 class Delegation(SQLModel, table=True):
     """Modèle pour la table des délégations."""
@@ -9,8 +11,8 @@ class Delegation(SQLModel, table=True):
     __tablename__ = "delegations"
     
     delegationID: Optional[int] = Field(default=None, primary_key=True)
-    delegatedBy: int = Field(foreign_key="employees.employeeID")
-    delegatedTo: int = Field(foreign_key="employees.employeeID")
+    delegatedBy: int = foreign_key("employees.employeeID")
+    delegatedTo: int = foreign_key("employees.employeeID")
     startAt: date = Field()
     endAt: date = Field()
     
@@ -41,6 +43,15 @@ class DelegationUpdate(SQLModel):
     endAt: Optional[date] = None
 
 
+class DelegationResolution(SQLModel):
+    """Schéma du validateur effectif d'un employé à une date."""
+    employeeID: int
+    date: date
+    effectiveEmployeeID: int
+    chain: List[int]
+    cycle: bool
+
+
 class DelegationRead(SQLModel):
     """Schéma pour lire une délégation."""
     delegationID: int
@@ -1,8 +1,11 @@
 from datetime import datetime, date
 from typing import Optional, List
 from enum import Enum
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
+from .fields import foreign_key, updated_at
+
 
 class ContractType(str, Enum):
     """Types de contrat disponibles."""
@@ -18,33 +21,43 @@ class Employee(SQLModel, table=True):
     """Modèle pour la table des employés."""
     
     __tablename__ = "employees"
+    __table_args__ = (
+        Index("ix_employees_service", "serviceID", "employeeID"),
+        Index("ix_employees_updated", "updatedAt", "employeeID"),
+    )
     
     employeeID: Optional[int] = Field(default=None, primary_key=True)
     employeeNumber: str = Field(max_length=20, unique=True, index=True)
     lastName: str = Field(max_length=20)
     firstName: str = Field(max_length=30)
-    serviceID: int = Field(foreign_key="services.serviceID")
+    serviceID: int = foreign_key("services.serviceID")
     contractType: ContractType = Field(default=ContractType.CDI)
     contact: Optional[str] = Field(default=None, max_length=20)
     birthdate: Optional[date] = Field(default=None)
     createdAt: datetime = Field(default_factory=datetime.utcnow)
-    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = updated_at()
     
-    # Relations
+    # Relations (suppressions en cascade laissées à la base, cf. ghs.sql)
     service: Optional["Service"] = Relationship(back_populates="employees")
-    account: Optional["Account"] = Relationship(back_populates="employee")
-    requests: List["Request"] = Relationship(back_populates="employee")
+    account: Optional["Account"] = Relationship(
+        back_populates="employee",
+        sa_relationship_kwargs={"passive_deletes": True}
+    )
+    requests: List["Request"] = Relationship(
+        back_populates="employee",
+        sa_relationship_kwargs={"foreign_keys": "Request.employeeID", "passive_deletes": True}
+    )
     created_requests: List["Request"] = Relationship(
         back_populates="creator",
-        sa_relationship_kwargs={"foreign_keys": "Request.createdBy"}
+        sa_relationship_kwargs={"foreign_keys": "Request.createdBy", "passive_deletes": True}
     )
     delegated_by: List["Delegation"] = Relationship(
         back_populates="delegator",
-        sa_relationship_kwargs={"foreign_keys": "Delegation.delegatedBy"}
+        sa_relationship_kwargs={"foreign_keys": "Delegation.delegatedBy", "passive_deletes": True}
     )
     delegated_to: List["Delegation"] = Relationship(
         back_populates="delegate",
-        sa_relationship_kwargs={"foreign_keys": "Delegation.delegatedTo"}
+        sa_relationship_kwargs={"foreign_keys": "Delegation.delegatedTo", "passive_deletes": True}
     )
 
 
@@ -0,0 +1,25 @@
+from typing import Optional, List
+
+from .service import ServiceRead
+from .employee import EmployeeRead
+from .request import RequestRead
+from .workflow import WorkflowRead
+
+
+class EmployeeReadWithService(EmployeeRead):
+    """Schéma pour lire un employé avec son service (paramètre expand)."""
+    service: Optional[ServiceRead] = None
+
+
+class RequestReadWithRelations(RequestRead):
+    """Schéma pour lire une demande avec ses relations (paramètre expand)."""
+    employee: Optional[EmployeeReadWithService] = None
+    creator: Optional[EmployeeRead] = None
+    workflows: Optional[List[WorkflowRead]] = None
+
+
+class WorkflowReadWithRelations(WorkflowRead):
+    """Schéma pour lire un workflow avec ses relations (paramètre expand)."""
+    request: Optional[RequestRead] = None
+    validator_employee: Optional[EmployeeRead] = None
+    delegate_employee: Optional[EmployeeRead] = None
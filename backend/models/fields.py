@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Column, ForeignKey, Integer
+from sqlmodel import Field
+
+
+def foreign_key(target: str, ondelete: str = "CASCADE", nullable: bool = False, **column_kwargs) -> Any:
+    """
+    Champ clé étrangère portant les règles ON DELETE / ON UPDATE de ghs.sql.
+
+    Les schémas créés à partir des métadonnées (SQLite) appliquent ainsi
+    les mêmes suppressions en cascade que la base MySQL.
+
+    Args:
+        target: Colonne référencée (table.colonne)
+        ondelete: Règle de suppression (CASCADE ou SET NULL)
+        nullable: Colonne facultative (valeur par défaut None)
+        column_kwargs: Options supplémentaires de la colonne (primary_key, unique...)
+    """
+    column = Column(
+        Integer,
+        ForeignKey(target, ondelete=ondelete, onupdate="CASCADE"),
+        nullable=nullable,
+        **column_kwargs
+    )
+    if nullable:
+        return Field(default=None, sa_column=column)
+    return Field(sa_column=column)
+
+
+def updated_at() -> Any:
+    """
+    Horodatage de dernière modification, comme ON UPDATE CURRENT_TIMESTAMP de ghs.sql.
+
+    La valeur est fixée par SQLAlchemy à chaque UPDATE (ORM ou instruction
+    update() sans valeur explicite), quelle que soit la base : les flux de
+    modifications (GET /{collection}/changes) s'appuient dessus.
+    """
+    return Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
@@ -1,8 +1,11 @@
 from datetime import datetime, date, time
 from typing import Optional, List
 from enum import Enum
+from sqlalchemy import CheckConstraint, Index, UniqueConstraint
 from sqlmodel import SQLModel, Field, Relationship
 
+from .fields import foreign_key, updated_at
+
 
 class RequestStatus(str, Enum):
     """Statuts des demandes."""
@@ -19,9 +22,21 @@ class Request(SQLModel, table=True):
     """Modèle pour la table des demandes."""
     
     __tablename__ = "requests"
+    __table_args__ = (
+        # Index composites pour la pagination keyset et les filtres de liste
+        Index("ix_requests_date", "requestDate", "requestID"),
+        Index("ix_requests_status_date", "status", "requestDate", "requestID"),
+        Index("ix_requests_employee_date", "employeeID", "requestDate", "requestID"),
+        Index("ix_requests_employee_status_date", "employeeID", "status", "requestDate", "requestID"),
+        # Flux des modifications (GET /requests/changes)
+        Index("ix_requests_updated", "updatedAt", "requestID"),
+        # Contraintes de ghs.sql
+        CheckConstraint("endAt > startAt", name="check_hours"),
+        CheckConstraint("previousEnd > previousStart", name="check_previous_hours"),
+    )
     
     requestID: Optional[int] = Field(default=None, primary_key=True)
-    employeeID: int = Field(foreign_key="employees.employeeID")
+    employeeID: int = foreign_key("employees.employeeID")
     requestDate: date = Field()
     previousStart: Optional[time] = Field(default=None)
     previousEnd: Optional[time] = Field(default=None)
@@ -29,20 +44,29 @@ class Request(SQLModel, table=True):
     endAt: time = Field()
     status: RequestStatus = Field(default=RequestStatus.PENDING)
     comment: Optional[str] = Field(default=None)
-    createdBy: Optional[int] = Field(default=None, foreign_key="employees.employeeID")
+    createdBy: Optional[int] = foreign_key("employees.employeeID", ondelete="SET NULL", nullable=True)
     validatedN1At: Optional[datetime] = Field(default=None)
     validatedN2At: Optional[datetime] = Field(default=None)
     createdAt: datetime = Field(default_factory=datetime.utcnow)
-    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = updated_at()
     
-    # Relations
-    employee: Optional["Employee"] = Relationship(back_populates="requests")
+    # Relations (suppressions en cascade laissées à la base, cf. ghs.sql)
+    employee: Optional["Employee"] = Relationship(
+        back_populates="requests",
+        sa_relationship_kwargs={"foreign_keys": "Request.employeeID"}
+    )
     creator: Optional["Employee"] = Relationship(
         back_populates="created_requests",
         sa_relationship_kwargs={"foreign_keys": "Request.createdBy"}
     )
-    workflows: List["Workflow"] = Relationship(back_populates="request")
-    request_employees: List["RequestEmployee"] = Relationship(back_populates="request")
+    workflows: List["Workflow"] = Relationship(
+        back_populates="request",
+        sa_relationship_kwargs={"passive_deletes": True}
+    )
+    request_employees: List["RequestEmployee"] = Relationship(
+        back_populates="request",
+        sa_relationship_kwargs={"passive_deletes": True}
+    )
 
 
 class RequestCreate(SQLModel):
@@ -88,15 +112,33 @@ class RequestRead(SQLModel):
     updatedAt: datetime
 
 
+class RequestBulkItemResult(SQLModel):
+    """Résultat de la création d'une demande au sein d'un lot."""
+    index: int
+    requestID: Optional[int] = None
+    error: Optional[str] = None
+
+
+class RequestBulkResult(SQLModel):
+    """Schéma pour lire le résultat d'une création de demandes en lot."""
+    created: int
+    failed: int
+    results: List[RequestBulkItemResult]
+
+
 class RequestEmployee(SQLModel, table=True):
     """Modèle pour la table de liaison RequestEmployee."""
     
     __tablename__ = "requestEmployee"
+    __table_args__ = (
+        # Jointure avec les demandes pour les agrégations (durée enregistrée)
+        UniqueConstraint("requestID", "employeeID", name="uq_request_employee"),
+    )
     
     ID: Optional[int] = Field(default=None, primary_key=True)
-    employeeID: int = Field(foreign_key="employees.employeeID")
-    requestID: int = Field(foreign_key="requests.requestID")
-    totalHours: float = Field()
+    employeeID: int = foreign_key("employees.employeeID")
+    requestID: int = foreign_key("requests.requestID")
+    totalHours: float = Field()  # Durée de la demande, calculée à l'écriture
     
     # Relations
     employee: Optional["Employee"] = Relationship()
@@ -0,0 +1,24 @@
+from typing import Optional
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+from .fields import foreign_key
+from .request import RequestStatus
+
+
+class OvertimeRollup(SQLModel, table=True):
+    """Modèle pour la table d'agrégats mensuels d'heures supplémentaires."""
+    
+    __tablename__ = "overtimeRollup"
+    __table_args__ = (
+        UniqueConstraint("employeeID", "serviceID", "period", "status", name="uq_overtime_rollup_key"),
+        Index("ix_overtime_rollup_period_service", "period", "serviceID"),
+    )
+    
+    rollupID: Optional[int] = Field(default=None, primary_key=True)
+    employeeID: int = foreign_key("employees.employeeID")
+    serviceID: int = foreign_key("services.serviceID")
+    period: int = Field()  # Mois au format AAAAMM
+    status: RequestStatus = Field()
+    totalHours: float = Field(default=0)
+    requestCount: int = Field(default=0)
@@ -1,12 +1,18 @@
 from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
+from .fields import foreign_key, updated_at
+
 
 class Service(SQLModel, table=True):
     """Modèle pour la table des services."""
     
     __tablename__ = "services"
+    __table_args__ = (
+        Index("ix_services_updated", "updatedAt", "serviceID"),
+    )
     
     serviceID: Optional[int] = Field(default=None, primary_key=True)
     serviceCode: str = Field(max_length=10, unique=True, index=True)
@@ -15,10 +21,13 @@ class Service(SQLModel, table=True):
     description: Optional[str] = Field(default=None)
     manager: Optional[str] = Field(default=None, max_length=100)
     createdAt: datetime = Field(default_factory=datetime.utcnow)
-    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = updated_at()
     
-    # Relations
-    employees: List["Employee"] = Relationship(back_populates="service")
+    # Relations (suppressions en cascade laissées à la base, cf. ghs.sql)
+    employees: List["Employee"] = Relationship(
+        back_populates="service",
+        sa_relationship_kwargs={"passive_deletes": True}
+    )
     parent_service: Optional["Service"] = Relationship(
         back_populates="child_services",
         sa_relationship_kwargs={"remote_side": "Service.serviceID"}
@@ -26,6 +35,19 @@ class Service(SQLModel, table=True):
     child_services: List["Service"] = Relationship(back_populates="parent_service")
 
 
+class ServiceClosure(SQLModel, table=True):
+    """Modèle pour la table de fermeture de la hiérarchie des services."""
+    
+    __tablename__ = "serviceClosure"
+    __table_args__ = (
+        Index("ix_service_closure_descendant", "descendantID", "depth"),
+    )
+    
+    ancestorID: int = foreign_key("services.serviceID", primary_key=True)
+    descendantID: int = foreign_key("services.serviceID", primary_key=True)
+    depth: int = Field(default=0)  # 0 pour le service lui-même
+
+
 class ServiceCreate(SQLModel):
     """Schéma pour créer un service."""
     serviceCode: str = Field(max_length=10)
@@ -0,0 +1,40 @@
+from datetime import date
+from typing import Optional, List
+from sqlmodel import SQLModel
+
+from .request import RequestStatus
+
+
+class StatusStat(SQLModel):
+    """Nombre de demandes et heures cumulées pour un statut."""
+    status: RequestStatus
+    requestCount: int
+    totalHours: float
+
+
+class ServiceStat(SQLModel):
+    """Heures cumulées pour un service."""
+    serviceID: int
+    serviceName: str
+    requestCount: int
+    totalHours: float
+
+
+class EmployeeStat(SQLModel):
+    """Heures cumulées pour un employé."""
+    employeeID: int
+    serviceID: int
+    requestCount: int
+    totalHours: float
+
+
+class StatsRead(SQLModel):
+    """Schéma pour lire les statistiques agrégées des demandes."""
+    dateFrom: Optional[date]
+    dateTo: Optional[date]
+    serviceID: Optional[int]
+    totalRequests: int
+    totalHours: float
+    byStatus: List[StatusStat]
+    byService: List[ServiceStat]
+    byEmployee: List[EmployeeStat]
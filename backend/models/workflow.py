@@ -1,17 +1,34 @@
 from datetime import datetime
-from typing import Optional
+from enum import IntEnum
+from typing import Optional, List
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
+from .fields import foreign_key
+from .request import RequestRead
+
+
+class WorkflowStatus(IntEnum):
+    """Statuts des étapes de workflow."""
+    PENDING = 0
+    APPROVED = 1
+    REJECTED = 2
+
 
 class Workflow(SQLModel, table=True):
     """Modèle pour la table des workflows."""
     
     __tablename__ = "workflows"
+    __table_args__ = (
+        # Index couvrant les files de validation (validateur ou délégué)
+        Index("ix_workflows_validator_status_date", "validator", "status", "assignDate"),
+        Index("ix_workflows_delegate_status_date", "delegate", "status", "assignDate"),
+    )
     
     workflowID: Optional[int] = Field(default=None, primary_key=True)
-    requestID: int = Field(foreign_key="requests.requestID")
-    validator: int = Field(foreign_key="employees.employeeID")
-    delegate: Optional[int] = Field(default=None, foreign_key="employees.employeeID")
+    requestID: int = foreign_key("requests.requestID")
+    validator: int = foreign_key("employees.employeeID")
+    delegate: Optional[int] = foreign_key("employees.employeeID", ondelete="SET NULL", nullable=True)
     assignDate: datetime = Field()
     validationDate: Optional[datetime] = Field(default=None)
     status: int = Field()
@@ -52,4 +69,26 @@ class WorkflowRead(SQLModel):
     delegate: Optional[int]
     assignDate: datetime
     validationDate: Optional[datetime]
-    status: int
\ No newline at end of file
+    status: int
+
+
+class WorkflowInboxItem(WorkflowRead):
+    """Étape de workflow en attente, avec la demande à valider."""
+    request: RequestRead
+
+
+class WorkflowDecision(SQLModel):
+    """Schéma pour approuver ou rejeter des demandes en lot."""
+    requestIDs: List[int]
+
+
+class WorkflowSkipped(SQLModel):
+    """Demande ignorée lors d'une décision en lot, avec le motif."""
+    requestID: int
+    reason: str
+
+
+class WorkflowDecisionResult(SQLModel):
+    """Schéma pour lire le résultat d'une décision en lot."""
+    processed: List[int]
+    skipped: List[WorkflowSkipped]
@@ -0,0 +1,181 @@
+"""
+Contrôle des chevauchements et des plafonds d'heures supplémentaires par employé.
+
+Une demande créée ou modifiée est confrontée aux autres demandes non
+rejetées du même employé : pas de chevauchement le même jour, et totaux
+journalier, hebdomadaire (semaine ISO) et mensuel sous les plafonds
+configurés. Les demandes existantes sont lues par une requête d'intervalle
+sur l'index (employeeID, requestDate) limitée à la semaine et au mois
+concernés : le coût ne dépend pas de l'historique de l'employé.
+"""
+
+import os
+from collections import defaultdict
+from datetime import date, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlmodel import Session, select
+
+from models import Request, RequestStatus
+from rollup import period_of, request_duration_hours
+
+# Plafonds en heures (0 : plafond désactivé) ; désactivés par défaut, à activer
+# explicitement pour ne pas refuser des saisies acceptées jusque-là
+OVERTIME_DAILY_CAP_HOURS = float(os.getenv("OVERTIME_DAILY_CAP_HOURS", "0"))
+OVERTIME_WEEKLY_CAP_HOURS = float(os.getenv("OVERTIME_WEEKLY_CAP_HOURS", "0"))
+OVERTIME_MONTHLY_CAP_HOURS = float(os.getenv("OVERTIME_MONTHLY_CAP_HOURS", "0"))
+
+# Tolérance des comparaisons de totaux (heures)
+EPSILON = 1e-9
+
+
+def week_of(request_date: date) -> date:
+    """Retourne le lundi de la semaine d'une date."""
+    return request_date - timedelta(days=request_date.weekday())
+
+
+def check_window(request_date: date) -> Tuple[date, date]:
+    """Retourne la plage de dates à lire pour contrôler une demande (sa semaine et son mois)."""
+    month_start = request_date.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    monday = week_of(request_date)
+    return min(monday, month_start), max(monday + timedelta(days=6), next_month - timedelta(days=1))
+
+
+class EmployeeSchedule:
+    """Plages horaires et totaux d'heures d'un employé sur une fenêtre de dates."""
+
+    def __init__(self):
+        self._days: Dict[date, List[Tuple[time, time]]] = defaultdict(list)
+        self._daily: Dict[date, float] = defaultdict(float)
+        self._weekly: Dict[date, float] = defaultdict(float)
+        self._monthly: Dict[int, float] = defaultdict(float)
+
+    def add(self, request_date: date, start_at: time, end_at: time) -> None:
+        """Ajoute une demande à l'emploi du temps."""
+        hours = request_duration_hours(start_at, end_at)
+        self._days[request_date].append((start_at, end_at))
+        self._daily[request_date] += hours
+        self._weekly[week_of(request_date)] += hours
+        self._monthly[period_of(request_date)] += hours
+
+    def violation(self, request_date: date, start_at: time, end_at: time) -> Optional[str]:
+        """
+        Contrôle une nouvelle demande.
+
+        Returns:
+            Optional[str]: Motif du refus, ou None si la demande est acceptable
+        """
+        for other_start, other_end in self._days.get(request_date, ()):
+            if start_at < other_end and other_start < end_at:
+                return (
+                    f"La demande chevauche une autre demande de l'employé le {request_date} "
+                    f"({other_start:%H:%M}-{other_end:%H:%M})"
+                )
+
+        hours = request_duration_hours(start_at, end_at)
+        daily = self._daily.get(request_date, 0.0) + hours
+        if OVERTIME_DAILY_CAP_HOURS and daily > OVERTIME_DAILY_CAP_HOURS + EPSILON:
+            return (
+                f"Plafond journalier dépassé le {request_date} : "
+                f"{daily:g} h pour {OVERTIME_DAILY_CAP_HOURS:g} h autorisées"
+            )
+
+        monday = week_of(request_date)
+        weekly = self._weekly.get(monday, 0.0) + hours
+        if OVERTIME_WEEKLY_CAP_HOURS and weekly > OVERTIME_WEEKLY_CAP_HOURS + EPSILON:
+            return (
+                f"Plafond hebdomadaire dépassé (semaine du {monday}) : "
+                f"{weekly:g} h pour {OVERTIME_WEEKLY_CAP_HOURS:g} h autorisées"
+            )
+
+        monthly = self._monthly.get(period_of(request_date), 0.0) + hours
+        if OVERTIME_MONTHLY_CAP_HOURS and monthly > OVERTIME_MONTHLY_CAP_HOURS + EPSILON:
+            return (
+                f"Plafond mensuel dépassé ({request_date:%m/%Y}) : "
+                f"{monthly:g} h pour {OVERTIME_MONTHLY_CAP_HOURS:g} h autorisées"
+            )
+        return None
+
+
+def load_schedules(session: Session, employee_ids: Iterable[int], dates: Iterable[date],
+                   exclude_request_id: Optional[int] = None) -> Dict[int, EmployeeSchedule]:
+    """
+    Charge en une requête l'emploi du temps de plusieurs employés.
+
+    La plage lue couvre les semaines et mois de toutes les dates fournies.
+
+    Args:
+        session: Session de base de données
+        employee_ids: Employés concernés
+        dates: Dates des demandes à contrôler
+        exclude_request_id: Demande ignorée (demande en cours de modification)
+    """
+    employee_ids = set(employee_ids)
+    windows = [check_window(request_date) for request_date in dates]
+    schedules: Dict[int, EmployeeSchedule] = defaultdict(EmployeeSchedule)
+    if not employee_ids or not windows:
+        return schedules
+
+    statement = select(Request.employeeID, Request.requestDate, Request.startAt, Request.endAt).where(
+        Request.employeeID.in_(employee_ids),
+        Request.requestDate >= min(start for start, _ in windows),
+        Request.requestDate <= max(end for _, end in windows),
+        Request.status != RequestStatus.REJECTED
+    )
+    if exclude_request_id is not None:
+        statement = statement.where(Request.requestID != exclude_request_id)
+
+    for employee_id, request_date, start_at, end_at in session.exec(statement):
+        schedules[employee_id].add(request_date, start_at, end_at)
+    return schedules
+
+
+def check_request_limits(session: Session, employee_id: int, request_date: date,
+                         start_at: time, end_at: time,
+                         exclude_request_id: Optional[int] = None) -> None:
+    """
+    Vérifie qu'une demande ne chevauche aucune autre demande de l'employé
+    et respecte les plafonds journalier, hebdomadaire et mensuel.
+
+    Raises:
+        HTTPException: 400 avec le motif du refus
+    """
+    schedules = load_schedules(session, [employee_id], [request_date], exclude_request_id)
+    reason = schedules[employee_id].violation(request_date, start_at, end_at)
+    if reason:
+        raise HTTPException(status_code=400, detail=reason)
+
+
+def collect_limit_errors(session: Session, requests: List, candidates: Iterable[int]) -> Dict[int, str]:
+    """
+    Contrôle un lot de demandes, dans l'ordre du lot.
+
+    Les demandes acceptées sont ajoutées à l'emploi du temps de l'employé :
+    les chevauchements et dépassements internes au lot sont aussi détectés.
+
+    Args:
+        session: Session de base de données
+        requests: Demandes du lot (employeeID, requestDate, startAt, endAt)
+        candidates: Positions des demandes à contrôler (déjà validées)
+
+    Returns:
+        Dict[int, str]: Motif du refus par position
+    """
+    candidates = list(candidates)
+    schedules = load_schedules(
+        session,
+        (requests[index].employeeID for index in candidates),
+        [requests[index].requestDate for index in candidates]
+    )
+    errors = {}
+    for index in candidates:
+        request = requests[index]
+        schedule = schedules[request.employeeID]
+        reason = schedule.violation(request.requestDate, request.startAt, request.endAt)
+        if reason:
+            errors[index] = reason
+        else:
+            schedule.add(request.requestDate, request.startAt, request.endAt)
+    return errors
@@ -0,0 +1,58 @@
+"""Utilitaires de pagination par curseur (keyset) pour l'API GHS."""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+# Taille de page par défaut et maximale
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# En-tête portant le curseur de la page suivante
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode les valeurs de la dernière ligne d'une page en curseur opaque."""
+    payload = json.dumps(
+        [value.isoformat() if hasattr(value, "isoformat") else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Décode un curseur opaque en liste de valeurs brutes."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+    return values
+
+
+def keyset_condition(columns: Sequence[Any], values: Sequence[Any], descending: bool = True):
+    """
+    Construit la condition de reprise après la dernière ligne d'une page.
+
+    La condition est développée en OR/AND (et non en comparaison de tuples)
+    pour que MySQL puisse l'exploiter comme un parcours d'intervalle d'index.
+
+    Args:
+        columns: Colonnes de tri, de la plus significative à la moins significative
+        values: Valeurs de ces colonnes pour la dernière ligne renvoyée
+        descending: True si le tri est décroissant
+    """
+    clauses = []
+    for position, (column, value) in enumerate(zip(columns, values)):
+        equalities = [columns[i] == values[i] for i in range(position)]
+        comparison = column < value if descending else column > value
+        clauses.append(and_(*equalities, comparison))
+    return or_(*clauses)
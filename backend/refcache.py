@@ -0,0 +1,127 @@
+"""Cache en mémoire des données de référence (services, employés) avec ETag."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import Response, status
+from sqlmodel import SQLModel
+
+from fastjson import dumps
+
+# Durée de vie (s) des réponses en cache : borne la désynchronisation entre workers
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "30"))
+# Nombre maximal de variantes (filtres, expand) en cache par collection
+REFERENCE_CACHE_SIZE = int(os.getenv("REFERENCE_CACHE_SIZE", "64"))
+# Durée (s) pendant laquelle le client peut réutiliser sa copie sans revalider
+REFERENCE_CACHE_MAX_AGE = int(os.getenv("REFERENCE_CACHE_MAX_AGE", "0"))
+
+
+class CachedBody(NamedTuple):
+    """Corps JSON pré-sérialisé et son ETag."""
+    body: bytes
+    etag: str
+
+
+def _cached_body(body: bytes) -> CachedBody:
+    return CachedBody(body=body, etag='"%s"' % hashlib.sha1(body).hexdigest())
+
+
+def serialize_items(items: Iterable[SQLModel]) -> CachedBody:
+    """Sérialise une liste de schémas de lecture, comme le ferait la réponse JSON."""
+    body = json.dumps(
+        [item.model_dump(mode="json", exclude_unset=True) for item in items],
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return _cached_body(body)
+
+
+def serialize_payloads(payloads: Iterable[dict]) -> CachedBody:
+    """Sérialise une liste de réponses construites sans validation (chemin rapide, orjson)."""
+    return _cached_body(dumps(list(payloads)))
+
+
+class ReferenceCache:
+    """
+    Cache versionné des collections de référence.
+
+    Chaque collection porte un numéro de version incrémenté à chaque
+    invalidation ; une réponse chargée pendant une invalidation n'est pas
+    mise en cache (sa version est périmée). Le cache est propre au
+    processus : les autres workers voient la modification à l'expiration
+    de leur entrée (REFERENCE_CACHE_TTL). L'ETag, calculé sur le contenu,
+    est identique d'un worker à l'autre.
+    """
+
+    def __init__(self, ttl: float = REFERENCE_CACHE_TTL, max_entries: int = REFERENCE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._versions: Dict[str, int] = {}
+        self._entries: Dict[str, Dict[Hashable, Tuple[float, CachedBody]]] = {}
+        self._lock = threading.Lock()
+
+    def version(self, collection: str) -> int:
+        """Retourne la version courante d'une collection."""
+        with self._lock:
+            return self._versions.get(collection, 0)
+
+    def get(self, collection: str, key: Hashable = ()) -> Optional[CachedBody]:
+        """Retourne la réponse en cache, ou None si absente ou expirée."""
+        with self._lock:
+            entry = self._entries.get(collection, {}).get(key)
+            if entry is None:
+                return None
+            expires_at, cached = entry
+            if expires_at < time.monotonic():
+                del self._entries[collection][key]
+                return None
+            return cached
+
+    def set(self, collection: str, key: Hashable, version: int, cached: CachedBody) -> CachedBody:
+        """Met en cache une réponse chargée à la version indiquée."""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return cached
+        with self._lock:
+            if self._versions.get(collection, 0) != version:
+                return cached
+            entries = self._entries.setdefault(collection, {})
+            if key not in entries and len(entries) >= self.max_entries:
+                entries.pop(next(iter(entries)))
+            entries[key] = (time.monotonic() + self.ttl, cached)
+        return cached
+
+    def invalidate(self, *collections: str) -> None:
+        """Invalide des collections après une modification."""
+        with self._lock:
+            for collection in collections:
+                self._versions[collection] = self._versions.get(collection, 0) + 1
+                self._entries.pop(collection, None)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compare l'en-tête If-None-Match à l'ETag (comparaison faible, RFC 9110)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (
+        candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates
+    )
+
+
+def cached_response(cached: CachedBody, if_none_match: Optional[str]) -> Response:
+    """Construit la réponse 200 (corps pré-sérialisé) ou 304 selon If-None-Match."""
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={REFERENCE_CACHE_MAX_AGE}",
+    }
+    if _etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+reference_cache = ReferenceCache()
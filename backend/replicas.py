@@ -0,0 +1,199 @@
+"""
+Séparation lectures / écritures : routage des requêtes sûres vers des réplicas.
+
+Les requêtes HTTP GET/HEAD sont servies par un réplica choisi en tourniquet
+parmi les réplicas disponibles ; tout le reste va sur la base principale.
+Un client qui vient d'écrire lit sur la base principale pendant une courte
+fenêtre (lecture de ses propres écritures malgré le retard de réplication).
+Un réplica en erreur de connexion est écarté jusqu'au prochain contrôle réussi.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Durée (s) pendant laquelle un client qui a écrit lit sur la base principale
+DB_READ_YOUR_WRITES_WINDOW = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "5"))
+# Intervalle (s) des contrôles de disponibilité des réplicas
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "10"))
+
+SAFE_METHODS = {"GET", "HEAD"}
+
+# Au-delà, les entrées expirées du suivi des écritures sont purgées
+MAX_TRACKED_CLIENTS = 10_000
+
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+class ReplicaSet:
+    """Réplicas en lecture, avec sélection en tourniquet parmi les réplicas disponibles."""
+
+    def __init__(self, engines: List[Engine], async_engines: Optional[List[AsyncEngine]] = None):
+        self.engines = engines
+        self.async_engines = async_engines
+        self._available = [True] * len(engines)
+        self._counter = itertools.count()
+        for index, engine in enumerate(engines):
+            self._watch(engine, index)
+            if async_engines is not None:
+                self._watch(async_engines[index].sync_engine, index)
+
+    def _watch(self, engine: Engine, index: int) -> None:
+        """Écarte le réplica à la première erreur de connexion."""
+
+        @event.listens_for(engine, "handle_error")
+        def _handle_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark_unavailable(index)
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def choose(self) -> Optional[int]:
+        """Retourne l'indice du prochain réplica disponible, ou None si aucun ne l'est."""
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._available[index]:
+                return index
+        return None
+
+    def mark_unavailable(self, index: int) -> None:
+        """Écarte un réplica jusqu'au prochain contrôle réussi."""
+        if self._available[index]:
+            logger.warning("Réplica %s indisponible, lectures redirigées", index)
+        self._available[index] = False
+
+    def check(self) -> List[bool]:
+        """Contrôle chaque réplica (SELECT 1) et met à jour sa disponibilité."""
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+            except Exception as e:
+                logger.error("Contrôle du réplica %s en échec: %s", index, e)
+                self.mark_unavailable(index)
+                continue
+            if not self._available[index]:
+                logger.info("Réplica %s de nouveau disponible", index)
+            self._available[index] = True
+        return list(self._available)
+
+    def status(self) -> List[bool]:
+        """Retourne la disponibilité de chaque réplica."""
+        return list(self._available)
+
+
+def read_from_primary() -> None:
+    """
+    Lit sur la base principale pour le reste de la requête HTTP en cours,
+    quand le retard de réplication fausserait le résultat (flux de modifications).
+    """
+    _read_from_replica.set(False)
+
+
+class RoutingSession(Session):
+    """
+    Session qui lit sur un réplica pendant une requête HTTP sûre.
+
+    Le réplica est choisi une fois par session (lectures cohérentes entre
+    elles) ; les flush et les instructions d'écriture vont toujours sur la
+    base principale.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, use_async: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.use_async = use_async
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (self.replicas is None or not _read_from_replica.get()
+                or self._flushing or isinstance(clause, UpdateBase)):
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._replica is None:
+            index = self.replicas.choose()
+            if index is None:
+                return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+            self._replica = (
+                self.replicas.async_engines[index].sync_engine if self.use_async
+                else self.replicas.engines[index]
+            )
+        return self._replica
+
+
+class WriteTracker:
+    """Dernières écritures par client, pour la lecture de ses propres écritures."""
+
+    def __init__(self, window: float = DB_READ_YOUR_WRITES_WINDOW):
+        self.window = window
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, client: str) -> None:
+        """Enregistre une écriture du client."""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= MAX_TRACKED_CLIENTS:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+            self._until[client] = now + self.window
+
+    def recently_wrote(self, client: str) -> bool:
+        """Indique si le client a écrit pendant la fenêtre."""
+        until = self._until.get(client)
+        return until is not None and until > time.monotonic()
+
+
+def client_key(scope: Scope) -> str:
+    """Identifie le client : jeton d'authentification, sinon adresse."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return value.decode("latin-1")
+    client = scope.get("client")
+    return client[0] if client else ""
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware ASGI qui autorise la lecture sur réplica pour les requêtes
+    sûres, sauf si le client a écrit pendant la fenêtre de lecture de ses
+    propres écritures. Les suivis sont propres au processus.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: WriteTracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = client_key(scope)
+        if scope["method"] in SAFE_METHODS:
+            token = _read_from_replica.set(not self.tracker.recently_wrote(client))
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _read_from_replica.reset(token)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.tracker.mark(client)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
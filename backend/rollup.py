@@ -0,0 +1,185 @@
+"""
+Maintenance incrémentale de la table d'agrégats mensuels des heures supplémentaires.
+
+Les lignes d'un employé portent toujours son service actuel : un changement
+de service reconstruit les agrégats de l'employé (rebuild_employee_rollup).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from models import Request, Employee, OvertimeRollup, RequestStatus
+
+logger = logging.getLogger(__name__)
+
+
+class RollupKey(NamedTuple):
+    """Clé d'une ligne d'agrégat."""
+    employeeID: int
+    serviceID: int
+    period: int
+    status: RequestStatus
+
+
+# Contribution d'une demande à l'agrégat : (clé, heures)
+Contribution = Tuple[RollupKey, float]
+
+
+def period_of(request_date: date) -> int:
+    """Retourne le mois d'une date au format AAAAMM."""
+    return request_date.year * 100 + request_date.month
+
+
+def request_duration_hours(start_at: time, end_at: time) -> float:
+    """Calcule la durée d'une plage horaire, en heures."""
+    start_seconds = start_at.hour * 3600 + start_at.minute * 60 + start_at.second
+    end_seconds = end_at.hour * 3600 + end_at.minute * 60 + end_at.second
+    return (end_seconds - start_seconds) / 3600
+
+
+def request_hours():
+    """Expression SQL de la durée d'une demande, en heures."""
+    return (func.time_to_sec(Request.endAt) - func.time_to_sec(Request.startAt)) / 3600
+
+
+def request_contribution(request: Request, service_id: int) -> Contribution:
+    """Calcule la contribution d'une demande à l'agrégat."""
+    key = RollupKey(
+        employeeID=request.employeeID,
+        serviceID=service_id,
+        period=period_of(request.requestDate),
+        status=RequestStatus(request.status)
+    )
+    return key, request_duration_hours(request.startAt, request.endAt)
+
+
+def snapshot_request(session: Session, request: Request) -> Contribution:
+    """Calcule la contribution actuelle d'une demande, service de l'employé compris."""
+    employee = session.get(Employee, request.employeeID)
+    return request_contribution(request, employee.serviceID)
+
+
+class RollupDelta:
+    """Accumulateur de variations à appliquer à la table d'agrégats."""
+
+    def __init__(self):
+        self._changes: Dict[RollupKey, list] = defaultdict(lambda: [0.0, 0])
+
+    def add(self, contribution: Optional[Contribution]) -> None:
+        """Ajoute la contribution d'une demande."""
+        if contribution:
+            key, hours = contribution
+            change = self._changes[key]
+            change[0] += hours
+            change[1] += 1
+
+    def remove(self, contribution: Optional[Contribution]) -> None:
+        """Retire la contribution d'une demande."""
+        if contribution:
+            key, hours = contribution
+            change = self._changes[key]
+            change[0] -= hours
+            change[1] -= 1
+
+    def items(self) -> Iterable[Tuple[RollupKey, float, int]]:
+        """Itère sur les variations non nulles."""
+        for key, (hours, count) in self._changes.items():
+            if count or abs(hours) > 1e-9:
+                yield key, hours, count
+
+    def apply(self, session: Session) -> None:
+        """
+        Applique les variations dans la transaction de la session.
+
+        Utilise un INSERT multi-lignes ... ON DUPLICATE KEY UPDATE (MySQL) ou
+        ON CONFLICT DO UPDATE (SQLite) : la ligne d'agrégat est créée si besoin,
+        sinon ses totaux sont incrémentés.
+        """
+        rows = [
+            {
+                "employeeID": key.employeeID,
+                "serviceID": key.serviceID,
+                "period": key.period,
+                "status": key.status,
+                "totalHours": hours,
+                "requestCount": count,
+            }
+            for key, hours, count in self.items()
+        ]
+        if not rows:
+            return
+
+        if session.get_bind().dialect.name == "sqlite":
+            statement = sqlite_insert(OvertimeRollup).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=["employeeID", "serviceID", "period", "status"],
+                set_={
+                    "totalHours": OvertimeRollup.totalHours + statement.excluded.totalHours,
+                    "requestCount": OvertimeRollup.requestCount + statement.excluded.requestCount,
+                },
+            )
+        else:
+            statement = mysql_insert(OvertimeRollup).values(rows)
+            statement = statement.on_duplicate_key_update(
+                totalHours=OvertimeRollup.totalHours + statement.inserted.totalHours,
+                requestCount=OvertimeRollup.requestCount + statement.inserted.requestCount,
+            )
+        session.exec(statement)
+
+
+def _insert_rollup(session: Session, *conditions) -> None:
+    """Recalcule les agrégats des demandes sélectionnées (INSERT ... SELECT)."""
+    period = func.year(Request.requestDate) * 100 + func.month(Request.requestDate)
+    source = (
+        select(
+            Request.employeeID,
+            Employee.serviceID,
+            period,
+            Request.status,
+            func.sum(request_hours()),
+            func.count(Request.requestID),
+        )
+        .join(Employee, Employee.employeeID == Request.employeeID)
+        .where(*conditions)
+        .group_by(Request.employeeID, Employee.serviceID, period, Request.status)
+    )
+    session.exec(
+        OvertimeRollup.__table__.insert().from_select(
+            ["employeeID", "serviceID", "period", "status", "totalHours", "requestCount"],
+            source
+        )
+    )
+
+
+def rebuild_employee_rollup(session: Session, employee_id: int) -> None:
+    """
+    Reconstruit les agrégats d'un employé sous son service actuel.
+
+    À appeler dans la transaction qui change le service de l'employé
+    (après le flush) ; le coût est celui des demandes de l'employé.
+    """
+    session.exec(delete(OvertimeRollup).where(OvertimeRollup.employeeID == employee_id))
+    _insert_rollup(session, Request.employeeID == employee_id)
+
+
+def rebuild_rollup(session: Session) -> int:
+    """
+    Reconstruit entièrement la table d'agrégats à partir des demandes.
+
+    Returns:
+        int: Nombre de lignes d'agrégat créées
+    """
+    session.exec(delete(OvertimeRollup))
+    _insert_rollup(session)
+    session.commit()
+
+    count = session.exec(select(func.count(OvertimeRollup.rollupID))).one()
+    logger.info("Agrégats reconstruits: %s lignes", count)
+    return count
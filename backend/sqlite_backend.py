@@ -0,0 +1,69 @@
+"""
+Configuration du moteur SQLite (déploiements mono-serveur, tests et bancs d'essai).
+
+Chaque connexion passe en journal WAL (lectures concurrentes pendant une
+écriture), active les clés étrangères et reçoit les fonctions SQL MySQL
+utilisées par les agrégats (TIME_TO_SEC, YEAR, MONTH). Le schéma est créé
+à partir des métadonnées SQLModel.
+"""
+
+import os
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+# Taille de la projection mémoire du fichier (octets) et du cache de pages (Kio)
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+# Attente maximale d'un verrou d'écriture (secondes)
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "5"))
+
+
+def time_to_sec(value: Optional[str]) -> Optional[float]:
+    """
+    Équivalent de TIME_TO_SEC pour une heure stockée en texte (HH:MM:SS[.ffffff]).
+
+    Retourne un réel : SQLite tronquerait la division de deux entiers par 3600.
+    """
+    if value is None:
+        return None
+    hours, minutes, seconds = value.split(":")
+    return float(int(hours) * 3600 + int(minutes) * 60 + int(float(seconds)))
+
+
+def year(value: Optional[str]) -> Optional[int]:
+    """Équivalent de YEAR pour une date stockée en texte (AAAA-MM-JJ...)."""
+    return None if value is None else int(value[:4])
+
+
+def month(value: Optional[str]) -> Optional[int]:
+    """Équivalent de MONTH pour une date stockée en texte (AAAA-MM-JJ...)."""
+    return None if value is None else int(value[5:7])
+
+
+def configure_sqlite(engine: Engine) -> None:
+    """Applique les pragmas et enregistre les fonctions SQL à chaque nouvelle connexion."""
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # Sûr en WAL, sans fsync à chaque commit
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.close()
+
+        dbapi_connection.create_function("time_to_sec", 1, time_to_sec, deterministic=True)
+        dbapi_connection.create_function("year", 1, year, deterministic=True)
+        dbapi_connection.create_function("month", 1, month, deterministic=True)
+
+
+def create_schema(engine: Engine) -> None:
+    """Crée les tables, index et contraintes manquants à partir des modèles."""
+    import models  # noqa: F401 - enregistre toutes les tables dans les métadonnées
+
+    SQLModel.metadata.create_all(engine)
@@ -0,0 +1,182 @@
+"""Calcul des statistiques agrégées des demandes d'heures supplémentaires."""
+
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from models import (
+    Request, Employee, Service, OvertimeRollup,
+    StatsRead, StatusStat, ServiceStat, EmployeeStat
+)
+from rollup import period_of
+from hours import join_request_hours, stored_request_hours
+from hierarchy import service_filter
+
+
+def is_month_aligned(date_from: Optional[date], date_to: Optional[date]) -> bool:
+    """Indique si une plage de dates couvre des mois entiers."""
+    if date_from and date_from.day != 1:
+        return False
+    if date_to and (date_to + timedelta(days=1)).day != 1:
+        return False
+    return True
+
+
+def _apply_filters(statement, date_from: Optional[date], date_to: Optional[date],
+                   service_id: Optional[int], include_subservices: bool = False):
+    """Applique les filtres communs à une requête d'agrégation jointe aux employés."""
+    if date_from:
+        statement = statement.where(Request.requestDate >= date_from)
+    if date_to:
+        statement = statement.where(Request.requestDate <= date_to)
+    if service_id is not None:
+        statement = statement.where(
+            service_filter(Employee.serviceID, service_id, include_subservices)
+        )
+    return statement
+
+
+def _apply_rollup_filters(statement, date_from: Optional[date], date_to: Optional[date],
+                          service_id: Optional[int], include_subservices: bool = False):
+    """Applique les filtres communs à une requête sur la table d'agrégats."""
+    if date_from:
+        statement = statement.where(OvertimeRollup.period >= period_of(date_from))
+    if date_to:
+        statement = statement.where(OvertimeRollup.period <= period_of(date_to))
+    if service_id is not None:
+        statement = statement.where(
+            service_filter(OvertimeRollup.serviceID, service_id, include_subservices)
+        )
+    return statement
+
+
+def _query_requests(session: Session, date_from, date_to, service_id, employee_limit,
+                    include_subservices):
+    """Agrège directement les demandes (plages de dates quelconques)."""
+    hours = func.coalesce(func.sum(stored_request_hours()), 0)
+    count = func.count(Request.requestID)
+    employee_hours = hours.label("totalHours")
+    base_join = (Request.employeeID == Employee.employeeID)
+
+    by_status = session.exec(
+        _apply_filters(
+            join_request_hours(select(Request.status, count, hours).join(Employee, base_join)),
+            date_from, date_to, service_id, include_subservices
+        ).group_by(Request.status)
+    ).all()
+
+    by_service = session.exec(
+        _apply_filters(
+            join_request_hours(
+                select(Employee.serviceID, Service.serviceName, count, hours)
+                .select_from(Request)
+                .join(Employee, base_join)
+                .join(Service, Service.serviceID == Employee.serviceID)
+            ),
+            date_from, date_to, service_id, include_subservices
+        ).group_by(Employee.serviceID, Service.serviceName)
+    ).all()
+
+    by_employee = session.exec(
+        _apply_filters(
+            join_request_hours(
+                select(Request.employeeID, Employee.serviceID, count, employee_hours)
+                .join(Employee, base_join)
+            ),
+            date_from, date_to, service_id, include_subservices
+        ).group_by(Request.employeeID, Employee.serviceID)
+        .order_by(employee_hours.desc())
+        .limit(employee_limit)
+    ).all()
+
+    return by_status, by_service, by_employee
+
+
+def _query_rollup(session: Session, date_from, date_to, service_id, employee_limit,
+                  include_subservices):
+    """Agrège la table d'agrégats mensuels (plages de mois entiers)."""
+    hours = func.coalesce(func.sum(OvertimeRollup.totalHours), 0)
+    count = func.coalesce(func.sum(OvertimeRollup.requestCount), 0)
+    employee_hours = hours.label("totalHours")
+
+    by_status = session.exec(
+        _apply_rollup_filters(
+            select(OvertimeRollup.status, count, hours),
+            date_from, date_to, service_id, include_subservices
+        ).group_by(OvertimeRollup.status).having(count > 0)
+    ).all()
+
+    by_service = session.exec(
+        _apply_rollup_filters(
+            select(OvertimeRollup.serviceID, Service.serviceName, count, hours)
+            .join(Service, Service.serviceID == OvertimeRollup.serviceID),
+            date_from, date_to, service_id, include_subservices
+        ).group_by(OvertimeRollup.serviceID, Service.serviceName).having(count > 0)
+    ).all()
+
+    by_employee = session.exec(
+        _apply_rollup_filters(
+            select(OvertimeRollup.employeeID, OvertimeRollup.serviceID, count, employee_hours),
+            date_from, date_to, service_id, include_subservices
+        ).group_by(OvertimeRollup.employeeID, OvertimeRollup.serviceID)
+        .having(count > 0)
+        .order_by(employee_hours.desc())
+        .limit(employee_limit)
+    ).all()
+
+    return by_status, by_service, by_employee
+
+
+def compute_stats(
+    session: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    service_id: Optional[int] = None,
+    employee_limit: int = 100,
+    include_subservices: bool = False
+) -> StatsRead:
+    """
+    Calcule les totaux par statut, par service et par employé.
+
+    Lorsque la plage couvre des mois entiers, les totaux sont lus dans la
+    table d'agrégats mensuels ; sinon, les demandes sont agrégées
+    directement. Dans les deux cas, une demande compte pour le service
+    actuel de son employé (les agrégats suivent les changements de service).
+
+    Args:
+        session: Session de base de données
+        date_from: Date de demande minimale (incluse)
+        date_to: Date de demande maximale (incluse)
+        service_id: Service des employés concernés
+        employee_limit: Nombre maximal d'employés renvoyés (les plus gros totaux)
+        include_subservices: Étendre le filtre de service à ses sous-services
+    """
+    query = _query_rollup if is_month_aligned(date_from, date_to) else _query_requests
+    by_status, by_service, by_employee = query(
+        session, date_from, date_to, service_id, employee_limit, include_subservices
+    )
+
+    status_stats = [
+        StatusStat(status=row[0], requestCount=row[1], totalHours=float(row[2]))
+        for row in by_status
+    ]
+    return StatsRead(
+        dateFrom=date_from,
+        dateTo=date_to,
+        serviceID=service_id,
+        totalRequests=sum(stat.requestCount for stat in status_stats),
+        totalHours=sum(stat.totalHours for stat in status_stats),
+        byStatus=status_stats,
+        byService=[
+            ServiceStat(serviceID=row[0], serviceName=row[1], requestCount=row[2],
+                        totalHours=float(row[3]))
+            for row in by_service
+        ],
+        byEmployee=[
+            EmployeeStat(employeeID=row[0], serviceID=row[1], requestCount=row[2],
+                         totalHours=float(row[3]))
+            for row in by_employee
+        ]
+    )
@@ -0,0 +1,41 @@
+"""Mesure de latences sur une fenêtre glissante."""
+
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyRecorder:
+    """Fenêtre glissante de latences pour le calcul de percentiles."""
+
+    def __init__(self, window: int = 1024):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Enregistre une latence, en secondes."""
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        """Retourne le nombre, la moyenne et les percentiles (en millisecondes)."""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total = self.count, self.total
+
+        def percentile(rank: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(rank * len(samples)))] * 1000
+
+        return {
+            "count": count,
+            "avg_ms": (total / count * 1000) if count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
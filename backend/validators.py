@@ -1,7 +1,7 @@
 """Validateurs personnalisés pour les modèles."""
 
 from datetime import date, time, datetime
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 from fastapi import HTTPException
 
 
@@ -49,6 +49,26 @@ def validate_working_hours(start_time: time, end_time: time) -> None:
         )
 
 
+def validate_request_create(request: Any) -> None:
+    """Valide les champs d'une demande à créer (date, horaires, horaires précédents)."""
+    validate_request_date(request.requestDate)
+    validate_working_hours(request.startAt, request.endAt)
+    
+    if request.previousStart and request.previousEnd:
+        validate_time_range(request.previousStart, request.previousEnd)
+
+
+def collect_validation_errors(items: Iterable[Any], validator: Callable[[Any], None]) -> Dict[int, str]:
+    """Applique un validateur à chaque élément d'un lot et collecte les erreurs par position."""
+    errors = {}
+    for index, item in enumerate(items):
+        try:
+            validator(item)
+        except HTTPException as e:
+            errors[index] = e.detail
+    return errors
+
+
 def validate_employee_number_format(employee_number: str) -> None:
     """Valide le format du numéro d'employé."""
     if not employee_number or len(employee_number) < 3:
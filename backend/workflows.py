@@ -0,0 +1,207 @@
+"""Décisions de validation en lot (approbation et rejet de demandes)."""
+
+import heapq
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from models import (
+    Request, Employee, Workflow, RequestStatus, WorkflowStatus,
+    WorkflowSkipped, WorkflowDecisionResult, WorkflowInboxItem
+)
+from bulk import insert_many
+from pagination import keyset_condition
+from rollup import RollupDelta, request_contribution
+
+# Transitions d'approbation : statut actuel -> (nouveau statut, horodatage de validation)
+APPROVAL_TRANSITIONS: Dict[RequestStatus, Tuple[RequestStatus, Optional[str]]] = {
+    RequestStatus.PENDING: (RequestStatus.FIRST_LEVEL_APPROVED, "validatedN1At"),
+    RequestStatus.SUBMITTED: (RequestStatus.FIRST_LEVEL_APPROVED, "validatedN1At"),
+    RequestStatus.FIRST_LEVEL_APPROVED: (RequestStatus.SECOND_LEVEL_APPROVED, "validatedN2At"),
+    RequestStatus.IN_PROGRESS: (RequestStatus.SECOND_LEVEL_APPROVED, "validatedN2At"),
+    RequestStatus.SECOND_LEVEL_APPROVED: (RequestStatus.ACCEPTED, None),
+}
+
+# Statuts définitifs : une demande acceptée ou rejetée ne peut plus être rejetée
+FINAL_STATUSES = {RequestStatus.ACCEPTED, RequestStatus.REJECTED}
+
+
+def decide_requests(
+    session: Session,
+    request_ids: Sequence[int],
+    approve: bool,
+    validator_id: int
+) -> WorkflowDecisionResult:
+    """
+    Approuve ou rejette un lot de demandes dans une seule transaction.
+
+    Les demandes sont verrouillées et lues en une requête, puis les
+    changements de statut sont appliqués par un UPDATE par statut cible.
+    Les étapes en attente des demandes traitées sont clôturées (statut de
+    la décision et date de validation) par un seul UPDATE ; les demandes
+    sans étape en attente reçoivent une étape de décision, insérée en un
+    seul INSERT multi-lignes. Les demandes introuvables ou dont le statut
+    ne permet pas la transition sont ignorées et signalées avec leur motif.
+
+    Aucune étape n'est créée pour le niveau suivant : le modèle ne désigne
+    pas de validateur de second niveau, les étapes sont assignées par
+    POST /workflows. Une demande approuvée au niveau 1 quitte donc les
+    files de validation jusqu'à l'assignation de sa prochaine étape.
+
+    Args:
+        session: Session de base de données (la transaction est validée)
+        request_ids: IDs des demandes concernées
+        approve: True pour approuver, False pour rejeter
+        validator_id: Employé qui prend la décision
+    """
+    skipped: List[WorkflowSkipped] = []
+    unique_ids = list(dict.fromkeys(request_ids))
+    if len(unique_ids) != len(request_ids):
+        seen = set()
+        for request_id in request_ids:
+            if request_id in seen:
+                skipped.append(WorkflowSkipped(requestID=request_id, reason="Demande en double"))
+            seen.add(request_id)
+
+    rows = session.exec(
+        select(
+            Request.requestID, Request.employeeID, Request.requestDate, Request.startAt,
+            Request.endAt, Request.status, Employee.serviceID
+        )
+        .join(Employee, Employee.employeeID == Request.employeeID)
+        .where(Request.requestID.in_(unique_ids))
+        .with_for_update()
+    ).all() if unique_ids else []
+    found = {row.requestID: row for row in rows}
+
+    # Regrouper les demandes éligibles par transition
+    transitions: Dict[Tuple[RequestStatus, Optional[str]], List[int]] = defaultdict(list)
+    rollup_delta = RollupDelta()
+    processed: List[int] = []
+    for request_id in unique_ids:
+        row = found.get(request_id)
+        if row is None:
+            skipped.append(WorkflowSkipped(requestID=request_id, reason="Demande non trouvée"))
+            continue
+
+        current_status = RequestStatus(row.status)
+        if approve:
+            transition = APPROVAL_TRANSITIONS.get(current_status)
+        elif current_status not in FINAL_STATUSES:
+            transition = (RequestStatus.REJECTED, None)
+        else:
+            transition = None
+        if transition is None:
+            skipped.append(WorkflowSkipped(
+                requestID=request_id,
+                reason=f"Transition impossible depuis le statut {current_status.value}"
+            ))
+            continue
+
+        transitions[transition].append(request_id)
+        processed.append(request_id)
+        key, hours = request_contribution(row, row.serviceID)
+        rollup_delta.remove((key, hours))
+        rollup_delta.add((key._replace(status=transition[0]), hours))
+
+    now = datetime.utcnow()
+    for (target_status, timestamp_field), ids in transitions.items():
+        values = {"status": target_status, "updatedAt": now}
+        if timestamp_field:
+            values[timestamp_field] = now
+        session.exec(update(Request).where(Request.requestID.in_(ids)).values(**values))
+
+    workflow_status = WorkflowStatus.APPROVED if approve else WorkflowStatus.REJECTED
+    open_steps = set(session.exec(
+        select(Workflow.requestID).where(
+            Workflow.requestID.in_(processed), Workflow.status == WorkflowStatus.PENDING
+        )
+    ).all()) if processed else set()
+    if open_steps:
+        session.exec(
+            update(Workflow)
+            .where(Workflow.requestID.in_(open_steps), Workflow.status == WorkflowStatus.PENDING)
+            .values(status=int(workflow_status), validationDate=now)
+        )
+    insert_many(session, Workflow, [
+        {
+            "requestID": request_id,
+            "validator": validator_id,
+            "assignDate": now,
+            "validationDate": now,
+            "status": int(workflow_status),
+        }
+        for request_id in processed
+        if request_id not in open_steps
+    ])
+    rollup_delta.apply(session)
+    session.commit()
+
+    return WorkflowDecisionResult(processed=processed, skipped=skipped)
+
+
+def load_inbox(
+    session: Session,
+    employee_id: int,
+    delegator_ids: Sequence[int],
+    after: Optional[Tuple[datetime, int]],
+    limit: int
+) -> List[WorkflowInboxItem]:
+    """
+    Charge une page de la file de validation d'un employé.
+
+    La file regroupe les étapes en attente dont l'employé est le
+    validateur ou le délégué, ainsi que celles des employés qui lui ont
+    délégué leurs validations. Chaque source est lue par une requête
+    distincte, bornée à la taille de page, sur l'index (validateur ou
+    délégué, statut, date d'assignation) ; les résultats sont ensuite
+    fusionnés par date d'assignation puis par ID. Les étapes restées en
+    attente sur une demande déjà acceptée ou rejetée sont ignorées.
+
+    Args:
+        session: Session de base de données
+        employee_id: Employé dont la file est chargée
+        delegator_ids: Employés dont les validations reviennent à l'employé
+        after: (date d'assignation, ID) de la dernière étape de la page précédente
+        limit: Nombre maximal d'étapes renvoyées
+    """
+    order_columns = (Workflow.assignDate, Workflow.workflowID)
+    sources = [Workflow.validator == validator_id
+               for validator_id in dict.fromkeys([employee_id, *delegator_ids])]
+    sources.append(Workflow.delegate == employee_id)
+
+    pages = []
+    for source in sources:
+        statement = select(Workflow).join(Request, Request.requestID == Workflow.requestID).where(
+            source,
+            Workflow.status == WorkflowStatus.PENDING,
+            Request.status.notin_(FINAL_STATUSES)
+        )
+        if after is not None:
+            statement = statement.where(keyset_condition(order_columns, after, descending=False))
+        pages.append(session.exec(
+            statement.order_by(*order_columns).limit(limit)
+        ).all())
+
+    workflows: List[Workflow] = []
+    seen = set()
+    for workflow in heapq.merge(*pages, key=lambda item: (item.assignDate, item.workflowID)):
+        if workflow.workflowID in seen:
+            continue
+        seen.add(workflow.workflowID)
+        workflows.append(workflow)
+        if len(workflows) == limit:
+            break
+
+    request_ids = {workflow.requestID for workflow in workflows}
+    requests = {
+        request.requestID: request
+        for request in session.exec(select(Request).where(Request.requestID.in_(request_ids))).all()
+    } if request_ids else {}
+    return [
+        WorkflowInboxItem(**workflow.model_dump(), request=requests[workflow.requestID])
+        for workflow in workflows
+    ]
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useQuery } from 'react-query';
-import { requestService, employeeService, serviceService } from '../services/ghs';
+import { requestService, employeeService, serviceService, statsService } from '../services/ghs';
 import { useAuth } from '../contexts/AuthContext';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
@@ -25,11 +25,18 @@ const Dashboard = () => {
   const [timeOfDay, setTimeOfDay] = useState('');
 
   // Récupérer les données
-  const { data: requests = [], isLoading: requestsLoading } = useQuery('requests', requestService.getAll);
+  const { data: recentRequests = [], isLoading: requestsLoading } = useQuery(
+    ['requests', 'recent'],
+    async () => (await requestService.getPage({ limit: 5 })).items
+  );
+  const { data: requestStats, isLoading: statsLoading } = useQuery(
+    ['stats', 'dashboard'],
+    () => statsService.get({ employeeLimit: 1 })
+  );
   const { data: employees = [], isLoading: employeesLoading } = useQuery('employees', employeeService.getAll);
   const { data: services = [], isLoading: servicesLoading } = useQuery('services', serviceService.getAll);
 
-  const isLoading = requestsLoading || employeesLoading || servicesLoading;
+  const isLoading = requestsLoading || statsLoading || employeesLoading || servicesLoading;
 
   // Déterminer le moment de la journée
   useEffect(() => {
@@ -43,16 +50,17 @@ const Dashboard = () => {
     }
   }, []);
 
-  // Calculer les statistiques
+  // Statistiques agrégées par l'API (/stats)
+  const approved = statsService.groupTotals(requestStats, 'Approved');
   const stats = {
-    totalRequests: requests.length,
-    pendingRequests: requests.filter(r => r.status === 'Pending').length,
-    approvedRequests: requests.filter(r => r.status === 'Approved').length,
-    rejectedRequests: requests.filter(r => r.status === 'Rejected').length,
+    totalRequests: requestStats?.totalRequests || 0,
+    pendingRequests: statsService.groupTotals(requestStats, 'Pending').requestCount,
+    approvedRequests: approved.requestCount,
+    rejectedRequests: statsService.groupTotals(requestStats, 'Rejected').requestCount,
     totalEmployees: employees.length,
     totalServices: services.length,
-    totalHours: requests.reduce((sum, r) => sum + (r.hours || 0), 0),
-    approvedHours: requests.filter(r => r.status === 'Approved').reduce((sum, r) => sum + (r.hours || 0), 0),
+    totalHours: requestStats?.totalHours || 0,
+    approvedHours: approved.totalHours,
   };
 
   // Données pour les graphiques
@@ -249,7 +257,7 @@ const Dashboard = () => {
             <Clock className="w-5 h-5 text-blue-500" />
           </div>
           <div className="space-y-4">
-            {requests.slice(0, 5).map((request, index) => (
+            {recentRequests.map((request, index) => (
               <div 
                 key={request.id} 
                 className="flex items-center justify-between p-3 bg-gray-50 rounded-lg hover:bg-gray-100 transition-colors cursor-pointer animate-slide-in-up"
@@ -280,7 +288,7 @@ const Dashboard = () => {
                 </div>
               </div>
             ))}
-            {requests.length === 0 && (
+            {recentRequests.length === 0 && (
               <div className="text-center py-8">
                 <Clock className="w-12 h-12 text-gray-300 mx-auto mb-4" />
                 <p className="text-gray-500">Aucune demande récente</p>
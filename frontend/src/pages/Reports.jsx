@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { useQuery } from 'react-query';
-import { requestService, employeeService, serviceService } from '../services/ghs';
+import { requestService, employeeService, serviceService, statsService } from '../services/ghs';
+import toast from 'react-hot-toast';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 import { 
@@ -20,91 +21,70 @@ const Reports = () => {
     end: new Date().toISOString().split('T')[0]
   });
   const [selectedService, setSelectedService] = useState('all');
+  const [isExporting, setIsExporting] = useState(false);
+
+  // Filtres serveur : période et service (sous-services compris)
+  const filters = {
+    dateFrom: dateRange.start,
+    dateTo: dateRange.end,
+    ...(selectedService !== 'all' ? { serviceID: selectedService, includeSubServices: true } : {}),
+  };
 
   // Récupérer les données
-  const { data: requests = [], isLoading: requestsLoading } = useQuery('requests', requestService.getAll);
+  const { data: reportRequests = [], isLoading: requestsLoading } = useQuery(
+    ['requests', 'report', filters],
+    async () => (await requestService.getPage({ ...filters, limit: 10 })).items,
+    { keepPreviousData: true }
+  );
+  const { data: requestStats, isLoading: statsLoading } = useQuery(
+    ['stats', 'report', filters],
+    () => statsService.get({ ...filters, employeeLimit: 5 }),
+    { keepPreviousData: true }
+  );
   const { data: employees = [], isLoading: employeesLoading } = useQuery('employees', employeeService.getAll);
   const { data: services = [], isLoading: servicesLoading } = useQuery('services', serviceService.getAll);
 
-  const isLoading = requestsLoading || employeesLoading || servicesLoading;
+  const isLoading = requestsLoading || statsLoading || employeesLoading || servicesLoading;
 
-  // Filtrer les demandes selon la période et le service
-  const filteredRequests = requests.filter(request => {
-    const requestDate = new Date(request.date);
-    const startDate = new Date(dateRange.start);
-    const endDate = new Date(dateRange.end);
-    
-    const isInDateRange = requestDate >= startDate && requestDate <= endDate;
-    
-    if (selectedService === 'all') return isInDateRange;
-    
-    const employee = employees.find(emp => emp.id === request.employee_id);
-    return isInDateRange && employee?.service_id === parseInt(selectedService);
-  });
+  const formatHours = (hours) => Math.round(hours * 10) / 10;
 
-  // Calculer les statistiques
+  // Statistiques agrégées par l'API (/stats) pour la période et le service
+  const approved = statsService.groupTotals(requestStats, 'Approved');
   const stats = {
-    totalRequests: filteredRequests.length,
-    totalHours: filteredRequests.reduce((sum, req) => sum + req.hours, 0),
-    approvedRequests: filteredRequests.filter(req => req.status === 'Approved').length,
-    approvedHours: filteredRequests.filter(req => req.status === 'Approved').reduce((sum, req) => sum + req.hours, 0),
-    pendingRequests: filteredRequests.filter(req => req.status === 'Pending').length,
-    rejectedRequests: filteredRequests.filter(req => req.status === 'Rejected').length,
+    totalRequests: requestStats?.totalRequests || 0,
+    totalHours: formatHours(requestStats?.totalHours || 0),
+    approvedRequests: approved.requestCount,
+    approvedHours: formatHours(approved.totalHours),
   };
 
   // Statistiques par service
-  const serviceStats = services.map(service => {
-    const serviceEmployees = employees.filter(emp => emp.service_id === service.id);
-    const serviceRequests = filteredRequests.filter(req => {
-      const employee = employees.find(emp => emp.id === req.employee_id);
-      return employee?.service_id === service.id;
-    });
-    
-    return {
-      ...service,
-      employeeCount: serviceEmployees.length,
-      requestCount: serviceRequests.length,
-      totalHours: serviceRequests.reduce((sum, req) => sum + req.hours, 0),
-      approvedHours: serviceRequests.filter(req => req.status === 'Approved').reduce((sum, req) => sum + req.hours, 0),
-    };
-  });
-
-  // Top employés par heures
-  const employeeStats = employees.map(employee => {
-    const employeeRequests = filteredRequests.filter(req => req.employee_id === employee.id);
-    return {
-      ...employee,
-      requestCount: employeeRequests.length,
-      totalHours: employeeRequests.reduce((sum, req) => sum + req.hours, 0),
-      approvedHours: employeeRequests.filter(req => req.status === 'Approved').reduce((sum, req) => sum + req.hours, 0),
-    };
-  }).sort((a, b) => b.totalHours - a.totalHours).slice(0, 10);
+  const serviceStats = (requestStats?.byService || []).map(stat => ({
+    ...stat,
+    employeeCount: employees.filter(emp => emp.serviceID === stat.serviceID).length,
+  }));
 
-  const handleExport = () => {
-    // Simuler l'export (dans une vraie app, cela générerait un fichier Excel/PDF)
-    const csvContent = [
-      ['Date', 'Employé', 'Service', 'Heures', 'Motif', 'Statut'].join(','),
-      ...filteredRequests.map(request => {
-        const employee = employees.find(emp => emp.id === request.employee_id);
-        const service = services.find(srv => srv.id === employee?.service_id);
-        return [
-          request.date,
-          `${employee?.first_name} ${employee?.last_name}`,
-          service?.name || 'N/A',
-          request.hours,
-          `"${request.reason}"`,
-          request.status
-        ].join(',');
-      })
-    ].join('\n');
+  // Top employés par heures (déjà triés par l'API)
+  const employeeStats = (requestStats?.byEmployee || []).map(stat => ({
+    ...stat,
+    employee: employees.find(emp => emp.employeeID === stat.employeeID),
+  }));
 
-    const blob = new Blob([csvContent], { type: 'text/csv' });
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement('a');
-    a.href = url;
-    a.download = `rapport-heures-supplementaires-${dateRange.start}-${dateRange.end}.csv`;
-    a.click();
-    window.URL.revokeObjectURL(url);
+  // Export CSV produit par l'API (GET /requests/export) avec les filtres du rapport
+  const handleExport = async () => {
+    setIsExporting(true);
+    try {
+      const blob = await requestService.export({ ...filters, format: 'csv' });
+      const url = window.URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = url;
+      a.download = `rapport-heures-supplementaires-${dateRange.start}-${dateRange.end}.csv`;
+      a.click();
+      window.URL.revokeObjectURL(url);
+    } catch (error) {
+      toast.error('Erreur lors de l\'export');
+    } finally {
+      setIsExporting(false);
+    }
   };
 
   if (isLoading) {
@@ -141,6 +121,7 @@ const Reports = () => {
           onClick={handleExport}
           className="flex items-center space-x-2"
           variant="secondary"
+          loading={isExporting}
         >
           <Download className="w-4 h-4" />
           <span>Exporter</span>
@@ -177,8 +158,8 @@ const Reports = () => {
             >
               <option value="all">Tous les services</option>
               {services.map(service => (
-                <option key={service.id} value={service.id}>
-                  {service.name}
+                <option key={service.serviceID} value={service.serviceID}>
+                  {service.serviceName}
                 </option>
               ))}
             </select>
@@ -237,16 +218,16 @@ const Reports = () => {
         <Card title="Statistiques par service">
           <div className="space-y-4">
             {serviceStats.map(service => (
-              <div key={service.id} className="flex items-center justify-between p-3 bg-gray-50 rounded-lg">
+              <div key={service.serviceID} className="flex items-center justify-between p-3 bg-gray-50 rounded-lg">
                 <div className="flex items-center space-x-3">
                   <Building2 className="w-5 h-5 text-primary-600" />
                   <div>
-                    <p className="font-medium text-gray-900">{service.name}</p>
+                    <p className="font-medium text-gray-900">{service.serviceName}</p>
                     <p className="text-sm text-gray-600">{service.employeeCount} employé(s)</p>
                   </div>
                 </div>
                 <div className="text-right">
-                  <p className="font-medium text-gray-900">{service.totalHours}h</p>
+                  <p className="font-medium text-gray-900">{formatHours(service.totalHours)}h</p>
                   <p className="text-sm text-gray-600">{service.requestCount} demande(s)</p>
                 </div>
               </div>
@@ -260,22 +241,22 @@ const Reports = () => {
         {/* Top employés */}
         <Card title="Top employés (heures)">
           <div className="space-y-4">
-            {employeeStats.slice(0, 5).map((employee, index) => (
-              <div key={employee.id} className="flex items-center justify-between p-3 bg-gray-50 rounded-lg">
+            {employeeStats.map((stat, index) => (
+              <div key={stat.employeeID} className="flex items-center justify-between p-3 bg-gray-50 rounded-lg">
                 <div className="flex items-center space-x-3">
                   <div className="w-8 h-8 bg-primary-100 rounded-full flex items-center justify-center">
                     <span className="text-sm font-medium text-primary-600">#{index + 1}</span>
                   </div>
                   <div>
                     <p className="font-medium text-gray-900">
-                      {employee.first_name} {employee.last_name}
+                      {stat.employee ? `${stat.employee.firstName} ${stat.employee.lastName}` : 'Employé inconnu'}
                     </p>
-                    <p className="text-sm text-gray-600">{employee.position}</p>
+                    <p className="text-sm text-gray-600">{stat.employee?.employeeNumber}</p>
                   </div>
                 </div>
                 <div className="text-right">
-                  <p className="font-medium text-gray-900">{employee.totalHours}h</p>
-                  <p className="text-sm text-success-600">{employee.approvedHours}h approuvées</p>
+                  <p className="font-medium text-gray-900">{formatHours(stat.totalHours)}h</p>
+                  <p className="text-sm text-gray-600">{stat.requestCount} demande(s)</p>
                 </div>
               </div>
             ))}
@@ -310,7 +291,7 @@ const Reports = () => {
               </tr>
             </thead>
             <tbody className="bg-white divide-y divide-gray-200">
-              {filteredRequests.slice(0, 10).map((request) => {
+              {reportRequests.map((request) => {
                 const employee = employees.find(emp => emp.id === request.employee_id);
                 const service = services.find(srv => srv.id === employee?.service_id);
                 
@@ -344,7 +325,7 @@ const Reports = () => {
             </tbody>
           </table>
           
-          {filteredRequests.length === 0 && (
+          {reportRequests.length === 0 && (
             <div className="text-center py-12">
               <BarChart3 className="w-12 h-12 text-gray-300 mx-auto mb-4" />
               <h3 className="text-lg font-medium text-gray-900 mb-2">
@@ -1,7 +1,7 @@
 import React, { useState } from 'react';
-import { useQuery, useMutation, useQueryClient } from 'react-query';
+import { useInfiniteQuery, useMutation, useQueryClient } from 'react-query';
 import { useAuth } from '../contexts/AuthContext';
-import { requestService } from '../services/ghs';
+import { requestService, REQUEST_PAGE_SIZE } from '../services/ghs';
 import { useForm } from 'react-hook-form';
 import toast from 'react-hot-toast';
 import Card from '../components/ui/Card';
@@ -26,16 +26,25 @@ const Requests = () => {
 
   const { register, handleSubmit, reset, formState: { errors } } = useForm();
 
-  // Récupérer les demandes
-  const { data: requests = [], isLoading } = useQuery(
-    'requests',
-    requestService.getAll
+  // Récupérer les demandes, page par page (curseur X-Next-Cursor)
+  const {
+    data,
+    isLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery(
+    ['requests', 'list'],
+    ({ pageParam }) => requestService.getPage({ cursor: pageParam, limit: REQUEST_PAGE_SIZE }),
+    { getNextPageParam: (page) => page.nextCursor || undefined }
   );
+  const requests = data ? data.pages.flatMap((page) => page.items) : [];
 
   // Mutation pour créer une demande
   const createMutation = useMutation(requestService.create, {
     onSuccess: () => {
       queryClient.invalidateQueries('requests');
+      queryClient.invalidateQueries('stats');
       toast.success('Demande créée avec succès');
       setIsModalOpen(false);
       reset();
@@ -49,6 +58,7 @@ const Requests = () => {
   const deleteMutation = useMutation(requestService.delete, {
     onSuccess: () => {
       queryClient.invalidateQueries('requests');
+      queryClient.invalidateQueries('stats');
       toast.success('Demande supprimée avec succès');
     },
     onError: () => {
@@ -238,6 +248,17 @@ const Requests = () => {
               </Button>
             </div>
           )}
+          {hasNextPage && (
+            <div className="flex justify-center py-4 border-t">
+              <Button
+                variant="secondary"
+                onClick={() => fetchNextPage()}
+                loading={isFetchingNextPage}
+              >
+                Charger plus
+              </Button>
+            </div>
+          )}
         </div>
       </Card>
 
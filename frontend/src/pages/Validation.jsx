@@ -1,6 +1,12 @@
 import React, { useState } from 'react';
-import { useQuery, useMutation, useQueryClient } from 'react-query';
-import { requestService, employeeService } from '../services/ghs';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from 'react-query';
+import {
+  requestService,
+  employeeService,
+  statsService,
+  REQUEST_PAGE_SIZE,
+  REQUEST_STATUS_GROUPS,
+} from '../services/ghs';
 import toast from 'react-hot-toast';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
@@ -22,22 +28,36 @@ const Validation = () => {
   const [isDetailModalOpen, setIsDetailModalOpen] = useState(false);
   const [statusFilter, setStatusFilter] = useState('all');
 
-  // Récupérer les demandes et employés
-  const { data: requests = [], isLoading } = useQuery('requests', requestService.getAll);
+  // Récupérer les demandes (filtrées par statut côté serveur, par pages) et employés
+  const {
+    data,
+    isLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery(
+    ['requests', 'validation', statusFilter],
+    ({ pageParam }) => requestService.getPage({
+      status: statusFilter === 'all' ? undefined : REQUEST_STATUS_GROUPS[statusFilter],
+      cursor: pageParam,
+      limit: REQUEST_PAGE_SIZE,
+    }),
+    { getNextPageParam: (page) => page.nextCursor || undefined, keepPreviousData: true }
+  );
+  const filteredRequests = data ? data.pages.flatMap((page) => page.items) : [];
+  const { data: requestStats } = useQuery(
+    ['stats', 'validation'],
+    () => statsService.get({ employeeLimit: 1 })
+  );
   const { data: employees = [] } = useQuery('employees', employeeService.getAll);
 
-  // Filtrer les demandes selon le statut
-  const filteredRequests = requests.filter(request => {
-    if (statusFilter === 'all') return true;
-    return request.status === statusFilter;
-  });
-
   // Mutation pour approuver/rejeter une demande
   const updateStatusMutation = useMutation(
     ({ id, status, comment }) => requestService.update(id, { status, comment }),
     {
       onSuccess: (_, { status }) => {
         queryClient.invalidateQueries('requests');
+        queryClient.invalidateQueries('stats');
         toast.success(
           status === 'Approved' ? 'Demande approuvée' : 'Demande rejetée'
         );
@@ -159,7 +179,7 @@ const Validation = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">En attente</p>
               <p className="text-2xl font-bold text-warning-600">
-                {requests.filter(r => r.status === 'Pending').length}
+                {statsService.groupTotals(requestStats, 'Pending').requestCount}
               </p>
             </div>
             <AlertCircle className="w-8 h-8 text-warning-600" />
@@ -171,7 +191,7 @@ const Validation = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Approuvées</p>
               <p className="text-2xl font-bold text-success-600">
-                {requests.filter(r => r.status === 'Approved').length}
+                {statsService.groupTotals(requestStats, 'Approved').requestCount}
               </p>
             </div>
             <CheckCircle className="w-8 h-8 text-success-600" />
@@ -183,7 +203,7 @@ const Validation = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Rejetées</p>
               <p className="text-2xl font-bold text-danger-600">
-                {requests.filter(r => r.status === 'Rejected').length}
+                {statsService.groupTotals(requestStats, 'Rejected').requestCount}
               </p>
             </div>
             <XCircle className="w-8 h-8 text-danger-600" />
@@ -307,6 +327,17 @@ const Validation = () => {
               </p>
             </div>
           )}
+          {hasNextPage && (
+            <div className="flex justify-center py-4 border-t">
+              <Button
+                variant="secondary"
+                onClick={() => fetchNextPage()}
+                loading={isFetchingNextPage}
+              >
+                Charger plus
+              </Button>
+            </div>
+          )}
         </div>
       </Card>
 
@@ -1,5 +1,8 @@
 import api from './api';
 
+// Taille des pages de demandes chargées par les listes (MAX_PAGE_SIZE côté backend : 1000)
+export const REQUEST_PAGE_SIZE = 50;
+
 // Services
 export const serviceService = {
   async getAll() {
@@ -76,8 +79,26 @@ export const accountService = {
 
 // Demandes
 export const requestService = {
-  async getAll() {
-    const response = await api.get('/requests');
+  // Filtres serveur : status, employeeID, serviceID, dateFrom, dateTo, cursor, limit
+  async getPage(params = {}) {
+    const response = await api.get('/requests', {
+      params,
+      paramsSerializer: { indexes: null },
+    });
+    return {
+      items: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+    };
+  },
+
+  // Export en flux (format csv ou ndjson), mêmes filtres serveur que getPage
+  async export(params = {}) {
+    const response = await api.get('/requests/export', {
+      params,
+      paramsSerializer: { indexes: null },
+      responseType: 'blob',
+      timeout: 0,
+    });
     return response.data;
   },
 
@@ -126,4 +147,43 @@ export const workflowService = {
     const response = await api.post('/workflows', data);
     return response.data;
   },
-};
\ No newline at end of file
+
+  // File de validation de l'utilisateur connecté (cursor, limit)
+  async getInbox(params = {}) {
+    const response = await api.get('/workflows/inbox', { params });
+    return {
+      items: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+    };
+  },
+};
+
+// Statuts de l'API regroupés comme dans les pages (En attente, Approuvées, Rejetées)
+export const REQUEST_STATUS_GROUPS = {
+  Pending: ['pending', 'submitted', 'firstLevelApproved', 'inProgress', 'secondLevelApproved'],
+  Approved: ['accepted'],
+  Rejected: ['rejected'],
+};
+
+// Statistiques
+export const statsService = {
+  // Filtres : dateFrom, dateTo, serviceID, includeSubServices, employeeLimit
+  async get(params = {}) {
+    const response = await api.get('/stats', { params });
+    return response.data;
+  },
+
+  // Totaux d'un groupe de statuts (REQUEST_STATUS_GROUPS) à partir de byStatus
+  groupTotals(stats, group) {
+    const statuses = REQUEST_STATUS_GROUPS[group];
+    return (stats?.byStatus || [])
+      .filter((stat) => statuses.includes(stat.status))
+      .reduce(
+        (totals, stat) => ({
+          requestCount: totals.requestCount + stat.requestCount,
+          totalHours: totals.totalHours + stat.totalHours,
+        }),
+        { requestCount: 0, totalHours: 0 }
+      );
+  },
+};
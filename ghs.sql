@@ -15,7 +15,8 @@ CREATE TABLE IF NOT EXISTS `services` (
   `description` TEXT,
   `manager` VARCHAR(100),
   `createdAt` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-  `updatedAt` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+  `updatedAt` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  INDEX `ix_services_updated` (`updatedAt`, `serviceID`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- --------------------------------------------------------------------------------
@@ -32,9 +33,24 @@ CREATE TABLE IF NOT EXISTS `employees` (
   `birthdate` DATE,
   `createdAt` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updatedAt` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  INDEX `ix_employees_service` (`serviceID`, `employeeID`),
+  INDEX `ix_employees_updated` (`updatedAt`, `employeeID`),
   FOREIGN KEY (`serviceID`) REFERENCES `services`(`serviceID`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- --------------------------------------------------------------------------------
+-- Table de fermeture de la hiérarchie des services (une ligne par couple ancêtre/descendant)
+-- --------------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS `serviceClosure`(
+  `ancestorID` INT UNSIGNED NOT NULL,
+  `descendantID` INT UNSIGNED NOT NULL,
+  `depth` INT UNSIGNED NOT NULL DEFAULT 0,
+  PRIMARY KEY (`ancestorID`, `descendantID`),
+  INDEX `ix_service_closure_descendant` (`descendantID`, `depth`),
+  FOREIGN KEY (`ancestorID`) REFERENCES `services`(`serviceID`) ON DELETE CASCADE ON UPDATE CASCADE,
+  FOREIGN KEY (`descendantID`) REFERENCES `services`(`serviceID`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- --------------------------------------------------------------------------------
 -- Table des comptes
 -- --------------------------------------------------------------------------------
@@ -73,6 +89,13 @@ CREATE TABLE IF NOT EXISTS `requests` (
   `updatedAt` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   CONSTRAINT `check_hours` CHECK (`endAt` > `startAt`),
   CONSTRAINT `check_previous_hours` CHECK (`previousEnd` > `previousStart`),
+  -- Index composites pour la pagination keyset et les filtres de liste
+  INDEX `ix_requests_date` (`requestDate`, `requestID`),
+  INDEX `ix_requests_status_date` (`status`, `requestDate`, `requestID`),
+  INDEX `ix_requests_employee_date` (`employeeID`, `requestDate`, `requestID`),
+  INDEX `ix_requests_employee_status_date` (`employeeID`, `status`, `requestDate`, `requestID`),
+  -- Flux des modifications (GET /requests/changes)
+  INDEX `ix_requests_updated` (`updatedAt`, `requestID`),
   FOREIGN KEY (`employeeID`) REFERENCES `employees`(`employeeID`) ON DELETE CASCADE ON UPDATE CASCADE,
   FOREIGN KEY (`createdBy`) REFERENCES `employees`(`employeeID`) ON DELETE SET NULL ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -101,6 +124,8 @@ CREATE TABLE IF NOT EXISTS `workflows`(
   `assignDate` DATETIME NOT NULL,
   `validationDate` DATETIME NULL,
   `status` INT UNSIGNED NOT NULL,
+  INDEX `ix_workflows_validator_status_date` (`validator`, `status`, `assignDate`),
+  INDEX `ix_workflows_delegate_status_date` (`delegate`, `status`, `assignDate`),
   FOREIGN KEY (`requestID`) REFERENCES `requests`(`requestID`) ON DELETE CASCADE ON UPDATE CASCADE,
   FOREIGN KEY (`validator`) REFERENCES `employees`(`employeeID`) ON DELETE CASCADE ON UPDATE CASCADE,
   FOREIGN KEY (`delegate`) REFERENCES `employees`(`employeeID`) ON DELETE SET NULL ON UPDATE CASCADE
@@ -114,6 +139,35 @@ CREATE TABLE IF NOT EXISTS `requestEmployee`(
   `employeeID` INT UNSIGNED NOT NULL,
   `requestID` INT UNSIGNED NOT NULL,
   `totalHours` FLOAT NOT NULL,
+  UNIQUE KEY `uq_request_employee` (`requestID`, `employeeID`),
   FOREIGN KEY (`employeeID`) REFERENCES `employees`(`employeeID`) ON DELETE CASCADE ON UPDATE CASCADE,
   FOREIGN KEY (`requestID`) REFERENCES `requests`(`requestID`) ON DELETE CASCADE ON UPDATE CASCADE
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- --------------------------------------------------------------------------------
+-- Table d'agrégats mensuels des heures supplémentaires (employé, service, mois, statut)
+-- --------------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS `overtimeRollup`(
+  `rollupID` INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+  `employeeID` INT UNSIGNED NOT NULL,
+  `serviceID` INT UNSIGNED NOT NULL,
+  `period` INT UNSIGNED NOT NULL,
+  `status` ENUM('pending', 'submitted', 'firstLevelApproved', 'inProgress', 'secondLevelApproved', 'accepted', 'rejected') NOT NULL,
+  `totalHours` DOUBLE NOT NULL DEFAULT 0,
+  `requestCount` INT NOT NULL DEFAULT 0,
+  UNIQUE KEY `uq_overtime_rollup_key` (`employeeID`, `serviceID`, `period`, `status`),
+  INDEX `ix_overtime_rollup_period_service` (`period`, `serviceID`),
+  FOREIGN KEY (`employeeID`) REFERENCES `employees`(`employeeID`) ON DELETE CASCADE ON UPDATE CASCADE,
+  FOREIGN KEY (`serviceID`) REFERENCES `services`(`serviceID`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- --------------------------------------------------------------------------------
+-- Table des suppressions, pour la synchronisation incrémentale (GET /{collection}/changes)
+-- --------------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS `tombstones`(
+  `tombstoneID` INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+  `collection` VARCHAR(20) NOT NULL,
+  `entityID` INT UNSIGNED NOT NULL,
+  `deletedAt` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX `ix_tombstones_collection_deleted` (`collection`, `deletedAt`, `tombstoneID`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;